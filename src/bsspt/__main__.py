@@ -0,0 +1,15 @@
+# ============================================================
+# python -m bsspt <command> ...  (run from src/)
+# The workflow modules import each other as top-level modules
+# (from engine..., import phase1), so this directory goes on
+# sys.path before the CLI is loaded.
+# ============================================================
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from cli import main
+
+sys.exit(main())
@@ -0,0 +1,295 @@
+# ============================================================
+# Out-of-Core Aggregation
+# One pass over a Parquet file, record batch by record batch, that
+# computes every requested statistic per group with memory bounded
+# by the number of groups — shared by the heatmap / score scripts.
+#
+# Per group and metric the state is mergeable:
+#   count, sum, min, max, and mean / M2 combined with Chan et al.'s
+#   parallel update (var = M2 / (n - 1))
+# Quantiles come from a bottom-k reservoir: every row draws a random
+# key and each group keeps the RESERVOIR_SIZE rows with the smallest
+# keys — an exact uniform sample without replacement whose merge is
+# again "keep the k smallest keys".
+# ============================================================
+
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+
+# ============================================================
+# SETTINGS
+# ============================================================
+
+# Rows per record batch read from the Parquet file
+BATCH_ROWS = 1 << 20
+
+# Rows kept per group for quantile estimates
+RESERVOIR_SIZE = 4096
+
+STATS = ("count", "min", "max", "mean", "var", "std", "sum")
+
+# Filter: column → value, or column → callable(np.ndarray) -> bool mask
+Filters = Dict[str, Union[float, int, Callable[[np.ndarray], np.ndarray]]]
+
+
+def _filter_mask(batch: Dict[str, np.ndarray], filters: Filters, n: int) -> np.ndarray:
+    mask = np.ones(n, dtype=bool)
+    for column, cond in filters.items():
+        values = batch[column]
+        mask &= cond(values) if callable(cond) else (values == cond)
+    return mask
+
+
+# ============================================================
+# AGGREGATION
+# ============================================================
+
+class _GroupState:
+    """Running per-group statistics for M metrics over G groups (grown on demand)."""
+
+    def __init__(self, metrics: int, reservoir: int):
+        self.m_keys  = {}
+        self.m_M     = metrics
+        self.m_R     = reservoir
+        self.m_count = np.zeros((0, metrics))
+        self.m_mean  = np.zeros((0, metrics))
+        self.m_m2    = np.zeros((0, metrics))
+        self.m_min   = np.zeros((0, metrics))
+        self.m_max   = np.zeros((0, metrics))
+        self.m_rkey  = np.zeros((0, reservoir))
+        self.m_rval  = np.zeros((0, reservoir, metrics))
+
+    def index(self, keys: List[tuple]) -> np.ndarray:
+        """Global row of every batch group key, appending new groups."""
+        new = [k for k in keys if k not in self.m_keys]
+        if new:
+            for k in new:
+                self.m_keys[k] = len(self.m_keys)
+            g, M, R = len(new), self.m_M, self.m_R
+            self.m_count = np.vstack([self.m_count, np.zeros((g, M))])
+            self.m_mean  = np.vstack([self.m_mean,  np.zeros((g, M))])
+            self.m_m2    = np.vstack([self.m_m2,    np.zeros((g, M))])
+            self.m_min   = np.vstack([self.m_min,   np.full((g, M), np.inf)])
+            self.m_max   = np.vstack([self.m_max,   np.full((g, M), -np.inf)])
+            if R:
+                self.m_rkey = np.vstack([self.m_rkey, np.full((g, R), np.inf)])
+                self.m_rval = np.concatenate([self.m_rval, np.full((g, R, M), np.nan)])
+        return np.array([self.m_keys[k] for k in keys], dtype=np.int64)
+
+    def update(self, gidx: np.ndarray, inverse: np.ndarray, values: np.ndarray, rng):
+        """
+        gidx    [g]    global rows of the batch's groups
+        inverse [n]    batch group of every row
+        values  [n, M] metric values (NaN = missing, skipped per metric)
+        """
+        g     = gidx.shape[0]
+        order = np.argsort(inverse, kind="stable")
+        vals  = values[order]
+        starts = np.searchsorted(inverse[order], np.arange(g))
+
+        finite = np.isfinite(vals)
+        zeroed = np.where(finite, vals, 0.0)
+
+        n_b   = np.add.reduceat(finite.astype(np.float64), starts, axis=0)
+        sum_b = np.add.reduceat(zeroed, starts, axis=0)
+        mean_b = np.divide(sum_b, n_b, out=np.zeros_like(sum_b), where=n_b > 0)
+
+        dev  = np.where(finite, vals - np.repeat(mean_b, np.diff(np.append(starts, len(vals))), axis=0), 0.0)
+        m2_b = np.add.reduceat(dev * dev, starts, axis=0)
+
+        min_b = np.minimum.reduceat(np.where(finite, vals, np.inf), starts, axis=0)
+        max_b = np.maximum.reduceat(np.where(finite, vals, -np.inf), starts, axis=0)
+
+        # Chan et al. merge of (n, mean, M2)
+        n_a, mean_a, m2_a = self.m_count[gidx], self.m_mean[gidx], self.m_m2[gidx]
+        n     = n_a + n_b
+        delta = mean_b - mean_a
+        safe  = np.where(n > 0, n, 1.0)
+
+        self.m_mean[gidx]  = mean_a + delta * n_b / safe
+        self.m_m2[gidx]    = m2_a + m2_b + delta * delta * n_a * n_b / safe
+        self.m_count[gidx] = n
+        self.m_min[gidx]   = np.minimum(self.m_min[gidx], min_b)
+        self.m_max[gidx]   = np.maximum(self.m_max[gidx], max_b)
+
+        if self.m_R:
+            self._reservoir(gidx, inverse, values, rng)
+
+    def _reservoir(self, gidx, inverse, values, rng):
+        R = self.m_R
+        g = gidx.shape[0]
+
+        keys  = rng.random(inverse.shape[0])
+        order = np.lexsort((keys, inverse))
+        grp   = inverse[order]
+        start = np.searchsorted(grp, np.arange(g))
+        rank  = np.arange(grp.shape[0]) - start[grp]
+        take  = rank < R
+
+        # Batch candidates [g, R], padded with +inf keys
+        cand_key = np.full((g, R), np.inf)
+        cand_val = np.full((g, R, self.m_M), np.nan)
+        cand_key[grp[take], rank[take]] = keys[order][take]
+        cand_val[grp[take], rank[take]] = values[order][take]
+
+        all_key = np.concatenate([self.m_rkey[gidx], cand_key], axis=1)   # [g, 2R]
+        all_val = np.concatenate([self.m_rval[gidx], cand_val], axis=1)
+
+        keep = np.argpartition(all_key, R - 1, axis=1)[:, :R]
+        self.m_rkey[gidx] = np.take_along_axis(all_key, keep, axis=1)
+        self.m_rval[gidx] = np.take_along_axis(all_val, keep[..., None], axis=1)
+
+
+def _group_codes(columns: List[np.ndarray]) -> Tuple[List[tuple], np.ndarray]:
+    """
+    Batch group keys and the group of every row. Each key column is
+    factorized on its own and the codes combined mixed-radix into one
+    int64, which is much cheaper than a row-wise unique.
+    """
+    code   = np.zeros(columns[0].shape[0], dtype=np.int64)
+    levels = []
+    for col in columns:
+        uniq, inv = np.unique(col, return_inverse=True)
+        code   = code * len(uniq) + inv.reshape(-1)
+        levels.append(uniq)
+
+    codes, inverse = np.unique(code, return_inverse=True)
+
+    # Decode each combined code back into its column values
+    parts = []
+    for uniq in reversed(levels):
+        parts.append(uniq[codes % len(uniq)].tolist())
+        codes = codes // len(uniq)
+
+    return list(zip(*reversed(parts))), inverse.reshape(-1)
+
+
+def aggregate_parquet(
+    path: str,
+    by: Sequence[str],
+    metrics: Sequence[str],
+    stats: Iterable[str] = ("mean",),
+    quantiles: Sequence[float] = (),
+    filters: Optional[Filters] = None,
+    batch_rows: int = BATCH_ROWS,
+    reservoir: int = RESERVOIR_SIZE,
+    seed: int = 0
+) -> pd.DataFrame:
+    """
+    Single scan of `path` grouped by `by`.
+
+    Returns one row per group (sorted by `by`) with columns
+    <metric>_<stat> for every stat in STATS requested and
+    <metric>_q<100·q> for every quantile (reservoir estimate).
+    NaN / inf values are skipped per metric.
+    """
+    stats   = list(stats)
+    filters = dict(filters or {})
+    unknown = set(stats) - set(STATS)
+    if unknown:
+        raise ValueError(f"Unknown stats: {sorted(unknown)}")
+
+    columns = list(dict.fromkeys([*by, *metrics, *filters]))
+    state   = _GroupState(len(metrics), reservoir if quantiles else 0)
+    rng     = np.random.default_rng(seed)
+    dtypes  = {}
+
+    for record_batch in pq.ParquetFile(path).iter_batches(batch_size=batch_rows, columns=columns):
+        batch = {c: record_batch.column(c).to_numpy(zero_copy_only=False) for c in columns}
+        n     = record_batch.num_rows
+
+        dtypes = dtypes or {c: batch[c].dtype for c in by}
+
+        mask = _filter_mask(batch, filters, n)
+        if not mask.any():
+            continue
+
+        values = np.stack([batch[m][mask].astype(np.float64) for m in metrics], axis=1)
+
+        if by:
+            keys, inverse = _group_codes([batch[c][mask] for c in by])
+        else:
+            inverse = np.zeros(values.shape[0], dtype=np.int64)
+            keys    = [()]
+
+        state.update(state.index(keys), inverse.reshape(-1), values, rng)
+
+    return _finalize(state, by, dtypes, metrics, stats, quantiles)
+
+
+def _finalize(state: _GroupState, by, dtypes, metrics, stats, quantiles) -> pd.DataFrame:
+
+    keys = sorted(state.m_keys, key=lambda k: tuple(k))
+    rows = np.array([state.m_keys[k] for k in keys], dtype=np.int64)
+
+    out = pd.DataFrame(list(keys), columns=list(by)) if by else pd.DataFrame(index=range(len(keys)))
+    for c in by:
+        if c in dtypes:
+            out[c] = out[c].astype(dtypes[c])
+
+    n = state.m_count[rows]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        var = state.m_m2[rows] / (n - 1)
+        computed = {
+            "count": n,
+            "sum":   state.m_mean[rows] * n,
+            "mean":  np.where(n > 0, state.m_mean[rows], np.nan),
+            "min":   np.where(n > 0, state.m_min[rows], np.nan),
+            "max":   np.where(n > 0, state.m_max[rows], np.nan),
+            "var":   np.where(n > 1, var, np.nan),
+            "std":   np.where(n > 1, np.sqrt(var), np.nan),
+        }
+
+    data = {}
+    for j, metric in enumerate(metrics):
+        for stat in stats:
+            data[f"{metric}_{stat}"] = computed[stat][:, j]
+        if quantiles:
+            sample = state.m_rval[rows][:, :, j]
+            for q in quantiles:
+                with np.errstate(all="ignore"):
+                    data[f"{metric}_q{100 * q:g}"] = np.nanquantile(sample, q, axis=1) \
+                        if sample.size else np.full(len(rows), np.nan)
+
+    return pd.concat([out, pd.DataFrame(data)], axis=1)
+
+
+def global_range(agg: pd.DataFrame, metric: str) -> Tuple[float, float]:
+    """(min, max) over every group — exact, from the per-group extremes."""
+    return float(agg[f"{metric}_min"].min()), float(agg[f"{metric}_max"].max())
+
+
+# ============================================================
+# TOP ROWS
+# ============================================================
+
+def top_rows(
+    path: str,
+    column: str,
+    k: int,
+    columns: Sequence[str],
+    filters: Optional[Filters] = None,
+    ascending: bool = True,
+    batch_rows: int = BATCH_ROWS
+) -> pd.DataFrame:
+    """The k rows with the smallest (or largest) `column`, kept across batches."""
+    filters = dict(filters or {})
+    read    = list(dict.fromkeys([column, *columns, *filters]))
+    best    = None
+
+    for record_batch in pq.ParquetFile(path).iter_batches(batch_size=batch_rows, columns=read):
+        df = record_batch.to_pandas()
+        df = df[_filter_mask({c: df[c].to_numpy() for c in filters}, filters, len(df))]
+
+        df   = df.nsmallest(k, column) if ascending else df.nlargest(k, column)
+        best = df if best is None else pd.concat([best, df])
+        best = best.nsmallest(k, column) if ascending else best.nlargest(k, column)
+
+    if best is None:
+        return pd.DataFrame(columns=list(dict.fromkeys([*columns, column])))
+
+    return best[list(dict.fromkeys([*columns, column]))].reset_index(drop=True)
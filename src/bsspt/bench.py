@@ -0,0 +1,348 @@
+# ============================================================
+# Engine Benchmark Suite
+# Times the hot paths across K, order, sample count and dtype
+# and writes median / p95 latency, throughput and peak memory
+# as JSON so runs can be diffed between commits.
+# ============================================================
+
+import json
+import math
+import time
+import platform
+import subprocess
+from typing import Callable, Iterable, List, Optional
+
+import torch
+
+import phase1
+from engine.spectraldomain import SpectralDomain
+from engine.hermitebasis import hermiteBasis
+from engine.ghgsfbasis import GHGSFMultiLobeBasis
+from engine.ghgsfbasisflexible import GHGSFMultiLobeBasisFlexible
+from engine.ghgsfbasisscaled import GHGSFMultiLobeBasisScaled
+from engine.ghgsfexp import GHGSFMultiLobeBasisDualDomain
+from engine.conditionestimate import estimateSpectrum
+from engine.spectralstate import SpectralState
+from engine.absorption import AbsorptionOperator
+from engine.dispersion import DispersionOperator
+from engine.emission import EmissionOperator
+from engine.whitening import WhitenOperator, UnwhitenOperator
+from spectral_topology import generate_topology
+from torchconfig import TorchConfig
+from instrumentation import trace_peak
+
+
+# ============================================================
+# DEFAULT GRID
+# ============================================================
+
+BENCH_LOBES   = list(range(4, 13))
+BENCH_ORDERS  = list(range(4, 13))
+BENCH_SAMPLES = [256, 1024, 4096, 16384]
+BENCH_DTYPES  = [torch.float32, torch.float64]
+
+BENCH_TARGETS = [
+    "hermiteBasis",
+    "GHGSFMultiLobeBasis",
+    "GHGSFMultiLobeBasisFlexible",
+    "GHGSFMultiLobeBasisScaled",
+    "GHGSFMultiLobeBasisDualDomain",
+    "project",
+    "reconstruct",
+    "AbsorptionOperator.create",
+    "DispersionOperator.create",
+    "EmissionOperator.create",
+    "WhitenOperator.create",
+    "UnwhitenOperator.create",
+    "SpectralOperator.apply",
+    "SpectralOperator.compose",
+    "eigvalsh",
+    "estimateSpectrum",
+    "compute_metrics",
+]
+
+REPEATS = 7
+WARMUP  = 1
+
+LAMBDA_MIN = 380.0
+LAMBDA_MAX = 830.0
+
+# Fixture centers stay clear of the domain edges (truncated lobes are near-singular)
+FIXTURE_LAMBDA_MIN = 420.0
+FIXTURE_LAMBDA_MAX = 790.0
+
+OUTPUT_PATH = "bench_results.json"
+
+
+# ============================================================
+# MEASUREMENT
+# ============================================================
+
+def _sync(device: torch.device):
+    if device.type == "cuda":
+        torch.cuda.synchronize()
+
+
+def _percentile(sorted_vals: List[float], q: float) -> float:
+    # nearest-rank
+    rank = max(1, math.ceil(q * len(sorted_vals)))
+    return sorted_vals[rank - 1]
+
+
+def time_call(
+    fn: Callable[[], object],
+    device: torch.device,
+    repeats: int = REPEATS,
+    warmup: int = WARMUP
+) -> dict:
+
+    for _ in range(warmup):
+        fn()
+    _sync(device)
+
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        _sync(device)
+        times.append(time.perf_counter() - start)
+
+    times.sort()
+    median = _percentile(times, 0.5)
+
+    return {
+        "median_ms":  1e3 * median,
+        "p95_ms":     1e3 * _percentile(times, 0.95),
+        "ops_per_s":  1.0 / median if median > 0.0 else float("inf"),
+    }
+
+
+# ============================================================
+# FIXTURES
+# ============================================================
+
+def _smooth_spectrum(lbda):
+    return (
+        torch.exp(-0.5 * ((lbda - 450.0) / 40.0) ** 2) +
+        0.8 * torch.exp(-0.5 * ((lbda - 600.0) / 60.0) ** 2)
+    )
+
+
+def _sigma_a(lbda):
+    return 0.01 + 0.005 * torch.sin(lbda / 40.0)
+
+
+def _build_targets(K: int, order: int, samples: int, dtype, device) -> dict:
+    """
+    Returns {target_name: zero-arg callable} for one grid cell.
+    Fixtures shared between targets are built once here, outside the timers.
+
+    Fixture centers are inset from the domain edges and the sigmas are
+    narrow relative to the center spacing, so every cell of the default
+    grid factors in float32 — truncated or heavily overlapping lobes make
+    the Gram singular and would leave holes in the timing table.
+    compute_metrics instead runs a real sweep row, failure path included.
+    """
+    domain  = SpectralDomain(LAMBDA_MIN, LAMBDA_MAX, samples, device=device, dtype=dtype)
+    centers = generate_topology(0, K, FIXTURE_LAMBDA_MIN, FIXTURE_LAMBDA_MAX)
+
+    def dual():
+        return GHGSFMultiLobeBasisDualDomain(
+            domain=domain, centers=centers, num_wide=K // 2,
+            wide_sigma_min=3.5, wide_sigma_max=4.0, wide_scale_type="sqrt",
+            narrow_sigma_min=3.0, narrow_sigma_max=3.5, narrow_scale_type="sqrt",
+            order=order
+        )
+
+    basis    = dual()
+    spectrum = _smooth_spectrum(domain.m_lambda)
+    coeffs   = basis.project(spectrum)
+    state    = SpectralState(basis, coeffs)
+    op_a     = AbsorptionOperator.create(basis, _sigma_a, 1.0)
+    op_b     = WhitenOperator.create(basis)
+    transfer = 0.5 + 0.5 * torch.cos(domain.m_lambda / 30.0)
+    x_flat   = ((domain.m_lambda.unsqueeze(0) - basis.m_centers.unsqueeze(1)) / 3.0) \
+        .repeat_interleave(order, dim=0)
+
+    precision_id = 0 if dtype == torch.float32 else 1
+    config_row   = [0, K, order, 0, precision_id, 0, 6.5, 7.0, 6.0, 6.5]
+
+    def metrics():
+        phase1.LAMBDA_SAMPLES = samples
+        return phase1.compute_metrics((0, config_row))
+
+    return {
+        "hermiteBasis": lambda: hermiteBasis(order, x_flat),
+        "GHGSFMultiLobeBasis": lambda: GHGSFMultiLobeBasis(
+            domain=domain, centers=centers, sigma=3.0, order=order
+        ),
+        "GHGSFMultiLobeBasisFlexible": lambda: GHGSFMultiLobeBasisFlexible(
+            domain=domain, centers=centers, sigma_min=3.0, sigma_max=4.0,
+            order=order, scale_type="sqrt"
+        ),
+        "GHGSFMultiLobeBasisScaled": lambda: GHGSFMultiLobeBasisScaled(
+            domain=domain, centers=centers, sigma_min=3.0, sigma_max=4.0, order=order
+        ),
+        "GHGSFMultiLobeBasisDualDomain": dual,
+        "project":     lambda: basis.project(spectrum),
+        "reconstruct": lambda: basis.reconstruct(coeffs),
+        "AbsorptionOperator.create": lambda: AbsorptionOperator.create(basis, _sigma_a, 1.0),
+        "DispersionOperator.create": lambda: DispersionOperator.create(basis, transfer),
+        "EmissionOperator.create":   lambda: EmissionOperator.create(basis, _smooth_spectrum),
+        "WhitenOperator.create":     lambda: WhitenOperator.create(basis),
+        "UnwhitenOperator.create":   lambda: UnwhitenOperator.create(basis),
+        "SpectralOperator.apply":    lambda: op_a.apply(state),
+        "SpectralOperator.compose":  lambda: op_a.compose(op_b),
+        "eigvalsh":         lambda: torch.linalg.eigvalsh(basis.m_gram),
+        "estimateSpectrum": lambda: estimateSpectrum(basis.m_gram, basis.m_chol),
+        "compute_metrics": metrics,
+    }
+
+
+# ============================================================
+# RUNNER
+# ============================================================
+
+def _git_revision() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True
+        )
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_bench(
+    lobes: Iterable[int] = BENCH_LOBES,
+    orders: Iterable[int] = BENCH_ORDERS,
+    samples: Iterable[int] = BENCH_SAMPLES,
+    dtypes: Iterable[torch.dtype] = BENCH_DTYPES,
+    targets: Iterable[str] = BENCH_TARGETS,
+    repeats: int = REPEATS,
+    warmup: int = WARMUP,
+    device: torch.device = None,
+    output_path: Optional[str] = OUTPUT_PATH,
+    verbose: bool = True
+) -> dict:
+
+    torch.set_grad_enabled(False)
+
+    if device is None:
+        device = TorchConfig.resolve_device()
+
+    targets = list(targets)
+    unknown = set(targets) - set(BENCH_TARGETS)
+    if unknown:
+        raise ValueError(f"Unknown benchmark targets: {sorted(unknown)}")
+
+    saved_samples = phase1.LAMBDA_SAMPLES
+    results = []
+
+    try:
+        for dtype in dtypes:
+            for L in samples:
+                for K in lobes:
+                    for N in orders:
+
+                        cell = _build_targets(K, N, L, dtype, device)
+
+                        for name in targets:
+                            fn = cell[name]
+                            try:
+                                stats = time_call(fn, device, repeats, warmup)
+                                stats["peak_bytes"] = trace_peak(fn, device)
+                                stats["error"]      = None
+                            except Exception as exc:
+                                stats = {
+                                    "median_ms":  None,
+                                    "p95_ms":     None,
+                                    "ops_per_s":  None,
+                                    "peak_bytes": None,
+                                    "error":      f"{type(exc).__name__}: {exc}".splitlines()[0],
+                                }
+
+                            results.append({
+                                "target":  name,
+                                "K":       K,
+                                "order":   N,
+                                "samples": L,
+                                "dtype":   str(dtype).replace("torch.", ""),
+                                **stats,
+                            })
+
+                        if verbose:
+                            print(f"  {str(dtype):<14} L={L:<6d} K={K:<3d} order={N:<3d} done", end="\r")
+    finally:
+        phase1.LAMBDA_SAMPLES = saved_samples
+
+    if verbose:
+        print()
+
+    report = {
+        "meta": {
+            "revision":      _git_revision(),
+            "timestamp":     time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "torch_version": torch.__version__,
+            "device":        str(device),
+            "platform":      platform.platform(),
+            "threads":       torch.get_num_threads(),
+            "repeats":       repeats,
+            "warmup":        warmup,
+        },
+        "results": results,
+    }
+
+    if output_path is not None:
+        with open(output_path, "w") as f:
+            json.dump(report, f, indent=1)
+        if verbose:
+            print(f"Wrote {len(results)} results to {output_path}")
+
+    return report
+
+
+# ============================================================
+# COMPARISON
+# ============================================================
+
+def compare_reports(baseline_path: str, current_path: str, threshold: float = 0.10) -> List[dict]:
+    """
+    Matches results on (target, K, order, samples, dtype) and returns the
+    rows whose median latency grew by more than `threshold` (fractional).
+    """
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    with open(current_path) as f:
+        current = json.load(f)
+
+    def key(r):
+        return (r["target"], r["K"], r["order"], r["samples"], r["dtype"])
+
+    base_index  = {key(r): r for r in baseline["results"]}
+    regressions = []
+
+    for r in current["results"]:
+        ref = base_index.get(key(r))
+        if ref is None or not ref["median_ms"] or r["median_ms"] is None:
+            continue
+
+        ratio = r["median_ms"] / ref["median_ms"]
+        if ratio > 1.0 + threshold:
+            regressions.append({
+                "target":      r["target"],
+                "K":           r["K"],
+                "order":       r["order"],
+                "samples":     r["samples"],
+                "dtype":       r["dtype"],
+                "baseline_ms": ref["median_ms"],
+                "current_ms":  r["median_ms"],
+                "ratio":       ratio,
+            })
+
+    return sorted(regressions, key=lambda r: -r["ratio"])
+
+
+if __name__ == "__main__":
+    run_bench()
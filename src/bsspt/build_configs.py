@@ -1,10 +1,15 @@
 import torch
 
 
-def build_phase1_configs(device=torch.device("cpu")):
+def build_phase1_configs(device=torch.device("cpu"), custom_families=()):
     """
     Builds full Phase 1 configuration tensor.
 
+    custom_families: registered custom topology ids (spectral_topology,
+    e.g. from topology_search.py) swept after the five built-in
+    families. family_id is the outermost axis, so the built-in rows keep
+    their positions and batch numbers.
+
     Column order matches schema.CONFIG_COLUMNS:
         family_id, K, order, scaling_id, precision_id, whitened,
         wide_min, wide_max, narrow_min, narrow_max
@@ -22,7 +27,10 @@ def build_phase1_configs(device=torch.device("cpu")):
     # Base Axes
     # --------------------------------------------------------
 
-    families  = torch.arange(5,  device=device, dtype=torch.int64)     # 0-4
+    families  = torch.cat([
+        torch.arange(5, device=device, dtype=torch.int64),             # 0-4
+        torch.as_tensor(list(custom_families), device=device, dtype=torch.int64)
+    ])
     lobes     = torch.arange(4, 13, device=device, dtype=torch.int64)  # 4-12
     orders    = torch.arange(4, 13, device=device, dtype=torch.int64)  # 4-12
     scaling   = torch.arange(4,  device=device, dtype=torch.int64)     # 0-3
@@ -32,7 +40,7 @@ def build_phase1_configs(device=torch.device("cpu")):
     base_axes = torch.cartesian_prod(
         families, lobes, orders, scaling, precision, whitening
     ).to(torch.float64)
-    # Shape: [6480, 6]
+    # Shape: [1296 * families, 6]
 
     # --------------------------------------------------------
     # Domain Assignment
@@ -0,0 +1,253 @@
+# ============================================================
+# bsspt Command Line
+# One entry point for the workflow scripts, so runs can be driven
+# from a job scheduler without editing constants in source:
+#
+#   sweep      phase 1 sweep                      (phase1.py)
+#   merge      batch CSVs -> one Parquet          (parq.py)
+#   clean      filtered training subset           (phase1_cleanup.py)
+#   aggregate  single-pass grouped statistics     (aggregate.py)
+#   plot       heatmaps / dashboards / scores / stress / orders figures
+#   bench      engine benchmark suite             (bench.py)
+#
+# Each subcommand overrides the script's module settings with the
+# options given and calls its run_* function; options left out keep
+# the script's defaults. Heavy modules are imported per subcommand.
+#
+#   python cli.py sweep --samples 8192 --precision reference
+#   python -m bsspt plot dashboards --output-dir figures --workers 8
+# ============================================================
+
+import argparse
+import importlib
+import sys
+from typing import Dict, List, Optional, Sequence
+
+
+# plot target -> (module, run function, input path setting)
+PLOT_TARGETS = {
+    "heatmaps":        ("heatmaps",        "run_heatmaps",        "PARQUET_PATH"),
+    "dashboards":      ("heatmaps2",       "run_heatmaps2",       "PARQUET_PATH"),
+    "scores":          ("scores",          "run_scores",          "DATA_PATH"),
+    "stress":          ("spectrum-test",   "run_stress_test",     None),
+    "orders":          ("orders",          "run_orders",          None),
+    "orders-variable": ("orders-variable", "run_orders_variable", None),
+}
+
+PRECISIONS = {"performance": [0], "reference": [1], "both": None}
+
+
+def _override(module, **settings):
+    """Set module-level settings, skipping options that were not given."""
+    for name, value in settings.items():
+        if value is not None:
+            setattr(module, name, value)
+
+
+def _parse_filters(items: Sequence[str]) -> Dict[str, float]:
+    """['whitened=0', 'K=8'] -> {'whitened': 0.0, 'K': 8.0}"""
+    filters = {}
+    for item in items:
+        column, sep, value = item.partition("=")
+        if not sep:
+            raise argparse.ArgumentTypeError(f"Filter must be column=value, got {item!r}")
+        filters[column] = float(value)
+    return filters
+
+
+# ============================================================
+# SUBCOMMANDS
+# ============================================================
+
+def cmd_sweep(args):
+    import phase1
+
+    _override(
+        phase1,
+        OUTPUT_DIR=args.output_dir,
+        DISK_BATCH_SIZE=args.disk_batch_size,
+        SUB_BATCH_SIZE=args.sub_batch_size,
+        LAMBDA_SAMPLES=args.samples,
+        QUADRATURE_RULE=args.quadrature,
+        QUADRATURE_TOL=args.quadrature_tol,
+        MEMORY_BUDGET=args.memory_budget,
+        EIGEN_MODE=args.eigen_mode,
+        COMPILE=args.compile,
+        ORDER_SWEEP=args.order_sweep,
+        CUSTOM_TOPOLOGIES=args.topologies,
+        NUM_THREADS=args.threads,
+    )
+    if args.precision is not None:
+        phase1.PRECISION_IDS = PRECISIONS[args.precision]
+
+    phase1.run_phase1()
+
+
+def cmd_merge(args):
+    import parq
+
+    parq.run_merge(
+        input_glob=args.input_glob or parq.INPUT_GLOB,
+        output_path=args.output or parq.OUTPUT_PARQUET
+    )
+
+
+def cmd_clean(args):
+    import phase1_cleanup as cleanup
+
+    cleanup.run_cleanup(
+        input_path=args.input or cleanup.INPUT_PARQUET,
+        output_parquet=args.output or cleanup.OUTPUT_PARQUET,
+        output_csv=None if args.no_csv else (args.output_csv or cleanup.OUTPUT_CSV),
+        logcond_min=cleanup.LOGCOND_MIN if args.logcond_min is None else args.logcond_min,
+        logcond_max=cleanup.LOGCOND_MAX if args.logcond_max is None else args.logcond_max,
+        valid_families=args.families or cleanup.VALID_FAMILIES
+    )
+
+
+def cmd_aggregate(args):
+    import aggregate
+
+    result = aggregate.aggregate_parquet(
+        args.input,
+        by=args.by,
+        metrics=args.metrics,
+        stats=args.stats,
+        quantiles=args.quantiles,
+        filters=_parse_filters(args.filter),
+        batch_rows=args.batch_rows or aggregate.BATCH_ROWS
+    )
+
+    if args.output is None:
+        print(result.to_string(index=False))
+    elif args.output.endswith(".csv"):
+        result.to_csv(args.output, index=False)
+    else:
+        result.to_parquet(args.output, engine="pyarrow", compression="zstd", index=False)
+
+    if args.output is not None:
+        print(f"Groups: {len(result):,}  ->  {args.output}")
+
+
+def cmd_plot(args):
+    module_name, run_name, path_setting = PLOT_TARGETS[args.target]
+    module = importlib.import_module(module_name)
+
+    _override(module, OUTPUT_DIR=args.output_dir, RENDER_WORKERS=args.workers)
+    if args.input is not None:
+        if path_setting is None:
+            raise SystemExit(f"plot {args.target} does not read a dataset")
+        setattr(module, path_setting, args.input)
+
+    getattr(module, run_name)()
+
+
+def cmd_bench(args):
+    import torch
+    import bench
+
+    if args.threads is not None:
+        torch.set_num_threads(args.threads)
+
+    dtypes = {"float32": torch.float32, "float64": torch.float64}
+
+    bench.run_bench(
+        lobes=args.lobes or bench.BENCH_LOBES,
+        orders=args.orders or bench.BENCH_ORDERS,
+        samples=args.samples or bench.BENCH_SAMPLES,
+        dtypes=[dtypes[d] for d in args.dtypes] if args.dtypes else bench.BENCH_DTYPES,
+        targets=args.targets or bench.BENCH_TARGETS,
+        repeats=args.repeats or bench.REPEATS,
+        device=torch.device(args.device) if args.device else None,
+        output_path=args.output or bench.OUTPUT_PATH
+    )
+
+
+# ============================================================
+# PARSER
+# ============================================================
+
+def build_parser() -> argparse.ArgumentParser:
+
+    parser = argparse.ArgumentParser(prog="bsspt", description="BsSPT stability sweep workflow")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    # ---- sweep
+    p = commands.add_parser("sweep", help="run the phase 1 sweep")
+    p.add_argument("--output-dir")
+    p.add_argument("--disk-batch-size", type=int, help="configs per written shard")
+    p.add_argument("--sub-batch-size", type=int, help="configs per in-memory sub-batch")
+    p.add_argument("--samples", type=int, help="lambda samples (LAMBDA_SAMPLES)")
+    p.add_argument("--quadrature", choices=["trapezoid", "simpson", "gauss", "composite_gauss", "adaptive"])
+    p.add_argument("--quadrature-tol", type=float, help="tune rule and samples per row to this tolerance")
+    p.add_argument("--precision", choices=sorted(PRECISIONS), help="precision_id rows to sweep")
+    p.add_argument("--eigen-mode", choices=["full", "estimate", "screen"])
+    p.add_argument("--memory-budget", type=int, help="transient bytes per basis build")
+    p.add_argument("--compile", action=argparse.BooleanOptionalAction, default=None, help="fuse the recurrence with torch.compile")
+    p.add_argument("--order-sweep", action=argparse.BooleanOptionalAction, default=None,
+                   help="order the grid so constant-scaling order sweeps share one build")
+    p.add_argument("--topologies", help="custom topology families to sweep (topology_search.py output)")
+    p.add_argument("--threads", type=int, help="torch intra-op threads")
+    p.set_defaults(func=cmd_sweep)
+
+    # ---- merge
+    p = commands.add_parser("merge", help="merge batch CSVs into one Parquet")
+    p.add_argument("--input-glob")
+    p.add_argument("--output")
+    p.set_defaults(func=cmd_merge)
+
+    # ---- clean
+    p = commands.add_parser("clean", help="write the filtered training subset")
+    p.add_argument("--input")
+    p.add_argument("--output", help="cleaned Parquet")
+    p.add_argument("--output-csv")
+    p.add_argument("--no-csv", action="store_true", help="skip the CSV copy")
+    p.add_argument("--logcond-min", type=float)
+    p.add_argument("--logcond-max", type=float)
+    p.add_argument("--families", type=int, nargs="+")
+    p.set_defaults(func=cmd_clean)
+
+    # ---- aggregate
+    p = commands.add_parser("aggregate", help="grouped statistics in one pass over a Parquet")
+    p.add_argument("input")
+    p.add_argument("--by", nargs="+", default=["family_id", "K", "order"])
+    p.add_argument("--metrics", nargs="+", default=["log10_condition"])
+    p.add_argument("--stats", nargs="+", default=["count", "mean", "min", "max"])
+    p.add_argument("--quantiles", type=float, nargs="*", default=[])
+    p.add_argument("--filter", action="append", default=[], metavar="COLUMN=VALUE")
+    p.add_argument("--batch-rows", type=int)
+    p.add_argument("--output", help=".parquet or .csv; printed when omitted")
+    p.set_defaults(func=cmd_aggregate)
+
+    # ---- plot
+    p = commands.add_parser("plot", help="render figures (headless with --output-dir)")
+    p.add_argument("target", choices=sorted(PLOT_TARGETS))
+    p.add_argument("--input", help="dataset Parquet")
+    p.add_argument("--output-dir", help="write figures here instead of showing them")
+    p.add_argument("--workers", type=int, help="render processes")
+    p.set_defaults(func=cmd_plot)
+
+    # ---- bench
+    p = commands.add_parser("bench", help="engine benchmark suite")
+    p.add_argument("--lobes", type=int, nargs="+")
+    p.add_argument("--orders", type=int, nargs="+")
+    p.add_argument("--samples", type=int, nargs="+")
+    p.add_argument("--dtypes", nargs="+", choices=["float32", "float64"])
+    p.add_argument("--targets", nargs="+")
+    p.add_argument("--repeats", type=int)
+    p.add_argument("--device")
+    p.add_argument("--threads", type=int, help="torch intra-op threads")
+    p.add_argument("--output")
+    p.set_defaults(func=cmd_bench)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    args.func(args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,16 +1,9 @@
 import torch
 from torch import Tensor
-from typing import Callable, Union
+from typing import Callable
 
 from engine.spectraloperator import SpectralOperator
-from engine.ghgsfbasis import GHGSFMultiLobeBasis
-
-AnyBasis = Union[
-    "GHGSFMultiLobeBasis",
-    "GHGSFMultiLobeBasisFlexible",
-    "GHGSFMultiLobeBasisScaled",
-    "GHGSFMultiLobeBasisDualDomain",
-]
+from engine.ghgsfbasisbase import GHGSFMultiLobeBasisBase
 
 
 class AbsorptionOperator:
@@ -28,14 +21,13 @@ class AbsorptionOperator:
 
     @staticmethod
     def create(
-        basis: AnyBasis,
+        basis: GHGSFMultiLobeBasisBase,
         sigmaA: Callable[[Tensor], Tensor],
         distance: float
     ) -> SpectralOperator:
 
         B    = basis.m_basisRaw
         w    = basis.m_domain.m_weights
-        L    = basis.m_chol
         lbda = basis.m_domain.m_lambda
 
         T = torch.exp(-sigmaA(lbda) * distance)   # [L]
@@ -43,8 +35,7 @@ class AbsorptionOperator:
         M_raw = (B * (w * T)) @ B.T               # [M, M]
 
         # Solve G A = M_raw  →  A = G⁻¹ M_raw  via Cholesky
-        Y = torch.linalg.solve_triangular(L,   M_raw, upper=False)
-        A = torch.linalg.solve_triangular(L.T, Y,     upper=True)
+        A = basis.solveGram(M_raw)
 
         b = torch.zeros(basis.m_M, device=A.device, dtype=A.dtype)
 
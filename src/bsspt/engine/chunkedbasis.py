@@ -0,0 +1,71 @@
+import torch
+from torch import Tensor
+from typing import Callable, Tuple
+
+from engine.hermitebasis import hermiteFunctions
+
+
+# Transient [K, N] planes per wavelength sample of one tile: x, the
+# recurrence's three live orders and its temporaries, the tile output
+# and its weighted copy for the Gram update.
+TILE_PLANES = 10
+
+
+def chooseTileSize(K: int, N: int, L: int, dtype: torch.dtype, memoryBudget: int) -> int:
+    """
+    Largest wavelength tile whose transient working set fits memoryBudget bytes.
+
+    Working set per tile of T samples:
+        K*N * TILE_PLANES * T  elements
+
+    The persistent outputs (basis [M, L], Gram [M, M]) are not counted —
+    they exist regardless of tiling. Never returns less than one sample.
+    """
+    bytesPerElem = torch.finfo(dtype).bits // 8
+    perSample    = K * N * TILE_PLANES * bytesPerElem
+
+    return max(1, min(L, memoryBudget // perSample))
+
+
+def buildBasisChunked(
+    lbda: Tensor,
+    weights: Tensor,
+    centers: Tensor,
+    sigmaMatrix: Tensor,
+    memoryBudget: int,
+    kernel: Callable = hermiteFunctions
+) -> Tuple[Tensor, Tensor]:
+    """
+    Tile-by-tile basis evaluation with the Gram accumulated per tile:
+
+        G = Σ_t (B_t · w_t) B_tᵀ
+
+    Only one tile's intermediates are alive at a time, so the transient
+    footprint is bounded by memoryBudget instead of growing with L.
+    kernel evaluates one tile (hermiteFunctions or its compiled twin).
+
+    Returns
+    -------
+    basisRaw : Tensor [M, L]
+    gram : Tensor [M, M]
+    """
+    K, N   = sigmaMatrix.shape
+    M      = K * N
+    L      = lbda.shape[0]
+    device = lbda.device
+    dtype  = lbda.dtype
+
+    tile = chooseTileSize(K, N, L, dtype, memoryBudget)
+
+    basisRaw = torch.empty((M, L), device=device, dtype=dtype)
+    gram     = torch.zeros((M, M), device=device, dtype=dtype)
+
+    for start in range(0, L, tile):
+        end = min(start + tile, L)
+
+        B_t = kernel(lbda[start:end], centers, sigmaMatrix)   # [M, T]
+
+        basisRaw[:, start:end] = B_t
+        gram.addmm_(B_t * weights[start:end], B_t.T)
+
+    return basisRaw, gram
@@ -0,0 +1,108 @@
+import warnings
+import torch
+from torch import Tensor
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from engine.hermitebasis import hermiteFunctions
+
+
+# ---------------------------------------------------------
+# Fused (torch.compile / inductor) versions of the build kernels.
+#
+# Eager, every recurrence step of hermiteFunctions is a handful of
+# elementwise ops, each writing a full [K, N-n, L] temporary. Inductor
+# fuses the exp, the divisions and each step's multiply-adds into a few
+# loops over L. The graph is specialized per shape (the recurrence unrolls
+# over N), so compilation is paid once per (K, N, L, dtype, device) and
+# reused for the rest of a sweep.
+#
+# When compilation is unavailable (no inductor, no C compiler, ...) the
+# first failure is reported once and every later call runs eager.
+# ---------------------------------------------------------
+
+# Phase 1 spans K 4..12 × order 4..12 = 81 shapes per sample count; dynamo's
+# default of 8 recompiles per function would silently drop back to eager.
+RECOMPILE_LIMIT = 256
+
+_compiled: Dict[str, Callable] = {}
+_shapes:   Dict[str, set]      = {"hermiteFunctions": set()}
+_failure:  Optional[str]       = None
+
+
+def _raiseRecompileLimit():
+    import torch._dynamo.config as dynamo_config
+
+    for name in ("recompile_limit", "cache_size_limit", "accumulated_recompile_limit"):
+        if hasattr(dynamo_config, name):
+            setattr(dynamo_config, name, max(getattr(dynamo_config, name), RECOMPILE_LIMIT))
+
+
+def _kernel(name: str, eager: Callable) -> Callable:
+    fn = _compiled.get(name)
+    if fn is None:
+        _raiseRecompileLimit()
+        fn = torch.compile(eager, dynamic=False)
+        _compiled[name] = fn
+    return fn
+
+
+def _run(name: str, eager: Callable, key: Tuple, *args) -> Tensor:
+    global _failure
+
+    if _failure is not None:
+        return eager(*args)
+
+    try:
+        out = _kernel(name, eager)(*args)
+    except Exception as exc:
+        # Bad inputs fail eager too and propagate; only a compile failure
+        # falls through to disabling compilation
+        out      = eager(*args)
+        _failure = f"{type(exc).__name__}: {exc}".splitlines()[0]
+        warnings.warn(f"torch.compile unavailable, using eager kernels ({_failure})")
+        return out
+
+    _shapes[name].add(key)
+    return out
+
+
+# ---------------------------------------------------------
+# Kernels
+# ---------------------------------------------------------
+
+def compiledHermiteFunctions(lbda: Tensor, centers: Tensor, sigmaMatrix: Tensor) -> Tensor:
+    """Fused hermiteFunctions — same signature and result."""
+    key = (tuple(sigmaMatrix.shape), lbda.shape[0], lbda.dtype, lbda.device.type)
+    return _run("hermiteFunctions", hermiteFunctions, key, lbda, centers, sigmaMatrix)
+
+
+# ---------------------------------------------------------
+# Warm-up / inspection
+# ---------------------------------------------------------
+
+def warmup(
+    shapes: Iterable[Tuple[int, int, int]],
+    device: torch.device = torch.device("cpu"),
+    dtype: torch.dtype = torch.float64
+) -> int:
+    """
+    Compiles hermiteFunctions for every (K, N, L) up front, so a sweep's
+    timing never includes compilation. Returns the number of new shapes.
+    """
+    before = len(_shapes["hermiteFunctions"])
+
+    for K, N, L in shapes:
+        lbda    = torch.linspace(0.0, 1.0, L, device=device, dtype=dtype)
+        centers = torch.linspace(0.0, 1.0, K, device=device, dtype=dtype)
+        sigmas  = torch.ones((K, N), device=device, dtype=dtype)
+        compiledHermiteFunctions(lbda, centers, sigmas)
+
+    return len(_shapes["hermiteFunctions"]) - before
+
+
+def compileStats() -> dict:
+    return {
+        "available": _failure is None,
+        "failure":   _failure,
+        "shapes":    {name: len(keys) for name, keys in _shapes.items()},
+    }
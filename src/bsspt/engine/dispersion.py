@@ -1,16 +1,8 @@
 import torch
 from torch import Tensor
-from typing import Union
 
 from engine.spectraloperator import SpectralOperator
-from engine.ghgsfbasis import GHGSFMultiLobeBasis
-
-AnyBasis = Union[
-    "GHGSFMultiLobeBasis",
-    "GHGSFMultiLobeBasisFlexible",
-    "GHGSFMultiLobeBasisScaled",
-    "GHGSFMultiLobeBasisDualDomain",
-]
+from engine.ghgsfbasisbase import GHGSFMultiLobeBasisBase
 
 
 class DispersionOperator:
@@ -28,20 +20,18 @@ class DispersionOperator:
 
     @staticmethod
     def create(
-        basis: AnyBasis,
+        basis: GHGSFMultiLobeBasisBase,
         transferFunction: Tensor
     ) -> SpectralOperator:
 
         B = basis.m_basisRaw
         w = basis.m_domain.m_weights
-        L = basis.m_chol
         T = transferFunction                       # [L]
 
         M_raw = (B * (w * T)) @ B.T               # [M, M]
 
         # Solve G A = M_raw  →  A = G⁻¹ M_raw  via Cholesky
-        Y = torch.linalg.solve_triangular(L,   M_raw, upper=False)
-        A = torch.linalg.solve_triangular(L.T, Y,     upper=True)
+        A = basis.solveGram(M_raw)
 
         b = torch.zeros(basis.m_M, device=A.device, dtype=A.dtype)
 
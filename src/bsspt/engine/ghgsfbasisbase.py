@@ -0,0 +1,499 @@
+import torch
+from torch import Tensor
+from contextlib import nullcontext
+from typing import Iterator, List, Literal, Optional, Union
+
+from engine.spectraldomain import SpectralDomain
+from engine.hermitebasis import hermiteFunctions, hermiteFunctionOrder
+from engine.chunkedbasis import buildBasisChunked
+from engine.compiledkernels import compiledHermiteFunctions
+
+
+SolveMode = Literal["direct", "mixed"]
+
+# Mixed-mode refinement: at most REFINE_STEPS corrections. Each step gains
+# roughly -log10(cond(G) · ε32) digits until the corrections reach the
+# working-precision noise floor (≈ cond(G) · ε64 · ‖X‖), where they stop
+# shrinking. Stops when ‖dX‖ ≤ ε·‖X‖, or when ‖dX‖ no longer halves while
+# below √ε·‖X‖; anything else falls back to the full-precision factor.
+REFINE_STEPS = 10
+
+
+def gramMatrix(B: Tensor, w: Tensor) -> Tensor:
+    """
+    G = B W Bᵀ for B [..., M, L] and quadrature weights w [L].
+    Batched and differentiable — the topology optimizer reuses it.
+    """
+    return (B * w) @ B.mT
+
+
+class GHGSFMultiLobeBasisBase:
+    """
+    Gaussian-Hermite Multi-Lobe Basis over an arbitrary sigma layout.
+
+    Fully described by the lobe centers [K] and a sigma matrix [K, N]:
+
+        b_kn(λ) = φ_n((λ - c_k) / σ_kn)     row r = k*N + n
+
+    Rows appended by extendOrder / addLobe follow the original K*N block,
+    so after an update the (k, n) of row r is (m_rowLobe[r], m_rowOrder[r]).
+
+    Subclasses differ only in how they fill the sigma matrix
+    (one sigma, a per-order schedule, two lobe groups, ...).
+    Everything downstream of it — evaluation, Gram, Cholesky,
+    projection, reconstruction — lives here, once.
+
+    Owns:
+        - Sigma matrix            [K, N]
+        - Raw basis matrix B      [M, L]
+        - Gram matrix G           [M, M]
+        - Cholesky factor L       [M, M]  (G = L L^T)
+
+    Does NOT:
+        - Store inverse
+        - Perform whitening
+        - Perform operator logic
+    """
+
+    def __init__(
+        self,
+        domain: SpectralDomain,
+        centers: Union[List[float], Tensor],
+        sigmaMatrix: Tensor,
+        profiler=None,
+        memoryBudget: Optional[int] = None,
+        compiled: bool = False,
+        solveMode: SolveMode = "direct"
+    ):
+        if solveMode not in ("direct", "mixed"):
+            raise ValueError(f"Unknown solveMode: {solveMode}")
+
+        self.m_domain  = domain
+        self.m_centers = torch.as_tensor(
+            centers, device=domain.m_device, dtype=domain.m_dtype
+        )
+        self.m_sigmaMatrix = torch.as_tensor(
+            sigmaMatrix, device=domain.m_device, dtype=domain.m_dtype
+        )
+
+        K, N = self.m_sigmaMatrix.shape
+        if self.m_centers.shape != (K,):
+            raise ValueError(
+                f"sigmaMatrix has {K} rows but {self.m_centers.shape[0]} centers were given."
+            )
+
+        self.m_K     = K
+        self.m_N     = N
+        self.m_M     = K * N
+        self.m_order = N
+
+        rows = torch.arange(K * N, device=domain.m_device)
+        self.m_rowLobe  = rows // N
+        self.m_rowOrder = rows %  N
+
+        self.m_basisRaw = None
+        self.m_gram     = None
+        self.m_chol     = None
+        self.m_cholLow  = None
+
+        # Optional stage hook — any object with a stage(name) context manager
+        self.m_profiler = profiler
+
+        # Bounded-memory build: basis and Gram assembled together, tile by tile
+        self.m_memoryBudget = memoryBudget
+
+        # Fused recurrence via torch.compile (see engine.compiledkernels)
+        self.m_compiled = compiled
+        self.m_kernel   = compiledHermiteFunctions if compiled else hermiteFunctions
+
+        # Gram solves: "direct" through m_chol, or "mixed" — a float32 factor
+        # (m_cholLow) refined against the working-precision Gram
+        self.m_solveMode = solveMode
+
+        if memoryBudget is None:
+            with self._stage("basis"):
+                self._buildBasis()
+            with self._stage("gram"):
+                self._buildGram()
+        else:
+            with self._stage("basis_gram"):
+                self._buildChunked()
+        with self._stage("cholesky"):
+            self._buildCholesky()
+
+    def _stage(self, name: str):
+        if self.m_profiler is None:
+            return nullcontext()
+        return self.m_profiler.stage(name)
+
+    # ---------------------------------------------------------
+    # Sigma matrix for N orders  [K, N]
+    # Subclasses that generate their own sigmas override this;
+    # extendOrder uses it to find the next order's sigma column.
+    # ---------------------------------------------------------
+
+    def _sigmaMatrix(self, K: int, N: int, device, dtype) -> Tensor:
+        raise NotImplementedError(
+            f"{type(self).__name__} has no sigma schedule; pass sigmaColumn explicitly."
+        )
+
+    # ---------------------------------------------------------
+    # Basis Construction — one normalized recurrence over [K, N, L]
+    # ---------------------------------------------------------
+
+    def _buildBasis(self):
+        self.m_basisRaw = self.m_kernel(
+            self.m_domain.m_lambda, self.m_centers, self.m_sigmaMatrix
+        )   # [M, L]
+
+    # ---------------------------------------------------------
+    # Chunked Basis + Gram  (see engine.chunkedbasis)
+    # ---------------------------------------------------------
+
+    def _buildChunked(self):
+        self.m_basisRaw, self.m_gram = buildBasisChunked(
+            self.m_domain.m_lambda,
+            self.m_domain.m_weights,
+            self.m_centers,
+            self.m_sigmaMatrix,
+            self.m_memoryBudget,
+            kernel=self.m_kernel
+        )
+
+    # ---------------------------------------------------------
+    # Gram / Cholesky
+    # ---------------------------------------------------------
+
+    def _buildGram(self):
+        self.m_gram = gramMatrix(self.m_basisRaw, self.m_domain.m_weights)
+
+    def _buildCholesky(self):
+        if self._mixed():
+            # Full-precision factor is deferred to first m_chol access
+            self.m_cholLow = self._factorLow()
+            self.m_chol    = None
+        else:
+            self.m_chol = torch.linalg.cholesky(self.m_gram)
+
+    # ---------------------------------------------------------
+    # m_chol — built on demand in mixed mode, where solves only
+    # need the float32 factor; whitening and the incremental
+    # updates still read the full-precision one.
+    # ---------------------------------------------------------
+
+    @property
+    def m_chol(self) -> Tensor:
+        if self.m_cholFull is None and self.m_gram is not None:
+            self.m_cholFull = torch.linalg.cholesky(self.m_gram)
+        return self.m_cholFull
+
+    @m_chol.setter
+    def m_chol(self, value: Optional[Tensor]):
+        self.m_cholFull = value
+
+    def _mixed(self) -> bool:
+        # Nothing to refine if the basis itself is float32 or lower
+        return self.m_solveMode == "mixed" and self.m_domain.m_dtype == torch.float64
+
+    def _factorLow(self) -> Optional[Tensor]:
+        # A Gram too ill-conditioned for float32 cannot be refined from a
+        # float32 factor either; None sends solves down the direct path
+        factor, info = torch.linalg.cholesky_ex(self.m_gram.to(torch.float32))
+        if info.item() != 0:
+            return None
+        return factor
+
+    # ---------------------------------------------------------
+    # Bordered factor update — shared by extendOrder and addLobe
+    #
+    # Appending rows B_new [r, L] borders the Gram and its factor:
+    #
+    #     G' = | G    G21ᵀ |      L' = | L    0   |
+    #          | G21  G22  |           | C    L22 |
+    #
+    #     C   = G21 L⁻ᵀ
+    #     L22 = chol(G22 - C Cᵀ)
+    #
+    # Cost is an [r, M] Gram border, one triangular solve (O(M² r))
+    # and an r×r Cholesky, instead of O(M² L + M³) for a rebuild.
+    # ---------------------------------------------------------
+
+    def _appendRows(self, B_new: Tensor, rowLobe: Tensor, rowOrder: Tensor):
+
+        w = self.m_domain.m_weights
+        r = B_new.shape[0]
+
+        with self._stage("gram"):
+            Bw  = B_new * w
+            G21 = Bw @ self.m_basisRaw.T   # [r, M]
+            G22 = Bw @ B_new.T             # [r, r]
+
+        with self._stage("cholesky"):
+            C   = torch.linalg.solve_triangular(self.m_chol, G21.T, upper=False).T
+            L22 = torch.linalg.cholesky(G22 - C @ C.T)
+
+        # Commit only after the factorization succeeded
+        zeros = torch.zeros((self.m_M, r), device=B_new.device, dtype=B_new.dtype)
+
+        self.m_basisRaw = torch.cat([self.m_basisRaw, B_new], dim=0)
+        self.m_gram = torch.cat([
+            torch.cat([self.m_gram, G21.T], dim=1),
+            torch.cat([G21,         G22],   dim=1)
+        ], dim=0)
+        self.m_chol = torch.cat([
+            torch.cat([self.m_chol, zeros], dim=1),
+            torch.cat([C,           L22],   dim=1)
+        ], dim=0)
+
+        self.m_rowLobe  = torch.cat([self.m_rowLobe,  rowLobe])
+        self.m_rowOrder = torch.cat([self.m_rowOrder, rowOrder])
+
+        if self._mixed():
+            self.m_cholLow = self._factorLow()
+
+    # ---------------------------------------------------------
+    # Order extension  N → N+1  (appends K rows, order N of every lobe)
+    # ---------------------------------------------------------
+
+    def extendOrder(self, sigmaColumn: Optional[Tensor] = None):
+        """
+        sigmaColumn : [K] sigma of the new order per lobe. Defaults to the
+        subclass schedule, which must leave the existing N columns unchanged
+        (constant sigmas do; schedules spread over N, e.g. linspace, do not).
+        """
+        K, N   = self.m_K, self.m_N
+        device = self.m_domain.m_device
+        dtype  = self.m_domain.m_dtype
+
+        if sigmaColumn is None:
+            extended = self._sigmaMatrix(K, N + 1, device, dtype)
+            if not torch.allclose(extended[:, :N], self.m_sigmaMatrix):
+                raise ValueError(
+                    f"{type(self).__name__} sigma schedule changes with order count; "
+                    "existing orders would move. Rebuild at the new order instead."
+                )
+            sigmaColumn = extended[:, N]
+
+        sigmaColumn = torch.as_tensor(sigmaColumn, device=device, dtype=dtype)
+        if sigmaColumn.shape != (K,):
+            raise ValueError(f"sigmaColumn must have shape ({K},), got {tuple(sigmaColumn.shape)}.")
+
+        with self._stage("basis"):
+            B_new = hermiteFunctionOrder(
+                self.m_domain.m_lambda, self.m_centers, sigmaColumn, N
+            )   # [K, L]
+
+        lobes = torch.arange(K, device=self.m_rowLobe.device)
+        self._appendRows(B_new, lobes, torch.full_like(lobes, N))
+
+        self.m_sigmaMatrix = torch.cat([self.m_sigmaMatrix, sigmaColumn.unsqueeze(1)], dim=1)
+
+        self.m_N     = N + 1
+        self.m_M     = K * (N + 1)
+        self.m_order = N + 1
+
+    def iterOrders(self, maxOrder: int) -> Iterator["GHGSFMultiLobeBasisBase"]:
+        """
+        Yields this basis at its current order, then after each extension
+        up to maxOrder — an order sweep for the cost of roughly one build.
+        """
+        yield self
+        while self.m_N < maxOrder:
+            self.extendOrder()
+            yield self
+
+    # ---------------------------------------------------------
+    # Lobe addition  K → K+1  (appends N rows, every order of one lobe)
+    # ---------------------------------------------------------
+
+    def addLobe(self, center: float, sigmaRow: Optional[Tensor] = None):
+        """
+        center : wavelength of the new lobe; it becomes lobe index K.
+        sigmaRow : [N] sigma per order. Defaults to row K of the subclass
+        schedule for K+1 lobes.
+        """
+        K, N   = self.m_K, self.m_N
+        device = self.m_domain.m_device
+        dtype  = self.m_domain.m_dtype
+
+        if sigmaRow is None:
+            sigmaRow = self._sigmaMatrix(K + 1, N, device, dtype)[K]
+
+        sigmaRow = torch.as_tensor(sigmaRow, device=device, dtype=dtype)
+        if sigmaRow.shape != (N,):
+            raise ValueError(f"sigmaRow must have shape ({N},), got {tuple(sigmaRow.shape)}.")
+
+        center = torch.as_tensor([center], device=device, dtype=dtype)
+
+        with self._stage("basis"):
+            B_new = self.m_kernel(
+                self.m_domain.m_lambda, center, sigmaRow.unsqueeze(0)
+            )   # [N, L]
+
+        orders = torch.arange(N, device=self.m_rowOrder.device)
+        self._appendRows(B_new, torch.full_like(orders, K), orders)
+
+        self.m_centers     = torch.cat([self.m_centers, center])
+        self.m_sigmaMatrix = torch.cat([self.m_sigmaMatrix, sigmaRow.unsqueeze(0)], dim=0)
+
+        self.m_K = K + 1
+        self.m_M = (K + 1) * N
+
+    # ---------------------------------------------------------
+    # Lobe removal  K → K-1
+    #
+    # Rows before the first removed row keep their factor rows. The kept
+    # rows after it, X = L[S, p:], satisfy G'_SS = L[S, :p] L[S, :p]ᵀ + X Xᵀ,
+    # so their new diagonal block is the triangular factor of X Xᵀ — an LQ
+    # of X (QR of Xᵀ). For a contiguous lobe block this is the rank-N
+    # update  chol(L33 L33ᵀ + L32 L32ᵀ). The basis is never re-sampled.
+    # ---------------------------------------------------------
+
+    def removeLobe(self, k: int):
+
+        K = self.m_K
+        if not 0 <= k < K:
+            raise IndexError(f"Lobe {k} out of range for {K} lobes.")
+        if K == 1:
+            raise ValueError("Cannot remove the only lobe.")
+
+        removed = self.m_rowLobe == k
+        keep    = torch.nonzero(~removed).squeeze(1)
+        p       = int(torch.nonzero(removed)[0])
+
+        L_old = self.m_chol
+        tail  = keep[keep >= p]
+
+        with self._stage("cholesky"):
+            X = L_old[tail, p:]                                   # [m, M - p]
+            R = torch.linalg.qr(X.T, mode="r").R                  # [m, m]
+            sign = torch.sign(torch.diagonal(R))
+            sign[sign == 0] = 1.0
+            L_tail = R.T * sign                                   # X Xᵀ = L_tail L_tailᵀ
+
+        chol = torch.zeros((keep.shape[0], keep.shape[0]), device=L_old.device, dtype=L_old.dtype)
+        chol[:p, :p] = L_old[:p, :p]
+        chol[p:, :p] = L_old[tail, :p]
+        chol[p:, p:] = L_tail
+
+        self.m_chol     = chol
+        self.m_gram     = self.m_gram[keep][:, keep]
+        if self._mixed():
+            self.m_cholLow = self._factorLow()
+        self.m_basisRaw = self.m_basisRaw[keep]
+
+        rowLobe = self.m_rowLobe[keep]
+        self.m_rowLobe  = rowLobe - (rowLobe > k).to(rowLobe.dtype)
+        self.m_rowOrder = self.m_rowOrder[keep]
+
+        self.m_centers     = torch.cat([self.m_centers[:k],     self.m_centers[k + 1:]])
+        self.m_sigmaMatrix = torch.cat([self.m_sigmaMatrix[:k], self.m_sigmaMatrix[k + 1:]])
+
+        self.m_K = K - 1
+        self.m_M = (K - 1) * self.m_N
+
+    # ---------------------------------------------------------
+    # Gram solve  — G X = R  via the two triangular solves
+    # Shared by projection and every Galerkin operator.
+    #
+    # Mixed mode: solve with the float32 factor, then refine
+    #
+    #     r = R - G X          (float64)
+    #     X += solve32(r)
+    #
+    # Converges to float64 accuracy while cond(G)·ε32 < 1.
+    # ---------------------------------------------------------
+
+    def solveGram(self, rhs: Tensor) -> Tensor:
+        """
+        rhs : [M] or [M, k]  →  same shape
+        """
+        vector = rhs.dim() == 1
+        if vector:
+            rhs = rhs.unsqueeze(1)
+
+        if self._mixed() and self.m_cholLow is not None:
+            x = self._solveRefined(rhs)
+        else:
+            x = self._solveFactor(self.m_chol, rhs)
+
+        return x.squeeze(1) if vector else x
+
+    @staticmethod
+    def _solveFactor(chol: Tensor, rhs: Tensor) -> Tensor:
+        y = torch.linalg.solve_triangular(chol,   rhs, upper=False)
+        return torch.linalg.solve_triangular(chol.T, y, upper=True)
+
+    def _solveRefined(self, rhs: Tensor) -> Tensor:
+
+        low = self.m_cholLow
+        G   = self.m_gram
+        eps = torch.finfo(G.dtype).eps
+        x   = self._solveFactor(low, rhs.to(low.dtype)).to(rhs.dtype)
+
+        prev = None
+        for _ in range(REFINE_STEPS):
+            r  = rhs - G @ x
+            dx = self._solveFactor(low, r.to(low.dtype)).to(rhs.dtype)
+            x  = x + dx
+
+            step = torch.linalg.norm(dx).item()
+            size = torch.linalg.norm(x).item()
+            if step <= eps * size:
+                return x
+            if prev is not None and step > 0.5 * prev:
+                if step <= eps ** 0.5 * size:
+                    return x
+                break
+            prev = step
+
+        return self._solveFactor(self.m_chol, rhs)
+
+    # ---------------------------------------------------------
+    # Projection  — solve G alpha = b
+    # ---------------------------------------------------------
+
+    def project(self, spectrum: Tensor) -> Tensor:
+
+        B = self.m_basisRaw
+        w = self.m_domain.m_weights
+
+        if spectrum.device != B.device:
+            spectrum = spectrum.to(B.device)
+        if spectrum.dtype != B.dtype:
+            spectrum = spectrum.to(B.dtype)
+
+        b = (B * w) @ spectrum   # [M]
+
+        return self.solveGram(b)
+
+    def projectBatch(self, spectra: Tensor) -> Tensor:
+        """
+        spectra : [S, L]  →  coefficients [S, M], one Gram solve for all
+        """
+        B = self.m_basisRaw
+        w = self.m_domain.m_weights
+
+        if spectra.device != B.device:
+            spectra = spectra.to(B.device)
+        if spectra.dtype != B.dtype:
+            spectra = spectra.to(B.dtype)
+
+        b = (B * w) @ spectra.T   # [M, S]
+
+        return self.solveGram(b).T
+
+    # ---------------------------------------------------------
+    # Reconstruction
+    # ---------------------------------------------------------
+
+    def reconstruct(self, coeffs: Tensor) -> Tensor:
+
+        B = self.m_basisRaw
+
+        if coeffs.device != B.device:
+            coeffs = coeffs.to(B.device)
+        if coeffs.dtype != B.dtype:
+            coeffs = coeffs.to(B.dtype)
+
+        return coeffs @ B
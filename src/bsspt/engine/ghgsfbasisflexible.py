@@ -1,15 +1,15 @@
 import torch
 from torch import Tensor
-from typing import List, Literal, Optional
+from typing import List, Literal, Optional, Union
 
 from engine.spectraldomain import SpectralDomain
-from engine.hermitebasis import hermiteBasis
+from engine.ghgsfbasisbase import GHGSFMultiLobeBasisBase
 
 
 ScaleType = Literal["constant", "linear", "sqrt", "power"]
 
 
-class GHGSFMultiLobeBasisFlexible:
+class GHGSFMultiLobeBasisFlexible(GHGSFMultiLobeBasisBase):
     """
     Gaussian-Hermite Multi-Lobe Basis
     with configurable sigma growth per Hermite order.
@@ -24,44 +24,41 @@ class GHGSFMultiLobeBasisFlexible:
     def __init__(
         self,
         domain: SpectralDomain,
-        centers: List[float],
+        centers: Union[List[float], Tensor],
         sigma_min: float,
         sigma_max: Optional[float],
         order: int,
         scale_type: ScaleType = "sqrt",
-        gamma: float = 0.5
+        gamma: float = 0.5,
+        profiler=None,
+        memoryBudget: Optional[int] = None,
+        compiled: bool = False,
+        solveMode: str = "direct"
     ):
-        self.m_domain   = domain
-        self.m_centers  = torch.tensor(
-            centers, device=domain.m_device, dtype=domain.m_dtype
-        )
-
         self.m_sigma_min  = sigma_min
         self.m_sigma_max  = sigma_max if sigma_max is not None else sigma_min
-        self.m_order      = order
         self.m_scale_type = scale_type
         self.m_gamma      = gamma
 
-        self.m_K = len(centers)
-        self.m_N = order
-        self.m_M = self.m_K * self.m_N
-
-        self.m_basisRaw      = None
-        self.m_gram          = None
-        self.m_chol          = None
-        self.m_sigma_schedule = None
+        self.m_sigma_schedule = self._build_sigma_schedule(
+            order, domain.m_device, domain.m_dtype
+        )
 
-        self._buildBasis()
-        self._buildGram()
-        self._buildCholesky()
+        super().__init__(
+            domain,
+            centers,
+            self.m_sigma_schedule.unsqueeze(0).expand(len(centers), -1),
+            profiler=profiler,
+            memoryBudget=memoryBudget,
+            compiled=compiled,
+            solveMode=solveMode
+        )
 
     # ---------------------------------------------------------
     # Sigma Schedule  [N]
     # ---------------------------------------------------------
 
-    def _build_sigma_schedule(self, device, dtype) -> Tensor:
-
-        N = self.m_N
+    def _build_sigma_schedule(self, N: int, device, dtype) -> Tensor:
 
         if N <= 1 or self.m_scale_type == "constant":
             return torch.full((N,), self.m_sigma_min, device=device, dtype=dtype)
@@ -78,95 +75,12 @@ class GHGSFMultiLobeBasisFlexible:
         else:
             raise ValueError(f"Unknown scale_type: {self.m_scale_type}")
 
-    # ---------------------------------------------------------
-    # Basis Construction — fully batched
-    # Previously: K*N separate hermiteBasis calls in nested loops
-    # ---------------------------------------------------------
-
-    def _buildBasis(self):
-
-        lbda    = self.m_domain.m_lambda   # [L]
-        centers = self.m_centers           # [K]
-        device  = lbda.device
-        dtype   = lbda.dtype
-        K       = self.m_K
-        N       = self.m_N
-        L       = lbda.shape[0]
-
-        sigma_sched = self._build_sigma_schedule(device, dtype)  # [N]
-        self.m_sigma_schedule = sigma_sched
-
-        # Normalization constants [N]
-        n_idx      = torch.arange(N, device=device, dtype=dtype)
-        factorials = torch.exp(torch.lgamma(n_idx + 1))
-        sqrt_pi    = torch.tensor(torch.pi, device=device, dtype=dtype).sqrt()
-        norms      = torch.sqrt((2.0 ** n_idx) * factorials * sqrt_pi)  # [N]
-
-        # x[k, n, l] = (lambda[l] - centers[k]) / sigma_sched[n]
-        lbda_exp    = lbda.unsqueeze(0).unsqueeze(0)       # [1, 1, L]
-        centers_exp = centers.unsqueeze(1).unsqueeze(2)    # [K, 1, 1]
-        sigma_exp   = sigma_sched.unsqueeze(0).unsqueeze(2) # [1, N, 1]
-
-        x_full = (lbda_exp - centers_exp) / sigma_exp      # [K, N, L]
-        x_flat = x_full.reshape(K * N, L)                  # [K*N, L]
-
-        H_full = hermiteBasis(N, x_flat)                   # [K*N, N, L]
-
-        row_idx = torch.arange(K * N, device=device)
-        ord_idx = row_idx % N
-        H_diag  = H_full[row_idx, ord_idx, :]              # [K*N, L]
-
-        gaussian    = torch.exp(-0.5 * x_flat ** 2)        # [K*N, L]
-        norms_tiled = norms.repeat(K)                      # [K*N]
-
-        self.m_basisRaw = (H_diag * gaussian) / norms_tiled.unsqueeze(1)  # [M, L]
-
-    # ---------------------------------------------------------
-    # Gram / Cholesky
-    # ---------------------------------------------------------
-
-    def _buildGram(self):
-        B = self.m_basisRaw
-        w = self.m_domain.m_weights
-        self.m_gram = (B * w) @ B.T
-
-    def _buildCholesky(self):
-        self.m_chol = torch.linalg.cholesky(self.m_gram)
-
-    # ---------------------------------------------------------
-    # Projection
-    # ---------------------------------------------------------
-
-    def project(self, spectrum: Tensor) -> Tensor:
-
-        B = self.m_basisRaw
-        w = self.m_domain.m_weights
-
-        if spectrum.device != B.device:
-            spectrum = spectrum.to(B.device)
-        if spectrum.dtype != B.dtype:
-            spectrum = spectrum.to(B.dtype)
-
-        b     = ((B * w) @ spectrum).unsqueeze(1)
-        y     = torch.linalg.solve_triangular(self.m_chol,   b, upper=False)
-        alpha = torch.linalg.solve_triangular(self.m_chol.T, y, upper=True)
-
-        return alpha.squeeze(1)
-
-    # ---------------------------------------------------------
-    # Reconstruction
-    # ---------------------------------------------------------
-
-    def reconstruct(self, coeffs: Tensor) -> Tensor:
-
-        B = self.m_basisRaw
-
-        if coeffs.device != B.device:
-            coeffs = coeffs.to(B.device)
-        if coeffs.dtype != B.dtype:
-            coeffs = coeffs.to(B.dtype)
+    def _sigmaMatrix(self, K: int, N: int, device, dtype) -> Tensor:
+        return self._build_sigma_schedule(N, device, dtype).unsqueeze(0).expand(K, -1)
 
-        return coeffs @ B
+    def extendOrder(self, sigmaColumn: Optional[Tensor] = None):
+        super().extendOrder(sigmaColumn)
+        self.m_sigma_schedule = self.m_sigmaMatrix[0].clone()
 
     def get_sigma_schedule(self) -> Tensor:
         return self.m_sigma_schedule.clone()
@@ -40,3 +40,91 @@ def hermiteBasis(order: int, x: Tensor) -> Tensor:
         )
 
     return H
+
+
+def hermiteFunctions(lbda: Tensor, centers: Tensor, sigmaMatrix: Tensor) -> Tensor:
+    """
+    Normalized Gaussian-Hermite functions, one per (center, order) pair:
+
+        φ_kn(λ) = H_n(x) exp(-x²/2) / sqrt(2ⁿ n! √π),   x = (λ - c_k) / σ_kn
+
+    evaluated with the normalized three-term recurrence
+
+        ψ_0 = π^(-1/4) exp(-x²/2)
+        ψ_1 = √2 x ψ_0
+        ψ_n = √(2/n) x ψ_{n-1} - √((n-1)/n) ψ_{n-2}
+
+    which never forms H_n or n! (no overflow at high order) and needs no
+    [K*N, N, L] cube: at step n only rows of order ≥ n are still advanced,
+    so the working set is a few [K, N, L] tensors.
+
+    Parameters
+    ----------
+    lbda : Tensor [L]
+    centers : Tensor [..., K]
+    sigmaMatrix : Tensor [..., K, N]   sigma for center k at Hermite order n
+
+    Leading batch dimensions are shared by centers and sigmaMatrix.
+
+    Returns
+    -------
+    Tensor [..., K*N, L], row r = k*N + n
+    """
+
+    *batch, K, N = sigmaMatrix.shape
+    L = lbda.shape[0]
+
+    x = (lbda - centers.unsqueeze(-1).unsqueeze(-1)) / sigmaMatrix.unsqueeze(-1)   # [..., K, N, L]
+
+    out = torch.empty_like(x)
+
+    prev = None
+    cur  = torch.exp(-0.5 * x * x) * (torch.pi ** -0.25)        # ψ_0 for all rows
+    out[..., 0, :] = cur[..., 0, :]
+
+    for n in range(1, N):
+        xs = x[..., n:, :]
+        if n == 1:
+            nxt = (2.0 ** 0.5) * xs * cur[..., 1:, :]
+        else:
+            nxt = (
+                (2.0 / n) ** 0.5 * xs * cur[..., 1:, :]
+                - ((n - 1) / n) ** 0.5 * prev[..., 2:, :]
+            )
+        out[..., n, :] = nxt[..., 0, :]
+        prev, cur = cur, nxt
+
+    return out.reshape(*batch, K * N, L)
+
+
+def hermiteFunctionOrder(lbda: Tensor, centers: Tensor, sigmas: Tensor, n: int) -> Tensor:
+    """
+    Single order n of hermiteFunctions, one row per center:
+
+        φ_n((λ - c_k) / σ_k)
+
+    Same normalized recurrence, but carried at one sigma per center, so
+    the cost is K·n·L instead of a full [K, N, L] evaluation. Used to
+    append an order to an existing basis.
+
+    Parameters
+    ----------
+    lbda : Tensor [L]
+    centers : Tensor [K]
+    sigmas : Tensor [K]
+    n : int
+
+    Returns
+    -------
+    Tensor [K, L]
+    """
+
+    x = (lbda - centers.unsqueeze(-1)) / sigmas.unsqueeze(-1)   # [K, L]
+
+    prev = torch.zeros_like(x)
+    cur  = torch.exp(-0.5 * x * x) * (torch.pi ** -0.25)
+
+    for m in range(1, n + 1):
+        prev, cur = cur, (2.0 / m) ** 0.5 * x * cur - ((m - 1) / m) ** 0.5 * prev
+
+    return cur
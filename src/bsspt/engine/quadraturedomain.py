@@ -0,0 +1,237 @@
+import torch
+from torch import Tensor
+from functools import lru_cache
+from typing import List, Tuple, Union
+
+from engine.spectraldomain import SpectralDomain
+from engine.resample import resampleLinear
+
+
+# ---------------------------------------------------------
+# Gauss-Legendre nodes on [-1, 1]  (Golub-Welsch)
+#
+# Eigenvalues of the symmetric Jacobi matrix of the Legendre
+# recurrence are the nodes; weights are 2 v₀², v₀ the first
+# component of each normalized eigenvector. Computed once per
+# order in float64 on CPU and cached.
+# ---------------------------------------------------------
+
+@lru_cache(maxsize=64)
+def _legendreRule(n: int) -> Tuple[Tensor, Tensor]:
+
+    if n == 1:
+        return torch.zeros(1, dtype=torch.float64), torch.full((1,), 2.0, dtype=torch.float64)
+
+    k    = torch.arange(1, n, dtype=torch.float64)
+    beta = k / torch.sqrt(4.0 * k * k - 1.0)
+
+    J = torch.diag(beta, 1) + torch.diag(beta, -1)
+    x, V = torch.linalg.eigh(J)
+
+    return x, 2.0 * V[0, :] ** 2
+
+
+def gaussLegendre(n: int, a: Tensor, b: Tensor, device, dtype) -> Tuple[Tensor, Tensor]:
+    """
+    n-point Gauss-Legendre rule on every panel [a_p, b_p].
+
+    a, b : Tensor [P] panel edges (float64)
+
+    Returns (nodes [P*n], weights [P*n]), panel-major and ascending.
+    """
+    x, w = _legendreRule(n)
+
+    half = (0.5 * (b - a)).unsqueeze(1)       # [P, 1]
+    mid  = (0.5 * (b + a)).unsqueeze(1)
+
+    nodes   = (mid + half * x).reshape(-1)
+    weights = (half * w).reshape(-1)
+
+    return nodes.to(device=device, dtype=dtype), weights.to(device=device, dtype=dtype)
+
+
+def _panelEdges(lambdaMin: float, lambdaMax: float, panels: int) -> Tuple[Tensor, Tensor]:
+    edges = torch.linspace(lambdaMin, lambdaMax, panels + 1, dtype=torch.float64)
+    return edges[:-1], edges[1:]
+
+
+class GaussLegendreDomain(SpectralDomain):
+    """
+    Single Gauss-Legendre rule over [λ_min, λ_max].
+
+    Exact for polynomials of degree 2L-1; for the smooth Gaussian-Hermite
+    integrands it converges spectrally, so a Gram needs far fewer samples
+    than the trapezoidal grid.
+    """
+
+    def _nodes(self, lambdaMin: float, lambdaMax: float, numSamples: int):
+        a = torch.tensor([lambdaMin], dtype=torch.float64)
+        b = torch.tensor([lambdaMax], dtype=torch.float64)
+        return gaussLegendre(numSamples, a, b, self.m_device, self.m_dtype)
+
+
+class CompositeGaussDomain(SpectralDomain):
+    """
+    Equal panels, each with a pointsPerPanel-point Gauss-Legendre rule.
+    numSamples must be a multiple of pointsPerPanel.
+    """
+
+    def __init__(
+        self,
+        lambdaMin: float,
+        lambdaMax: float,
+        numSamples: int,
+        pointsPerPanel: int = 8,
+        device: torch.device = torch.device("cpu"),
+        dtype: torch.dtype = torch.float64
+    ):
+        if numSamples % pointsPerPanel != 0:
+            raise ValueError(
+                f"numSamples ({numSamples}) must be a multiple of pointsPerPanel ({pointsPerPanel})."
+            )
+
+        self.m_pointsPerPanel = pointsPerPanel
+
+        super().__init__(lambdaMin, lambdaMax, numSamples, device=device, dtype=dtype)
+
+    def _nodes(self, lambdaMin: float, lambdaMax: float, numSamples: int):
+        a, b = _panelEdges(lambdaMin, lambdaMax, numSamples // self.m_pointsPerPanel)
+        return gaussLegendre(self.m_pointsPerPanel, a, b, self.m_device, self.m_dtype)
+
+
+class SimpsonDomain(SpectralDomain):
+    """
+    Uniform grid with composite Simpson weights  h/3 · [1, 4, 2, 4, ..., 4, 1].
+    numSamples must be odd.
+    """
+
+    def _nodes(self, lambdaMin: float, lambdaMax: float, numSamples: int):
+
+        if numSamples < 3 or numSamples % 2 == 0:
+            raise ValueError(f"Simpson's rule needs an odd numSamples >= 3, got {numSamples}.")
+
+        lbda = torch.linspace(
+            lambdaMin, lambdaMax, numSamples, device=self.m_device, dtype=self.m_dtype
+        )
+
+        self.m_delta = lbda[1] - lbda[0]
+
+        w = torch.full((numSamples,), 2.0, device=self.m_device, dtype=self.m_dtype)
+        w[1::2] = 4.0
+        w[0]    = 1.0
+        w[-1]   = 1.0
+
+        return lbda, w * (self.m_delta / 3.0)
+
+
+class AdaptiveGaussDomain(SpectralDomain):
+    """
+    Composite Gauss-Legendre with panels concentrated around the lobes.
+
+    Panel edges equidistribute the density
+
+        ρ(λ) = 1 + concentration · Σ_k exp(-½ ((λ - c_k) / (spread · σ_k))²)
+
+    so panels are narrow where the basis oscillates (near each center,
+    out to a few σ) and wide over the empty tails. Pays off for sparse
+    or clustered lobes; when the lobes tile the whole range a single
+    GaussLegendreDomain is as good or better.
+
+    Parameters
+    ----------
+    centers : lobe centers [K]
+    sigmas : one sigma, or one per center — the narrowest sigma of each
+        lobe is the safe choice
+    pointsPerPanel : Gauss points per panel; numSamples must be a multiple
+    concentration : peak density relative to the background
+    spread : density width in units of σ (Hermite functions of order N
+        reach ≈ √(2N+1) σ)
+    """
+
+    # Fine grid the density CDF is tabulated on
+    s_cdfSamples = 8192
+
+    def __init__(
+        self,
+        lambdaMin: float,
+        lambdaMax: float,
+        numSamples: int,
+        centers: Union[List[float], Tensor],
+        sigmas: Union[float, List[float], Tensor],
+        pointsPerPanel: int = 8,
+        concentration: float = 4.0,
+        spread: float = 6.0,
+        device: torch.device = torch.device("cpu"),
+        dtype: torch.dtype = torch.float64
+    ):
+        if numSamples % pointsPerPanel != 0:
+            raise ValueError(
+                f"numSamples ({numSamples}) must be a multiple of pointsPerPanel ({pointsPerPanel})."
+            )
+
+        centers = torch.as_tensor(centers, dtype=torch.float64)
+        sigmas  = torch.as_tensor(sigmas,  dtype=torch.float64).expand_as(centers)
+
+        self.m_centers        = centers
+        self.m_sigmas         = sigmas
+        self.m_pointsPerPanel = pointsPerPanel
+        self.m_concentration  = concentration
+        self.m_spread         = spread
+
+        super().__init__(lambdaMin, lambdaMax, numSamples, device=device, dtype=dtype)
+
+    def density(self, lbda: Tensor) -> Tensor:
+        z = (lbda.unsqueeze(0) - self.m_centers.unsqueeze(1)) / (self.m_spread * self.m_sigmas.unsqueeze(1))
+        return 1.0 + self.m_concentration * torch.exp(-0.5 * z * z).sum(dim=0)
+
+    def _nodes(self, lambdaMin: float, lambdaMax: float, numSamples: int):
+
+        panels = numSamples // self.m_pointsPerPanel
+
+        # Cumulative density (trapezoid) on a fine grid, then invert it
+        grid = torch.linspace(lambdaMin, lambdaMax, self.s_cdfSamples, dtype=torch.float64)
+        rho  = self.density(grid)
+        cdf  = torch.cat([
+            torch.zeros(1, dtype=torch.float64),
+            torch.cumsum(0.5 * (rho[1:] + rho[:-1]) * (grid[1:] - grid[:-1]), dim=0)
+        ])
+
+        targets = torch.linspace(0.0, cdf[-1].item(), panels + 1, dtype=torch.float64)
+        edges   = resampleLinear(cdf, grid.unsqueeze(0), targets)[0]
+        edges[0], edges[-1] = lambdaMin, lambdaMax
+
+        return gaussLegendre(self.m_pointsPerPanel, edges[:-1], edges[1:], self.m_device, self.m_dtype)
+
+
+# ---------------------------------------------------------
+# Rule lookup — name → domain, for sweeps that pick a rule per row
+# ---------------------------------------------------------
+
+QUADRATURE_RULES = {
+    "trapezoid":      SpectralDomain,
+    "simpson":        SimpsonDomain,
+    "gauss":          GaussLegendreDomain,
+    "composite_gauss": CompositeGaussDomain,
+    "adaptive":       AdaptiveGaussDomain,
+}
+
+
+def makeDomain(
+    rule: str,
+    lambdaMin: float,
+    lambdaMax: float,
+    numSamples: int,
+    device: torch.device = torch.device("cpu"),
+    dtype: torch.dtype = torch.float64,
+    **kwargs
+) -> SpectralDomain:
+    """
+    Builds a domain by rule name; kwargs go to the rule's constructor
+    (pointsPerPanel, centers / sigmas for "adaptive", ...).
+    """
+    if rule not in QUADRATURE_RULES:
+        raise ValueError(f"Unknown quadrature rule: {rule}")
+
+    return QUADRATURE_RULES[rule](
+        lambdaMin, lambdaMax, numSamples, device=device, dtype=dtype, **kwargs
+    )
@@ -0,0 +1,52 @@
+import torch
+from torch import Tensor
+from typing import Optional
+
+
+def resampleLinear(
+    srcLambda: Tensor,
+    values: Tensor,
+    dstLambda: Tensor,
+    fill: Optional[float] = None
+) -> Tensor:
+    """
+    Piecewise-linear resampling of a batch of spectra that share one
+    source wavelength grid:
+
+        S(λ) = S_i + (S_{i+1} - S_i) (λ - λ_i) / (λ_{i+1} - λ_i)
+
+    The bracketing interval of every destination sample is found once
+    (searchsorted) and reused for the whole batch, so the cost is one
+    gather and one lerp over [S, L].
+
+    Parameters
+    ----------
+    srcLambda : Tensor [P]   strictly increasing
+    values : Tensor [S, P]
+    dstLambda : Tensor [L]
+    fill : float, optional
+        Value outside [srcLambda[0], srcLambda[-1]]. None holds the edge
+        samples.
+
+    Returns
+    -------
+    Tensor [S, L]
+    """
+    P = srcLambda.shape[0]
+
+    idx = torch.searchsorted(srcLambda, dstLambda).clamp(1, P - 1)   # [L]
+    lo  = idx - 1
+
+    x0 = srcLambda[lo]
+    x1 = srcLambda[idx]
+    t  = ((dstLambda - x0) / (x1 - x0)).clamp(0.0, 1.0)              # [L]
+
+    y0 = values[:, lo]
+    y1 = values[:, idx]
+    out = y0 + (y1 - y0) * t
+
+    if fill is not None:
+        outside = (dstLambda < srcLambda[0]) | (dstLambda > srcLambda[-1])
+        out = out.masked_fill(outside, fill)
+
+    return out
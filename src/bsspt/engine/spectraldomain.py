@@ -6,6 +6,9 @@ class SpectralDomain:
     Discretized spectral interval [λ_min, λ_max]
     with trapezoidal quadrature weights.
 
+    Other rules (Gauss-Legendre, Simpson, adaptive panels) live in
+    engine.quadraturedomain and only replace _nodes.
+
     Owns:
         - sample points
         - integration weights
@@ -21,25 +24,38 @@ class SpectralDomain:
         device: torch.device = torch.device("cpu"),
         dtype: torch.dtype = torch.float64
     ):
-        self.m_device = device
-        self.m_dtype  = dtype
-        self.m_count  = numSamples
+        self.m_device    = device
+        self.m_dtype     = dtype
+        self.m_lambdaMin = lambdaMin
+        self.m_lambdaMax = lambdaMax
+        self.m_delta     = None
+
+        self.m_lambda, self.m_weights = self._nodes(lambdaMin, lambdaMax, numSamples)
+        self.m_count = self.m_lambda.shape[0]
 
-        self.m_lambda = torch.linspace(
+    # ---------------------------------------------------------
+    # Quadrature rule — (nodes [L], weights [L])
+    # Subclasses in engine.quadraturedomain override this.
+    # ---------------------------------------------------------
+
+    def _nodes(self, lambdaMin: float, lambdaMax: float, numSamples: int):
+
+        lbda = torch.linspace(
             lambdaMin,
             lambdaMax,
             numSamples,
-            device=device,
-            dtype=dtype
+            device=self.m_device,
+            dtype=self.m_dtype
         )
 
-        self.m_delta = self.m_lambda[1] - self.m_lambda[0]
+        self.m_delta = lbda[1] - lbda[0]
 
         # Trapezoidal weights
-        w = torch.ones(numSamples, device=device, dtype=dtype)
+        w = torch.ones(numSamples, device=self.m_device, dtype=self.m_dtype)
         w[0] *= 0.5
         w[-1] *= 0.5
-        self.m_weights = w * self.m_delta
+
+        return lbda, w * self.m_delta
 
     # ---------------------------------------------------------
     # Integration
@@ -1,20 +1,9 @@
 import torch
 from torch import Tensor
-from typing import Union
 
-from engine.ghgsfbasis import GHGSFMultiLobeBasis
+from engine.ghgsfbasisbase import GHGSFMultiLobeBasisBase
 from engine.spectralstate import SpectralState
 
-# All basis types that SpectralOperator can accept.
-# Using Union rather than a base class since the basis hierarchy
-# relies on duck typing — all share m_M, m_basisRaw, m_chol.
-AnyBasis = Union[
-    "GHGSFMultiLobeBasis",
-    "GHGSFMultiLobeBasisFlexible",
-    "GHGSFMultiLobeBasisScaled",
-    "GHGSFMultiLobeBasisDualDomain",
-]
-
 
 class SpectralOperator:
     """
@@ -33,7 +22,7 @@ class SpectralOperator:
 
     def __init__(
         self,
-        basis: AnyBasis,
+        basis: GHGSFMultiLobeBasisBase,
         A: Tensor,
         b: Tensor
     ):
@@ -81,7 +70,7 @@ class SpectralOperator:
     # ---------------------------------------------------------
 
     @staticmethod
-    def identity(basis: AnyBasis) -> "SpectralOperator":
+    def identity(basis: GHGSFMultiLobeBasisBase) -> "SpectralOperator":
 
         M      = basis.m_M
         device = basis.m_basisRaw.device
@@ -98,7 +87,7 @@ class SpectralOperator:
     # ---------------------------------------------------------
 
     @staticmethod
-    def zero(basis: AnyBasis) -> "SpectralOperator":
+    def zero(basis: GHGSFMultiLobeBasisBase) -> "SpectralOperator":
 
         M      = basis.m_M
         device = basis.m_basisRaw.device
@@ -1,15 +1,7 @@
 import torch
 from torch import Tensor
-from typing import Union
 
-from engine.ghgsfbasis import GHGSFMultiLobeBasis
-
-AnyBasis = Union[
-    "GHGSFMultiLobeBasis",
-    "GHGSFMultiLobeBasisFlexible",
-    "GHGSFMultiLobeBasisScaled",
-    "GHGSFMultiLobeBasisDualDomain",
-]
+from engine.ghgsfbasisbase import GHGSFMultiLobeBasisBase
 
 
 class SpectralState:
@@ -23,7 +15,7 @@ class SpectralState:
     No operator logic.
     """
 
-    def __init__(self, basis: AnyBasis, coeffs: Tensor):
+    def __init__(self, basis: GHGSFMultiLobeBasisBase, coeffs: Tensor):
         self.m_basis = basis
 
         if coeffs.device != basis.m_basisRaw.device:
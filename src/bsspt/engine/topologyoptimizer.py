@@ -0,0 +1,215 @@
+import math
+import torch
+from torch import Tensor
+from typing import Callable, Literal, Optional
+
+from engine.spectraldomain import SpectralDomain
+from engine.hermitebasis import hermiteFunctions
+from engine.ghgsfbasisbase import gramMatrix
+
+
+Objective = Literal["condition", "reconstruction"]
+
+# Centers are kept off the interval ends: logit(t) with t clamped here
+EDGE_EPS = 1e-4
+
+
+# ---------------------------------------------------------
+# Objective per candidate — [S] from centers [S, K] and
+# sigmas [S, K, N]; differentiable in both.
+#
+#   "condition"      — log λ_max(G) - log λ_min(G)
+#   "reconstruction" — mean over spectra of the relative weighted
+#                      L2 error of the projection ‖S - R‖_W / ‖S‖_W
+#
+# Candidates whose Gram is not SPD score +inf.
+# ---------------------------------------------------------
+
+def topologyObjective(
+    domain: SpectralDomain,
+    centers: Tensor,
+    sigmaMatrix: Tensor,
+    objective: Objective = "condition",
+    spectra: Optional[Tensor] = None,
+    kernel: Callable = hermiteFunctions
+) -> Tensor:
+
+    w = domain.m_weights
+    B = kernel(domain.m_lambda, centers, sigmaMatrix)       # [S, M, L]
+    G = gramMatrix(B, w)                                    # [S, M, M]
+
+    if objective == "condition":
+        eig   = torch.linalg.eigvalsh(G)
+        lo    = eig[..., 0]
+        value = torch.log(eig[..., -1]) - torch.log(lo.clamp_min(torch.finfo(G.dtype).tiny))
+        return torch.where(lo > 0.0, value, torch.full_like(value, math.inf))
+
+    if objective == "reconstruction":
+        if spectra is None:
+            raise ValueError("The reconstruction objective needs spectra [C, L].")
+
+        L, info = torch.linalg.cholesky_ex(G)
+        rhs     = (B * w) @ spectra.T                       # [S, M, C]
+        alpha   = torch.cholesky_solve(rhs, L)
+        recon   = alpha.mT @ B                              # [S, C, L]
+
+        err   = ((spectra - recon).square() @ w) / (spectra.square() @ w)
+        value = torch.sqrt(err).mean(dim=-1)
+        return torch.where(info == 0, value, torch.full_like(value, math.inf))
+
+    raise ValueError(f"Unknown objective: {objective}")
+
+
+# ---------------------------------------------------------
+# Same objective on one built basis — reads its Gram and factor
+# instead of re-sampling, so a basis edited in place by
+# addLobe / removeLobe is scored without a rebuild. Both
+# objectives are invariant to the order of the lobes.
+# ---------------------------------------------------------
+
+def basisObjective(
+    basis,
+    objective: Objective = "condition",
+    spectra: Optional[Tensor] = None
+) -> float:
+
+    if objective == "condition":
+        eig = torch.linalg.eigvalsh(basis.m_gram)
+        if eig[0] <= 0.0:
+            return math.inf
+        return (torch.log(eig[-1]) - torch.log(eig[0])).item()
+
+    if objective == "reconstruction":
+        if spectra is None:
+            raise ValueError("The reconstruction objective needs spectra [C, L].")
+
+        w     = basis.m_domain.m_weights
+        recon = basis.reconstruct(basis.projectBatch(spectra))   # [C, L]
+
+        err = ((spectra - recon).square() @ w) / (spectra.square() @ w)
+        return torch.sqrt(err).mean().item()
+
+    raise ValueError(f"Unknown objective: {objective}")
+
+
+# ---------------------------------------------------------
+# Multi-start search
+# ---------------------------------------------------------
+
+def optimizeTopology(
+    domain: SpectralDomain,
+    sigmaMatrix: Tensor,
+    lambdaMin: float,
+    lambdaMax: float,
+    initialCenters: Optional[Tensor] = None,
+    starts: int = 16,
+    steps: int = 200,
+    lr: float = 0.05,
+    objective: Objective = "condition",
+    spectra: Optional[Tensor] = None,
+    optimizeSigmas: bool = False,
+    sigmaRange: float = 1.5,
+    seed: int = 0,
+    kernel: Callable = hermiteFunctions
+) -> dict:
+    """
+    Searches lobe centers (and optionally per-lobe sigma scales) that
+    minimize the objective, for a fixed sigma layout [K, N].
+
+    All candidates are one batch: every step builds [S, M, L] bases and
+    [S, M, M] Grams in a single pass, and Adam advances every start at
+    once. Centers are parameterized as
+        c = λ_min + (λ_max - λ_min) · sigmoid(u)
+    so they stay inside the interval; with optimizeSigmas, lobe k's sigma
+    row is scaled by exp(log(sigmaRange) · tanh(v_k)), bounded to
+    [1/sigmaRange, sigmaRange] without clamping the gradient.
+
+    Parameters
+    ----------
+    initialCenters : [S0, K] starting topologies (e.g. the built-in
+        families); the remaining starts - S0 candidates are random
+        sorted placements
+    spectra : [C, L] on domain, for the "reconstruction" objective
+
+    Returns
+    -------
+    dict with
+        centers, sigmaMatrix : best topology found [K], [K, N]
+        objective            : its value
+        startObjectives      : best value per start [S]
+        initialObjectives    : value per start before optimization [S]
+    """
+    device = domain.m_device
+    dtype  = domain.m_dtype
+    K, N   = sigmaMatrix.shape
+
+    sigmaMatrix = sigmaMatrix.to(device=device, dtype=dtype)
+    if spectra is not None:
+        spectra = spectra.to(device=device, dtype=dtype)
+
+    gen = torch.Generator(device="cpu").manual_seed(seed)
+    t0  = []
+    if initialCenters is not None:
+        init = torch.as_tensor(initialCenters, dtype=torch.float64).reshape(-1, K)
+        t0.append((init - lambdaMin) / (lambdaMax - lambdaMin))
+
+    numRandom = max(starts - sum(t.shape[0] for t in t0), 0)
+    if numRandom:
+        t0.append(torch.rand((numRandom, K), generator=gen, dtype=torch.float64).sort(dim=1).values)
+
+    t0 = torch.cat(t0).clamp(EDGE_EPS, 1.0 - EDGE_EPS).to(device=device, dtype=dtype)
+    S  = t0.shape[0]
+
+    u = torch.logit(t0).requires_grad_(True)
+    v = torch.zeros((S, K), device=device, dtype=dtype, requires_grad=optimizeSigmas)
+
+    params = [u, v] if optimizeSigmas else [u]
+    opt    = torch.optim.Adam(params, lr=lr)
+
+    logRange = math.log(sigmaRange)
+
+    def candidates():
+        centers = lambdaMin + (lambdaMax - lambdaMin) * torch.sigmoid(u)
+        scale   = torch.exp(logRange * torch.tanh(v)).unsqueeze(-1)
+        return centers, sigmaMatrix * scale
+
+    bestValue   = torch.full((S,), math.inf, device=device, dtype=dtype)
+    bestCenters = torch.zeros((S, K), device=device, dtype=dtype)
+    bestSigmas  = sigmaMatrix.expand(S, K, N).clone()
+    initial     = None
+
+    with torch.enable_grad():
+        for step in range(steps + 1):
+            centers, sigmas = candidates()
+            value = topologyObjective(domain, centers, sigmas, objective, spectra, kernel)
+
+            with torch.no_grad():
+                if initial is None:
+                    initial = value.detach().clone()
+                better = value < bestValue
+                bestValue   = torch.where(better, value, bestValue)
+                bestCenters = torch.where(better.unsqueeze(-1), centers, bestCenters)
+                bestSigmas  = torch.where(better.view(S, 1, 1), sigmas, bestSigmas)
+
+            if step == steps:
+                break
+
+            # Non-SPD candidates contribute no gradient this step
+            loss = torch.where(torch.isfinite(value), value, torch.zeros_like(value)).sum()
+
+            opt.zero_grad(set_to_none=True)
+            loss.backward()
+            for p in params:
+                if p.grad is not None:
+                    p.grad.nan_to_num_(nan=0.0, posinf=0.0, neginf=0.0)
+            opt.step()
+
+    best = int(torch.argmin(bestValue))
+
+    return {
+        "centers":           bestCenters[best].detach(),
+        "sigmaMatrix":       bestSigmas[best].detach(),
+        "objective":         bestValue[best].item(),
+        "startObjectives":   bestValue.detach(),
+        "initialObjectives": initial,
+    }
@@ -1,16 +1,8 @@
 import torch
 from torch import Tensor
-from typing import Union
 
 from engine.spectraloperator import SpectralOperator
-from engine.ghgsfbasis import GHGSFMultiLobeBasis
-
-AnyBasis = Union[
-    "GHGSFMultiLobeBasis",
-    "GHGSFMultiLobeBasisFlexible",
-    "GHGSFMultiLobeBasisScaled",
-    "GHGSFMultiLobeBasisDualDomain",
-]
+from engine.ghgsfbasisbase import GHGSFMultiLobeBasisBase
 
 
 class WhitenOperator:
@@ -29,7 +21,7 @@ class WhitenOperator:
     """
 
     @staticmethod
-    def create(basis: AnyBasis) -> SpectralOperator:
+    def create(basis: GHGSFMultiLobeBasisBase) -> SpectralOperator:
 
         L = basis.m_chol   # lower triangular, G = L Lᵀ
         A = L.T            # apply Lᵀ to raw coefficients
@@ -50,7 +42,7 @@ class UnwhitenOperator:
     """
 
     @staticmethod
-    def create(basis: AnyBasis) -> SpectralOperator:
+    def create(basis: GHGSFMultiLobeBasisBase) -> SpectralOperator:
 
         L      = basis.m_chol
         M      = basis.m_M
@@ -1,8 +1,8 @@
 import numpy as np
-import pandas as pd
 
 # Import your plotting engine
-from plotting.Plot import SurfaceEngine
+from plotting.Plot import SurfaceEngine, FigureBatch
+from aggregate import aggregate_parquet
 
 
 # -----------------------------
@@ -13,117 +13,120 @@ FIX_SCALING_ID = None                  # set to int if you want a specific scali
 FIX_WHITENED = None                    # set to 0 or 1 if desired
 FIX_PRECISION_ID = None                # optional precision filtering
 
+# Batch rendering: write figures here instead of showing them (None = interactive)
+OUTPUT_DIR = None                      # e.g. "figures/heatmaps"
+RENDER_WORKERS = None                  # None = CPU count
+
 
 # -----------------------------
-# LOAD DATA
+# FIGURE
 # -----------------------------
-print("Loading parquet...")
-df = pd.read_parquet(PARQUET_PATH)
+def family_surface(family, X, Y, Z):
 
-print(f"Total rows: {len(df):,}")
+    engine = SurfaceEngine(figsize=(10, 8))
 
+    engine.addSurface(X, Y, Z)
 
-# -----------------------------
-# REMOVE SPD FAILS
-# -----------------------------
-df = df[df["spd_fail_flag"] == 0]
+    engine.setLabels(
+        "Lobe (K)",
+        "Order",
+        "log10(condition)"
+    )
 
-print(f"Rows after SPD removal: {len(df):,}")
+    engine.setTitle(
+        f"Family {family} | Condition Surface (SPD-safe)"
+    )
 
+    engine.setView(elev=35, azim=55)
 
-# -----------------------------
-# OPTIONAL GLOBAL FILTERS
-# -----------------------------
-if FIX_SCALING_ID is not None:
-    df = df[df["scaling_id"] == FIX_SCALING_ID]
+    return engine
 
-if FIX_WHITENED is not None:
-    df = df[df["whitened"] == FIX_WHITENED]
 
-if FIX_PRECISION_ID is not None:
-    df = df[df["precision_id"] == FIX_PRECISION_ID]
+def run_heatmaps():
 
+    # -----------------------------
+    # AGGREGATE (single pass, bounded memory)
+    # SPD failures removed, optional global filters applied in the scan
+    # -----------------------------
+    filters = {"spd_fail_flag": 0}
 
-# -----------------------------
-# PROCESS PER FAMILY
-# -----------------------------
-families = sorted(df["family_id"].unique())
+    if FIX_SCALING_ID is not None:
+        filters["scaling_id"] = FIX_SCALING_ID
 
-print(f"Found families: {families}")
+    if FIX_WHITENED is not None:
+        filters["whitened"] = FIX_WHITENED
 
-for family in families:
+    if FIX_PRECISION_ID is not None:
+        filters["precision_id"] = FIX_PRECISION_ID
 
-    print(f"\nProcessing family {family}")
+    print("Aggregating parquet...")
+    stats = aggregate_parquet(
+        PARQUET_PATH,
+        by=["family_id", "K", "order"],
+        metrics=["log10_condition"],
+        stats=("mean",),
+        filters=filters
+    )
 
-    family_df = df[df["family_id"] == family]
+    print(f"Groups: {len(stats):,}")
 
-    if len(family_df) == 0:
-        print("No valid rows after filtering. Skipping.")
-        continue
+    # -----------------------------
+    # PROCESS PER FAMILY
+    # -----------------------------
+    families = sorted(stats["family_id"].unique())
 
-    # ---------------------------------
-    # Aggregate per (K, order)
-    # ---------------------------------
-    agg = (
-        family_df
-        .groupby(["K", "order"])
-        .agg({
-            "log10_condition": "mean"
-        })
-        .reset_index()
-    )
+    print(f"Found families: {families}")
 
-    if len(agg) == 0:
-        print("Aggregation empty. Skipping.")
-        continue
-
-    # ---------------------------------
-    # Pivot to grid
-    # ---------------------------------
-    pivot = agg.pivot(
-        index="order",
-        columns="K",
-        values="log10_condition"
-    )
+    batch = FigureBatch(OUTPUT_DIR, workers=RENDER_WORKERS)
 
-    # Sort axes for consistent geometry
-    pivot = pivot.sort_index().sort_index(axis=1)
+    for family in families:
 
-    # Drop incomplete rows/columns (optional safety)
-    pivot = pivot.dropna()
+        print(f"\nProcessing family {family}")
 
-    if pivot.shape[0] == 0 or pivot.shape[1] == 0:
-        print("Pivot grid empty after dropna. Skipping.")
-        continue
+        agg = (
+            stats[stats["family_id"] == family]
+            .rename(columns={"log10_condition_mean": "log10_condition"})
+        )
 
-    # ---------------------------------
-    # Build meshgrid
-    # ---------------------------------
-    K_vals = pivot.columns.values
-    order_vals = pivot.index.values
+        if len(agg) == 0:
+            print("Aggregation empty. Skipping.")
+            continue
 
-    X, Y = np.meshgrid(K_vals, order_vals)
-    Z = pivot.values
+        # ---------------------------------
+        # Pivot to grid
+        # ---------------------------------
+        pivot = agg.pivot(
+            index="order",
+            columns="K",
+            values="log10_condition"
+        )
 
-    # ---------------------------------
-    # Plot 3D Surface
-    # ---------------------------------
-    engine = SurfaceEngine(figsize=(10, 8))
+        # Sort axes for consistent geometry
+        pivot = pivot.sort_index().sort_index(axis=1)
 
-    engine.addSurface(X, Y, Z)
+        # Drop incomplete rows/columns (optional safety)
+        pivot = pivot.dropna()
 
-    engine.setLabels(
-        "Lobe (K)",
-        "Order",
-        "log10(condition)"
-    )
+        if pivot.shape[0] == 0 or pivot.shape[1] == 0:
+            print("Pivot grid empty after dropna. Skipping.")
+            continue
 
-    engine.setTitle(
-        f"Family {family} | Condition Surface (SPD-safe)"
-    )
+        # ---------------------------------
+        # Build meshgrid
+        # ---------------------------------
+        K_vals = pivot.columns.values
+        order_vals = pivot.index.values
 
-    engine.setView(elev=35, azim=55)
+        X, Y = np.meshgrid(K_vals, order_vals)
+        Z = pivot.values
+
+        # ---------------------------------
+        # Plot 3D Surface
+        # ---------------------------------
+        batch.add(f"condition_surface_family_{family}", family_surface, family, X, Y, Z)
+
+    batch.render()
 
-    engine.show()
 
-    engine.close()
\ No newline at end of file
+if __name__ == "__main__":
+    run_heatmaps()
@@ -1,7 +1,7 @@
 import numpy as np
-import pandas as pd
 
-from plotting.Plot import MultiPanelEngine
+from plotting.Plot import MultiPanelEngine, FigureBatch
+from aggregate import aggregate_parquet, global_range
 
 
 # -----------------------------
@@ -9,103 +9,27 @@ from plotting.Plot import MultiPanelEngine
 # -----------------------------
 PARQUET_PATH = "datasets/stability_dataset.parquet"
 
+METRICS = [
+    "log10_condition",
+    "lambda_min",
+    "spectral_entropy",
+    "std_eigen",
+    "lambda_max",
+    "mean_eigen",
+    "trace_G",
+    "dominance_gap",
+]
 
-print("Loading parquet...")
-df = pd.read_parquet(PARQUET_PATH)
-print(f"Total rows: {len(df):,}")
-
-# Remove SPD failures
-df = df[df["spd_fail_flag"] == 0]
-
-# RAW ONLY
-df = df[df["whitened"] == 0]
-
-print(f"Rows after SPD removal + raw filter: {len(df):,}")
+# Batch rendering: write figures here instead of showing them (None = interactive)
+OUTPUT_DIR = None                      # e.g. "figures/dashboards"
+RENDER_WORKERS = None                  # None = CPU count
 
 
 # -----------------------------
-# GLOBAL RANGES
+# FIGURE
 # -----------------------------
-global_ranges = {
-    "log10_condition": (df["log10_condition"].min(), df["log10_condition"].max()),
-    "lambda_min": (np.log10(df["lambda_min"].clip(lower=1e-20)).min(),
-                   np.log10(df["lambda_min"].clip(lower=1e-20)).max()),
-    "spectral_entropy": (df["spectral_entropy"].min(), df["spectral_entropy"].max()),
-    "std_eigen": (df["std_eigen"].min(), df["std_eigen"].max()),
-    "lambda_max": (df["lambda_max"].min(), df["lambda_max"].max()),
-    "mean_eigen": (df["mean_eigen"].min(), df["mean_eigen"].max()),
-    "trace_G": (df["trace_G"].min(), df["trace_G"].max()),
-    "dominance_gap": (df["dominance_gap"].min(), df["dominance_gap"].max()),
-}
-
-
-families = sorted(df["family_id"].unique())
-
-
-for family in families:
-
-    print(f"\nProcessing family {family}")
-
-    family_df = df[df["family_id"] == family]
-
-    if len(family_df) == 0:
-        continue
-
-    # -----------------------------
-    # Aggregate per (K, order)
-    # -----------------------------
-    agg = (
-        family_df
-        .groupby(["K", "order"])
-        .agg({
-            "log10_condition": "mean",
-            "lambda_min": "mean",
-            "spectral_entropy": "mean",
-            "std_eigen": "mean",
-            "lambda_max": "mean",
-            "mean_eigen": "mean",
-            "trace_G": "mean",
-            "dominance_gap": "mean",
-        })
-        .reset_index()
-    )
-
-    if len(agg) == 0:
-        continue
-
-
-    # -----------------------------
-    # Build Heatmap Matrix
-    # -----------------------------
-    def build_surface(metric_name, log_transform=False):
-
-        pivot = agg.pivot(
-            index="order",
-            columns="K",
-            values=metric_name
-        )
-
-        pivot = pivot.sort_index().sort_index(axis=1)
-
-        if log_transform:
-            pivot = np.log10(pivot.clip(lower=1e-20))
-
-        Z = pivot.values
-        K_vals = pivot.columns.values
-        order_vals = pivot.index.values
-
-        return Z, K_vals, order_vals
-
-
-    Zc, K_vals, order_vals = build_surface("log10_condition")
-    Zl, _, _ = build_surface("lambda_min", log_transform=True)
-    Ze, _, _ = build_surface("spectral_entropy")
-    Zs, _, _ = build_surface("std_eigen")
-    Zm, _, _ = build_surface("lambda_max")
-    Zme, _, _ = build_surface("mean_eigen")
-    Zt, _, _ = build_surface("trace_G")
-    Zd, _, _ = build_surface("dominance_gap")
-
+def family_dashboard(family, panels, K_vals, order_vals):
+    """panels: (title, Z, vmin, vmax) per heatmap, row-major over the 2x4 grid"""
 
     # -----------------------------
     # Multi Panel (2x4)
@@ -118,19 +42,6 @@ for family in families:
 
     engine.setMainTitle(f"Family {family} | Spectral Geometry Dashboard")
 
-
-    panels = [
-        ("log10(condition)", Zc, *global_ranges["log10_condition"]),
-        ("log10(lambda_min)", Zl, *global_ranges["lambda_min"]),
-        ("spectral_entropy", Ze, *global_ranges["spectral_entropy"]),
-        ("std_eigen", Zs, *global_ranges["std_eigen"]),
-        ("lambda_max", Zm, *global_ranges["lambda_max"]),
-        ("mean_eigen", Zme, *global_ranges["mean_eigen"]),
-        ("trace_G", Zt, *global_ranges["trace_G"]),
-        ("dominance_gap", Zd, *global_ranges["dominance_gap"]),
-    ]
-
-
     for i, (title, Z, vmin, vmax) in enumerate(panels):
 
         panel = engine.getPanel(i)
@@ -161,6 +72,98 @@ for family in families:
             aspect=10
         )
 
+    return engine
+
+
+def run_heatmaps2():
+
+    # -----------------------------
+    # AGGREGATE (single pass, bounded memory)
+    # SPD failures removed, RAW ONLY
+    # -----------------------------
+    print("Aggregating parquet...")
+    stats = aggregate_parquet(
+        PARQUET_PATH,
+        by=["family_id", "K", "order"],
+        metrics=METRICS,
+        stats=("mean", "min", "max"),
+        filters={"spd_fail_flag": 0, "whitened": 0}
+    )
+    print(f"Groups: {len(stats):,}")
+
+    # -----------------------------
+    # GLOBAL RANGES
+    # Exact, from the per-group extremes; log10 is monotonic, so the
+    # lambda_min range is the log of the raw range
+    # -----------------------------
+    global_ranges = {metric: global_range(stats, metric) for metric in METRICS}
+
+    global_ranges["lambda_min"] = tuple(
+        np.log10(np.clip(global_ranges["lambda_min"], 1e-20, None))
+    )
+
+    families = sorted(stats["family_id"].unique())
+
+    batch = FigureBatch(OUTPUT_DIR, workers=RENDER_WORKERS)
+
+    for family in families:
+
+        print(f"\nProcessing family {family}")
+
+        agg = (
+            stats[stats["family_id"] == family]
+            .rename(columns={f"{metric}_mean": metric for metric in METRICS})
+        )
+
+        if len(agg) == 0:
+            continue
+
+        # -----------------------------
+        # Build Heatmap Matrix
+        # -----------------------------
+        def build_surface(metric_name, log_transform=False):
+
+            pivot = agg.pivot(
+                index="order",
+                columns="K",
+                values=metric_name
+            )
+
+            pivot = pivot.sort_index().sort_index(axis=1)
+
+            if log_transform:
+                pivot = np.log10(pivot.clip(lower=1e-20))
+
+            Z = pivot.values
+            K_vals = pivot.columns.values
+            order_vals = pivot.index.values
+
+            return Z, K_vals, order_vals
+
+        Zc, K_vals, order_vals = build_surface("log10_condition")
+        Zl, _, _ = build_surface("lambda_min", log_transform=True)
+        Ze, _, _ = build_surface("spectral_entropy")
+        Zs, _, _ = build_surface("std_eigen")
+        Zm, _, _ = build_surface("lambda_max")
+        Zme, _, _ = build_surface("mean_eigen")
+        Zt, _, _ = build_surface("trace_G")
+        Zd, _, _ = build_surface("dominance_gap")
+
+        panels = [
+            ("log10(condition)", Zc, *global_ranges["log10_condition"]),
+            ("log10(lambda_min)", Zl, *global_ranges["lambda_min"]),
+            ("spectral_entropy", Ze, *global_ranges["spectral_entropy"]),
+            ("std_eigen", Zs, *global_ranges["std_eigen"]),
+            ("lambda_max", Zm, *global_ranges["lambda_max"]),
+            ("mean_eigen", Zme, *global_ranges["mean_eigen"]),
+            ("trace_G", Zt, *global_ranges["trace_G"]),
+            ("dominance_gap", Zd, *global_ranges["dominance_gap"]),
+        ]
+
+        batch.add(f"dashboard_family_{family}", family_dashboard, family, panels, K_vals, order_vals)
+
+    batch.render()
+
 
-    engine.show()
-    engine.close()
\ No newline at end of file
+if __name__ == "__main__":
+    run_heatmaps2()
@@ -0,0 +1,96 @@
+# ============================================================
+# Import-Time Budget
+# Measures, in fresh interpreters, how long the engine, the sweep
+# worker entry point (phase1) and the plotting module take to import
+# on top of torch, and checks that none of them pulls in pandas /
+# matplotlib / pyarrow at import time. Exits non-zero when a budget
+# is exceeded so it can gate a CI job.
+# ============================================================
+
+import os
+import sys
+import json
+import statistics
+import subprocess
+from typing import Dict, List, Sequence, Tuple
+
+
+# ============================================================
+# SETTINGS
+# ============================================================
+
+# Loaded lazily on first use — never by importing these modules
+LAZY_MODULES = ("pandas", "matplotlib", "pyarrow")
+
+# (module, seconds allowed on top of an already-imported torch)
+BUDGETS: List[Tuple[str, float]] = [
+    ("engine.ghgsfexp",          0.05),
+    ("engine.quadraturedomain",  0.05),
+    ("engine.topologyoptimizer", 0.05),
+    ("phase1",                   0.10),
+    ("plotting.Plot",            0.05),
+]
+
+# Fresh interpreters per module; the median is reported
+REPEATS = 5
+
+_PROBE = """
+import sys, time, json
+start = time.perf_counter()
+import torch
+base = time.perf_counter()
+import {module}
+end = time.perf_counter()
+print(json.dumps({{
+    "torch": base - start,
+    "module": end - base,
+    "loaded": [m for m in {lazy!r} if m in sys.modules],
+}}))
+"""
+
+
+# ============================================================
+# MEASUREMENT
+# ============================================================
+
+def measure_import(module: str, lazy: Sequence[str] = LAZY_MODULES, repeats: int = REPEATS) -> Dict:
+    """Median import time of `module` (after torch) and the lazy modules it loaded."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    env  = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [here, os.environ.get("PYTHONPATH")])))
+
+    runs = []
+    for _ in range(repeats):
+        out = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(module=module, lazy=tuple(lazy))],
+            cwd=here, env=env, capture_output=True, text=True, check=True
+        )
+        runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+    return {
+        "module": module,
+        "torch":  statistics.median(r["torch"] for r in runs),
+        "import": statistics.median(r["module"] for r in runs),
+        "loaded": sorted({m for r in runs for m in r["loaded"]}),
+    }
+
+
+def run_import_budget(budgets: Sequence[Tuple[str, float]] = BUDGETS) -> bool:
+
+    print(f"Import-time budget  (median of {REPEATS} fresh interpreters, on top of torch)")
+    print(f"  {'module':<28} {'import':>9} {'budget':>9}  lazy modules loaded")
+
+    ok = True
+    for module, budget in budgets:
+        result = measure_import(module)
+        passed = result["import"] <= budget and not result["loaded"]
+        ok &= passed
+
+        print(f"  {module:<28} {result['import'] * 1e3:7.1f}ms {budget * 1e3:7.0f}ms  "
+              f"{', '.join(result['loaded']) or '-':<24} {'ok' if passed else 'OVER'}")
+
+    print(f"  torch itself: {result['torch'] * 1e3:.0f}ms")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run_import_budget() else 1)
@@ -0,0 +1,259 @@
+# ============================================================
+# Spectral Library Ingestion
+# Streams measured spectra (CSV / NPY files on arbitrary wavelength
+# grids), resamples them onto the basis domain, projects them in
+# chunks and writes the coefficients to a memory-mappable .npy.
+#
+# Three stages run concurrently, joined by bounded queues:
+#   read  — parse files, emit chunks of CHUNK_SIZE spectra
+#   solve — resample (searchsorted lerp) + projectBatch
+#   write — copy coefficients into the open_memmap output
+# torch releases the GIL inside its kernels, so threads overlap
+# parsing with the linear algebra.
+#
+# Input layouts:
+#   .csv — header row; first column wavelength (nm), one column per
+#          spectrum, labelled by its header
+#   .npy — [1 + S, P]; row 0 wavelength (nm), rows 1.. spectra;
+#          read memory-mapped, chunk by chunk
+# ============================================================
+
+import os
+import glob
+import queue
+import threading
+from typing import Iterator, List, Tuple
+
+import numpy as np
+import pandas as pd
+import torch
+
+import phase1
+from engine.resample import resampleLinear
+
+
+# ============================================================
+# SETTINGS
+# ============================================================
+
+INPUT_GLOB  = "spectral_library/*"
+OUTPUT_PATH = "spectral_library_coeffs.npy"
+
+# Spectra per projection chunk
+CHUNK_SIZE = 1024
+
+# Projection threads and queue depth (chunks in flight per stage)
+NUM_WORKERS = 2
+QUEUE_DEPTH = 4
+
+# Value outside a file's wavelength range; None holds the edge samples
+OUT_OF_RANGE_FILL = None
+
+# Basis used when run as a script — a phase 1 config row:
+# family_id, K, order, scaling_id, precision_id, whitened,
+# wide_min, wide_max, narrow_min, narrow_max
+DEFAULT_CONFIG = [0, 8, 8, 0, 1, 0, 6.5, 7.0, 6.0, 6.5]
+
+_DONE = object()
+
+
+# ============================================================
+# READERS
+# ============================================================
+
+def count_spectra(path: str) -> int:
+    ext = os.path.splitext(path)[1].lower()
+
+    if ext == ".csv":
+        return len(pd.read_csv(path, nrows=0).columns) - 1
+    if ext == ".npy":
+        return np.load(path, mmap_mode="r").shape[0] - 1
+
+    raise ValueError(f"Unsupported spectral file: {path}")
+
+
+def _sorted_grid(lbda: np.ndarray, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    order = np.argsort(lbda, kind="stable")
+    return lbda[order], values[:, order]
+
+
+def read_chunks(path: str, chunk_size: int) -> Iterator[Tuple[np.ndarray, np.ndarray, List[str]]]:
+    """
+    Yields (wavelengths [P], spectra [s, P], labels) with s ≤ chunk_size.
+    """
+    ext  = os.path.splitext(path)[1].lower()
+    name = os.path.basename(path)
+
+    if ext == ".csv":
+        df     = pd.read_csv(path)
+        lbda   = df.iloc[:, 0].to_numpy(np.float64)
+        values = df.iloc[:, 1:].to_numpy(np.float64).T          # [S, P]
+        labels = [str(c) for c in df.columns[1:]]
+
+        lbda, values = _sorted_grid(lbda, values)
+        for start in range(0, values.shape[0], chunk_size):
+            yield lbda, values[start:start + chunk_size], labels[start:start + chunk_size]
+
+    elif ext == ".npy":
+        data  = np.load(path, mmap_mode="r")
+        lbda  = np.asarray(data[0], dtype=np.float64)
+        order = np.argsort(lbda, kind="stable")
+        S     = data.shape[0] - 1
+
+        for start in range(0, S, chunk_size):
+            end    = min(start + chunk_size, S)
+            values = np.asarray(data[1 + start:1 + end], dtype=np.float64)[:, order]
+            yield lbda[order], values, [f"{name}:{i}" for i in range(start, end)]
+
+    else:
+        raise ValueError(f"Unsupported spectral file: {path}")
+
+
+# ============================================================
+# PIPELINE
+# ============================================================
+
+def _put(q: queue.Queue, item, stop: threading.Event):
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return
+        except queue.Full:
+            continue
+
+
+def _get(q: queue.Queue, stop: threading.Event):
+    while not stop.is_set():
+        try:
+            return q.get(timeout=0.1)
+        except queue.Empty:
+            continue
+    return _DONE
+
+
+def ingest_library(
+    paths: List[str],
+    basis,
+    output_path: str = OUTPUT_PATH,
+    chunk_size: int = CHUNK_SIZE,
+    num_workers: int = NUM_WORKERS,
+    fill=OUT_OF_RANGE_FILL
+) -> dict:
+    """
+    Projects every spectrum in `paths` onto `basis` and writes
+    coefficients [S_total, M] to output_path (.npy, memory-mappable)
+    plus a row index (<output>.index.csv: row, file, label).
+
+    Returns a summary dict (spectra, files, output paths).
+    """
+    counts = [count_spectra(p) for p in paths]
+    total  = int(sum(counts))
+
+    device = basis.m_basisRaw.device
+    dtype  = basis.m_basisRaw.dtype
+    dst    = basis.m_domain.m_lambda
+
+    coeffs = np.lib.format.open_memmap(
+        output_path, mode="w+", dtype=np.float64, shape=(total, basis.m_M)
+    )
+    index = []
+
+    read_q  = queue.Queue(maxsize=QUEUE_DEPTH)
+    write_q = queue.Queue(maxsize=QUEUE_DEPTH)
+    stop    = threading.Event()
+    errors  = []
+
+    def reader():
+        try:
+            row = 0
+            for path in paths:
+                for lbda, values, labels in read_chunks(path, chunk_size):
+                    index.extend((row + i, os.path.basename(path), l) for i, l in enumerate(labels))
+                    _put(read_q, (row, lbda, values), stop)
+                    row += values.shape[0]
+        except Exception as exc:
+            errors.append(exc)
+            stop.set()
+        finally:
+            for _ in range(num_workers):
+                _put(read_q, _DONE, stop)
+
+    def solver():
+        torch.set_grad_enabled(False)
+        try:
+            while True:
+                item = _get(read_q, stop)
+                if item is _DONE:
+                    break
+                row, lbda, values = item
+
+                src = torch.from_numpy(lbda).to(device=device, dtype=dtype)
+                S   = torch.from_numpy(values).to(device=device, dtype=dtype)
+
+                resampled = resampleLinear(src, S, dst, fill=fill)   # [s, L]
+                alpha     = basis.projectBatch(resampled)            # [s, M]
+
+                _put(write_q, (row, alpha.to("cpu", torch.float64).numpy()), stop)
+        except Exception as exc:
+            errors.append(exc)
+            stop.set()
+        finally:
+            _put(write_q, _DONE, stop)
+
+    threads = [threading.Thread(target=reader, daemon=True)]
+    threads += [threading.Thread(target=solver, daemon=True) for _ in range(num_workers)]
+    for t in threads:
+        t.start()
+
+    # ---- write stage (this thread) ----
+    finished = 0
+    written  = 0
+    while finished < num_workers:
+        item = _get(write_q, stop)
+        if item is _DONE:
+            finished += 1
+            continue
+        row, alpha = item
+        coeffs[row:row + alpha.shape[0]] = alpha
+        written += alpha.shape[0]
+
+    stop.set()
+    for t in threads:
+        t.join()
+
+    if errors:
+        raise errors[0]
+
+    coeffs.flush()
+    del coeffs
+
+    index_path = os.path.splitext(output_path)[0] + ".index.csv"
+    pd.DataFrame(sorted(index), columns=["row", "file", "label"]).to_csv(index_path, index=False)
+
+    return {
+        "spectra":    written,
+        "files":      len(paths),
+        "output":     output_path,
+        "index":      index_path,
+    }
+
+
+def run_ingest():
+
+    torch.set_grad_enabled(False)
+
+    paths = sorted(p for p in glob.glob(INPUT_GLOB) if p.lower().endswith((".csv", ".npy")))
+    print(f"Spectral library ingestion")
+    print(f"  Files          : {len(paths)}")
+
+    basis, _ = phase1.build_basis(DEFAULT_CONFIG)
+    print(f"  Basis size     : {basis.m_M}  (K={basis.m_K}, order={basis.m_N})")
+
+    summary = ingest_library(paths, basis)
+    print(f"  Spectra        : {summary['spectra']:,}")
+    print(f"  Coefficients   : {summary['output']}")
+    print(f"  Index          : {summary['index']}")
+
+
+if __name__ == "__main__":
+    run_ingest()
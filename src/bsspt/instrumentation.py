@@ -0,0 +1,355 @@
+# ============================================================
+# Sweep Instrumentation
+# Per-stage wall-clock timers, per-stage memory tracing
+# and a live throughput report
+# ============================================================
+
+import csv
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+
+import torch
+
+
+class StageTimer:
+    """
+    Accumulates wall-clock time per named stage.
+
+        with timer.stage("gram"):
+            ...
+
+    Anything exposing a `stage(name)` context manager can be handed
+    to the basis classes as a profiler; this is the timing flavour.
+
+    CUDA kernels are asynchronous, so when `sync` is set the device is
+    synchronized at both stage boundaries — otherwise the time of a
+    kernel lands in whichever later stage first blocks on its result.
+    """
+
+    def __init__(self, sync: Optional[bool] = None):
+        if sync is None:
+            sync = torch.cuda.is_available()
+
+        self.m_sync   = sync
+        self.m_totals: Dict[str, float] = {}
+        self.m_counts: Dict[str, int]   = {}
+
+    # ---------------------------------------------------------
+    # Recording
+    # ---------------------------------------------------------
+
+    @contextmanager
+    def stage(self, name: str):
+        if self.m_sync:
+            torch.cuda.synchronize()
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            if self.m_sync:
+                torch.cuda.synchronize()
+
+            elapsed = time.perf_counter() - start
+            self.m_totals[name] = self.m_totals.get(name, 0.0) + elapsed
+            self.m_counts[name] = self.m_counts.get(name, 0) + 1
+
+    def merge(self, other: "StageTimer"):
+        for name, total in other.m_totals.items():
+            self.m_totals[name] = self.m_totals.get(name, 0.0) + total
+            self.m_counts[name] = self.m_counts.get(name, 0) + other.m_counts[name]
+
+    def reset(self):
+        self.m_totals.clear()
+        self.m_counts.clear()
+
+    # ---------------------------------------------------------
+    # Reporting
+    # ---------------------------------------------------------
+
+    def rows(self) -> List[dict]:
+        """
+        One row per stage, in first-seen order:
+            stage, calls, total_s, mean_ms, share
+        """
+        grand = sum(self.m_totals.values())
+
+        rows = []
+        for name, total in self.m_totals.items():
+            calls = self.m_counts[name]
+            rows.append({
+                "stage":   name,
+                "calls":   calls,
+                "total_s": total,
+                "mean_ms": 1e3 * total / calls,
+                "share":   total / grand if grand > 0.0 else 0.0,
+            })
+        return rows
+
+    def dominant(self) -> Optional[str]:
+        if not self.m_totals:
+            return None
+        return max(self.m_totals, key=self.m_totals.get)
+
+    def write_csv(self, path: str):
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(
+                f, fieldnames=["stage", "calls", "total_s", "mean_ms", "share"]
+            )
+            writer.writeheader()
+            writer.writerows(self.rows())
+
+    def format_table(self) -> str:
+        lines = [f"{'stage':<12} {'calls':>8} {'total_s':>10} {'mean_ms':>10} {'share':>7}"]
+        for r in self.rows():
+            lines.append(
+                f"{r['stage']:<12} {r['calls']:>8d} {r['total_s']:>10.3f} "
+                f"{r['mean_ms']:>10.3f} {100.0 * r['share']:>6.1f}%"
+            )
+        return "\n".join(lines)
+
+
+# ============================================================
+# Memory Tracing
+# ============================================================
+
+def _read_status_kb(field: str) -> Optional[int]:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def _reset_peak_rss() -> bool:
+    # Linux: writing 5 to clear_refs resets VmHWM to the current RSS
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+class MemoryTracer:
+    """
+    Records current and peak memory per named stage.
+
+        with tracer.stage("basis"):
+            ...
+
+    Same stage(name) protocol as StageTimer, so it plugs into the
+    basis classes' profiler hook.
+
+    Backends:
+        cuda — caching allocator statistics (memory_allocated / max_memory_allocated)
+        rss  — resident set size and its high-water mark (VmHWM), reset per
+               stage through /proc/self/clear_refs. torch's CPU allocator
+               bypasses Python's, so tracemalloc alone never sees tensor storage.
+               Only pages newly made resident count: a tensor served from heap
+               memory the process already holds is invisible. Large blocks
+               (the basis intermediates) are mmap'd and always show up.
+        none — neither available; only the Python-level figures are recorded
+
+    With python=True, tracemalloc additionally reports the Python-heap peak
+    of each stage (interpreter objects, lists of centers etc.).
+
+    Stages may nest; an inner stage's peak is folded into its parent.
+    All byte figures are relative to the level at stage entry.
+    """
+
+    def __init__(self, device=None, python: bool = False):
+        if device is None:
+            device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+        device = torch.device(device)
+
+        if device.type == "cuda":
+            backend = "cuda"
+        elif _reset_peak_rss() and _read_status_kb("VmHWM") is not None:
+            backend = "rss"
+        else:
+            backend = "none"
+
+        self.m_device  = device
+        self.m_backend = backend
+        self.m_python  = python
+        self.m_records: List[dict] = []
+        self.m_stack:   List[dict] = []
+
+    # ---------------------------------------------------------
+    # Backend probes — (current, peak since last reset), bytes
+    # ---------------------------------------------------------
+
+    def _reset_peak(self):
+        if self.m_backend == "cuda":
+            torch.cuda.synchronize(self.m_device)
+            torch.cuda.reset_peak_memory_stats(self.m_device)
+        elif self.m_backend == "rss":
+            _reset_peak_rss()
+
+    def _probe(self) -> Tuple[Optional[int], Optional[int]]:
+        if self.m_backend == "cuda":
+            torch.cuda.synchronize(self.m_device)
+            return (
+                torch.cuda.memory_allocated(self.m_device),
+                torch.cuda.max_memory_allocated(self.m_device),
+            )
+        if self.m_backend == "rss":
+            return 1024 * _read_status_kb("VmRSS"), 1024 * _read_status_kb("VmHWM")
+        return None, None
+
+    # ---------------------------------------------------------
+    # Recording
+    # ---------------------------------------------------------
+
+    @contextmanager
+    def stage(self, name: str):
+        # Capture the parent's peak so far before resetting the counter
+        if self.m_stack:
+            _, parent_peak = self._probe()
+            if parent_peak is not None:
+                parent = self.m_stack[-1]
+                parent["abs_peak"] = max(parent["abs_peak"], parent_peak)
+
+        self._reset_peak()
+        start, _ = self._probe()
+
+        if self.m_python:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            py_start, _ = tracemalloc.get_traced_memory()
+        else:
+            py_start = None
+
+        frame = {"abs_peak": start if start is not None else 0}
+        self.m_stack.append(frame)
+
+        try:
+            yield
+        finally:
+            self.m_stack.pop()
+            end, peak = self._probe()
+
+            record = {"stage": name, "backend": self.m_backend}
+
+            if start is not None:
+                abs_peak = max(frame["abs_peak"], peak)
+                record["delta_bytes"] = end - start
+                record["peak_bytes"]  = abs_peak - start
+                if self.m_stack:
+                    parent = self.m_stack[-1]
+                    parent["abs_peak"] = max(parent["abs_peak"], abs_peak)
+            else:
+                record["delta_bytes"] = None
+                record["peak_bytes"]  = None
+
+            if py_start is not None:
+                _, py_peak = tracemalloc.get_traced_memory()
+                record["python_peak_bytes"] = py_peak - py_start
+            else:
+                record["python_peak_bytes"] = None
+
+            self.m_records.append(record)
+
+    def reset(self):
+        self.m_records.clear()
+
+    # ---------------------------------------------------------
+    # Reporting
+    # ---------------------------------------------------------
+
+    def report(self) -> dict:
+        """
+        {
+            "device":   "cpu",
+            "backend":  "rss",
+            "peak_bytes": max stage peak,
+            "stages":   [{stage, backend, delta_bytes, peak_bytes, python_peak_bytes}, ...]
+        }
+        """
+        peaks = [r["peak_bytes"] for r in self.m_records if r["peak_bytes"] is not None]
+        return {
+            "device":     str(self.m_device),
+            "backend":    self.m_backend,
+            "peak_bytes": max(peaks) if peaks else None,
+            "stages":     list(self.m_records),
+        }
+
+
+def trace_peak(fn: Callable[[], object], device=None) -> Optional[int]:
+    """Peak bytes above the starting level while fn runs (None if untraceable)."""
+    tracer = MemoryTracer(device)
+    with tracer.stage("call"):
+        fn()
+    return tracer.report()["peak_bytes"]
+
+
+def trace_basis_build(basis_cls, device=None, python: bool = False, **kwargs):
+    """
+    Builds basis_cls(**kwargs) under a MemoryTracer.
+
+    Returns (basis, report) where the report has one entry per build stage
+    (basis, gram, cholesky) plus the enclosing "build" stage.
+    """
+    if device is None:
+        device = kwargs["domain"].m_device
+
+    tracer = MemoryTracer(device, python=python)
+    with tracer.stage("build"):
+        basis = basis_cls(profiler=tracer, **kwargs)
+
+    return basis, tracer.report()
+
+
+class RateReport:
+    """
+    Live configs/sec and ETA over the whole sweep.
+
+    Configs skipped because their shard already exists count towards
+    progress but not towards the measured rate.
+    """
+
+    def __init__(self, total: int):
+        self.m_total     = total
+        self.m_skipped   = 0
+        self.m_processed = 0
+        self.m_start     = time.perf_counter()
+
+    def skip(self, count: int):
+        self.m_skipped += count
+
+    def advance(self, count: int):
+        self.m_processed += count
+
+    def rate(self) -> float:
+        elapsed = time.perf_counter() - self.m_start
+        return self.m_processed / elapsed if elapsed > 0.0 else 0.0
+
+    def eta_seconds(self) -> float:
+        rate      = self.rate()
+        remaining = self.m_total - self.m_skipped - self.m_processed
+        return remaining / rate if rate > 0.0 else float("inf")
+
+    def line(self) -> str:
+        done = self.m_skipped + self.m_processed
+        pct  = 100.0 * done / self.m_total if self.m_total else 100.0
+        return (
+            f"{done:,}/{self.m_total:,} ({pct:.1f}%)  "
+            f"{self.rate():.1f} cfg/s  ETA {format_duration(self.eta_seconds())}"
+        )
+
+
+def format_duration(seconds: float) -> str:
+    if seconds == float("inf"):
+        return "--:--:--"
+
+    seconds = int(seconds)
+    h, rem  = divmod(seconds, 3600)
+    m, s    = divmod(rem, 60)
+    return f"{h:02d}:{m:02d}:{s:02d}"
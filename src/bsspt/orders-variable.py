@@ -3,7 +3,7 @@ import numpy as np
 
 from engine.spectraldomain import SpectralDomain
 from engine.hermitebasis import hermiteBasis
-from plotting.Plot import PlotEngine
+from plotting.Plot import PlotEngine, FigureBatch
 
 
 # ============================================================
@@ -22,69 +22,97 @@ alpha = 2.0         # growth per order
 # how wide to view
 view_width = 60.0
 
+# Batch rendering: write figures here instead of showing them (None = interactive)
+OUTPUT_DIR = None                      # e.g. "figures/orders"
+RENDER_WORKERS = None                  # None = CPU count
+
 
 # ============================================================
-# Domain
+# Figure
 # ============================================================
 
-domain = SpectralDomain(
-    lambdaMin=400.0,
-    lambdaMax=700.0,
-    numSamples=2048,
-    device=device,
-    dtype=dtype
-)
+def variable_modes_figure(lam_cpu, curves):
+    """curves: (sigma_k, phi_k) per order"""
 
-lbd = domain.m_lambda
-lam_cpu = lbd.detach().cpu().numpy()
+    engine = PlotEngine(figsize=(20, 6))
 
+    for k, (sigma_k, phi_cpu) in enumerate(curves):
+        engine.addLine(
+            lam_cpu,
+            phi_cpu,
+            label=f"k = {k}, σ = {sigma_k:.1f}",
+            linewidth=2.0
+        )
 
-# ============================================================
-# Plot
-# ============================================================
+    engine.setLimits(
+        xlim=(center - view_width, center + view_width)
+    )
 
-engine = PlotEngine(figsize=(20, 6))
+    engine.setTitle(
+        f"Gaussian–Hermite Modes (Variable σ per Order)\n"
+        f"σ₀ = {sigma0}, growth = {alpha} per order"
+    )
+
+    engine.setLabels("Wavelength (nm)", "Basis Value")
+    engine.addLegend(location="upper right")
 
-for k in range(max_order + 1):
+    return engine
 
-    sigma_k = sigma0 + alpha * k
 
-    x = (lbd - center) / sigma_k
-    x = x.unsqueeze(0)
+def run_orders_variable():
 
-    # Build only up to k, then take kth slice
-    H = hermiteBasis(k + 1, x)
+    # ============================================================
+    # Domain
+    # ============================================================
 
-    n = torch.tensor(k, device=device, dtype=dtype)
+    domain = SpectralDomain(
+        lambdaMin=400.0,
+        lambdaMax=700.0,
+        numSamples=2048,
+        device=device,
+        dtype=dtype
+    )
 
-    factorial = torch.exp(torch.lgamma(n + 1))
-    sqrt_pi = torch.sqrt(torch.tensor(torch.pi, device=device, dtype=dtype))
+    lbd = domain.m_lambda
+    lam_cpu = lbd.detach().cpu().numpy()
 
-    norm = torch.sqrt((2.0 ** n) * factorial * sqrt_pi)
+    # ============================================================
+    # Modes
+    # ============================================================
 
-    gaussian = torch.exp(-0.5 * x ** 2)
+    curves = []
 
-    phi_k = (H[0, k] * gaussian[0]) / norm
+    for k in range(max_order + 1):
 
-    phi_cpu = phi_k.detach().cpu().numpy()
+        sigma_k = sigma0 + alpha * k
 
-    engine.addLine(
-        lam_cpu,
-        phi_cpu,
-        label=f"k = {k}, σ = {sigma_k:.1f}",
-        linewidth=2.0
-    )
+        x = (lbd - center) / sigma_k
+        x = x.unsqueeze(0)
+
+        # Build only up to k, then take kth slice
+        H = hermiteBasis(k + 1, x)
+
+        n = torch.tensor(k, device=device, dtype=dtype)
+
+        factorial = torch.exp(torch.lgamma(n + 1))
+        sqrt_pi = torch.sqrt(torch.tensor(torch.pi, device=device, dtype=dtype))
+
+        norm = torch.sqrt((2.0 ** n) * factorial * sqrt_pi)
+
+        gaussian = torch.exp(-0.5 * x ** 2)
+
+        phi_k = (H[0, k] * gaussian[0]) / norm
+
+        curves.append((sigma_k, phi_k.detach().cpu().numpy()))
 
-engine.setLimits(
-    xlim=(center - view_width, center + view_width)
-)
+    # ============================================================
+    # Plot
+    # ============================================================
 
-engine.setTitle(
-    f"Gaussian–Hermite Modes (Variable σ per Order)\n"
-    f"σ₀ = {sigma0}, growth = {alpha} per order"
-)
+    batch = FigureBatch(OUTPUT_DIR, workers=RENDER_WORKERS)
+    batch.add(f"hermite_modes_variable_order_{max_order}", variable_modes_figure, lam_cpu, curves)
+    batch.render()
 
-engine.setLabels("Wavelength (nm)", "Basis Value")
-engine.addLegend(location="upper right")
 
-engine.show()
+if __name__ == "__main__":
+    run_orders_variable()
@@ -3,7 +3,7 @@ import numpy as np
 
 from engine.spectraldomain import SpectralDomain
 from engine.hermitebasis import hermiteBasis
-from plotting.Plot import PlotEngine
+from plotting.Plot import PlotEngine, FigureBatch
 
 
 # ============================================================
@@ -20,72 +20,90 @@ max_order = 8
 # How wide to visualize around center
 view_width = 6 * sigma   # show ±6σ
 
+# Batch rendering: write figures here instead of showing them (None = interactive)
+OUTPUT_DIR = None                      # e.g. "figures/orders"
+RENDER_WORKERS = None                  # None = CPU count
+
 
 # ============================================================
-# Domain
+# Figure
 # ============================================================
 
-domain = SpectralDomain(
-    lambdaMin=400.0,
-    lambdaMax=700.0,
-    numSamples=2048,  # higher resolution for oscillations
-    device=device,
-    dtype=dtype
-)
+def modes_figure(lam_cpu, phi_cpu):
 
-lbd = domain.m_lambda
+    engine = PlotEngine(figsize=(20, 6))  # very wide
 
+    for k in range(max_order + 1):
+        engine.addLine(
+            lam_cpu,
+            phi_cpu[k],
+            label=f"k = {k}",
+            linewidth=2.0
+        )
 
-# ============================================================
-# Build Basis Around Single Center
-# ============================================================
+    # Zoom to region of interest
+    engine.setLimits(
+        xlim=(center - view_width, center + view_width)
+    )
 
-x = (lbd - center) / sigma
-x = x.unsqueeze(0)
+    engine.setTitle(
+        f"Gaussian–Hermite Modes (Orders 0–{max_order})\n"
+        f"Center = {center} nm | σ = {sigma} nm"
+    )
 
-H = hermiteBasis(max_order + 1, x)
+    engine.setLabels("Wavelength (nm)", "Basis Value")
+    engine.addLegend(location="upper right")
 
-n = torch.arange(max_order + 1, device=device, dtype=dtype)
+    return engine
 
-factorial = torch.exp(torch.lgamma(n + 1))
-sqrt_pi = torch.sqrt(torch.tensor(torch.pi, device=device, dtype=dtype))
 
-norm = torch.sqrt((2.0 ** n) * factorial * sqrt_pi)
+def run_orders():
 
-gaussian = torch.exp(-0.5 * x ** 2)
+    # ============================================================
+    # Domain
+    # ============================================================
 
-phi = (H[0] * gaussian) / norm.unsqueeze(-1)
+    domain = SpectralDomain(
+        lambdaMin=400.0,
+        lambdaMax=700.0,
+        numSamples=2048,  # higher resolution for oscillations
+        device=device,
+        dtype=dtype
+    )
 
+    lbd = domain.m_lambda
 
-# ============================================================
-# Plot
-# ============================================================
+    # ============================================================
+    # Build Basis Around Single Center
+    # ============================================================
 
-engine = PlotEngine(figsize=(20, 6))  # very wide
+    x = (lbd - center) / sigma
+    x = x.unsqueeze(0)
 
-lam_cpu = lbd.detach().cpu().numpy()
+    H = hermiteBasis(max_order + 1, x)
 
-for k in range(max_order + 1):
-    phi_cpu = phi[k].detach().cpu().numpy()
+    n = torch.arange(max_order + 1, device=device, dtype=dtype)
 
-    engine.addLine(
-        lam_cpu,
-        phi_cpu,
-        label=f"k = {k}",
-        linewidth=2.0
-    )
+    factorial = torch.exp(torch.lgamma(n + 1))
+    sqrt_pi = torch.sqrt(torch.tensor(torch.pi, device=device, dtype=dtype))
+
+    norm = torch.sqrt((2.0 ** n) * factorial * sqrt_pi)
+
+    gaussian = torch.exp(-0.5 * x ** 2)
+
+    phi = (H[0] * gaussian) / norm.unsqueeze(-1)
+
+    # ============================================================
+    # Plot
+    # ============================================================
 
-# Zoom to region of interest
-engine.setLimits(
-    xlim=(center - view_width, center + view_width)
-)
+    lam_cpu = lbd.detach().cpu().numpy()
+    phi_cpu = phi.detach().cpu().numpy()
 
-engine.setTitle(
-    f"Gaussian–Hermite Modes (Orders 0–{max_order})\n"
-    f"Center = {center} nm | σ = {sigma} nm"
-)
+    batch = FigureBatch(OUTPUT_DIR, workers=RENDER_WORKERS)
+    batch.add(f"hermite_modes_order_{max_order}", modes_figure, lam_cpu, phi_cpu)
+    batch.render()
 
-engine.setLabels("Wavelength (nm)", "Basis Value")
-engine.addLegend(location="upper right")
 
-engine.show()
+if __name__ == "__main__":
+    run_orders()
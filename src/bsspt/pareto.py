@@ -0,0 +1,204 @@
+# ============================================================
+# Pareto Front — basis size vs stability vs reconstruction
+# Finds the non-dominated configs of the sweep for
+#   (basis_size, log10_condition, reconstruction_error), all minimized,
+# and writes them as a small table.
+#
+# Skyline: basis_size takes few distinct values, so rows are split
+# by size. Within a size the front is a 2D staircase (sort +
+# running minimum). Sizes are then swept smallest first against the
+# staircase of every smaller size, one searchsorted per size group.
+# Cost is O(n log n) over the whole table.
+#
+# reconstruction_error (mean stress-case L2 error, reconstruction.py)
+# is read from the dataset when present. Otherwise it is computed on
+# the fly for the RECON_PER_SIZE best-conditioned basis configs of
+# each size. Only rows with an error enter the 3D front.
+# ============================================================
+
+import numpy as np
+import pandas as pd
+import torch
+
+import phase1
+from schema import CONFIG_COLUMNS
+from stress_cases import stack_cases
+from reconstruction import evaluate_reconstruction, RECONSTRUCTION_METRICS
+
+
+# ============================================================
+# SETTINGS
+# ============================================================
+
+INPUT_PARQUET  = "datasets/stability_dataset.parquet"
+OUTPUT_PARQUET = "datasets/pareto_front.parquet"
+
+OBJECTIVES = ["basis_size", "log10_condition", "reconstruction_error"]
+
+# Basis configs per basis_size rebuilt for reconstruction_error
+RECON_PER_SIZE = 64
+
+# Projection ignores precision and whitening — one build per basis
+BASIS_KEY = [c for c in CONFIG_COLUMNS if c not in ("precision_id", "whitened")]
+
+
+# ============================================================
+# SKYLINE
+# ============================================================
+
+def _staircase(xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+    """
+    Non-dominated mask of points already sorted by (x, y), minimizing
+    both: a point survives when its y is below every earlier y. Runs
+    of identical points share the verdict of their first member.
+    """
+    n = xs.shape[0]
+    if n == 0:
+        return np.zeros(0, dtype=bool)
+
+    prev_min = np.minimum.accumulate(np.concatenate([[np.inf], ys[:-1]]))
+
+    new_run    = np.ones(n, dtype=bool)
+    new_run[1:] = (xs[1:] != xs[:-1]) | (ys[1:] != ys[:-1])
+    run_id     = np.cumsum(new_run) - 1
+
+    first_keep = (ys < prev_min)[new_run]
+    return first_keep[run_id]
+
+
+def skyline_2d(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Non-dominated mask for minimizing (x, y)."""
+    order = np.lexsort((y, x))
+    keep  = np.empty(x.shape[0], dtype=bool)
+    keep[order] = _staircase(x[order], y[order])
+    return keep
+
+
+def pareto_front(points: np.ndarray) -> np.ndarray:
+    """
+    points : [n, 3] with a discrete first column (minimized, as are
+             the other two)
+
+    Returns the non-dominated mask [n].
+    """
+    mask = np.zeros(points.shape[0], dtype=bool)
+
+    # One sort by (size, x, y); each size group is then a sorted slice
+    order = np.lexsort((points[:, 2], points[:, 1], points[:, 0]))
+    s, x, y = points[order, 0], points[order, 1], points[order, 2]
+    bounds = np.flatnonzero(np.concatenate([[True], s[1:] != s[:-1], [True]]))
+
+    # Staircase of all smaller sizes: x ascending, y strictly descending
+    stair_x = np.empty(0)
+    stair_y = np.empty(0)
+
+    for lo, hi in zip(bounds[:-1], bounds[1:]):
+        local = _staircase(x[lo:hi], y[lo:hi])
+        rows  = order[lo:hi][local]
+        gx, gy = x[lo:hi][local], y[lo:hi][local]
+
+        # Best y among smaller-size points with x' <= x
+        idx       = np.searchsorted(stair_x, gx, side="right") - 1
+        best_y    = np.append(stair_y, np.inf)[idx]        # idx -1 → inf
+        dominated = best_y <= gy
+
+        mask[rows[~dominated]] = True
+
+        merged_x = np.concatenate([stair_x, gx[~dominated]])
+        merged_y = np.concatenate([stair_y, gy[~dominated]])
+        sort     = np.lexsort((merged_y, merged_x))
+        front    = _staircase(merged_x[sort], merged_y[sort])
+        stair_x, stair_y = merged_x[sort][front], merged_y[sort][front]
+
+    return mask
+
+
+# ============================================================
+# RECONSTRUCTION ERROR
+# ============================================================
+
+def reconstruction_errors(basis_configs: pd.DataFrame) -> np.ndarray:
+    """Mean stress-case L2 reconstruction error per basis config (NaN if it fails to build)."""
+    l2 = RECONSTRUCTION_METRICS.index("l2_error")
+    errors = np.full(len(basis_configs), np.nan)
+
+    for i, cfg in enumerate(basis_configs.to_dict("records")):
+        row = dict(cfg, precision_id=1, whitened=0)
+        try:
+            basis, _ = phase1.build_basis([row[c] for c in CONFIG_COLUMNS])
+        except Exception:
+            continue
+
+        _, spectra = stack_cases(basis.m_domain)
+        errors[i] = evaluate_reconstruction(basis, spectra)[:, l2].mean().item()
+
+    return errors
+
+
+def attach_reconstruction_error(df: pd.DataFrame, per_size: int = RECON_PER_SIZE) -> pd.DataFrame:
+    """
+    Adds reconstruction_error for the per_size best-conditioned basis
+    configs of each basis_size (NaN for every other row).
+    """
+    best = (
+        df.groupby(BASIS_KEY, as_index=False)
+        .agg(basis_size=("basis_size", "first"), log10_condition=("log10_condition", "min"))
+        .sort_values("log10_condition")
+        .groupby("basis_size")
+        .head(per_size)
+        [BASIS_KEY]
+        .reset_index(drop=True)
+    )
+
+    print(f"  Rebuilt configs : {len(best):,}")
+    best["reconstruction_error"] = reconstruction_errors(best)
+
+    return df.merge(best, on=BASIS_KEY, how="left")
+
+
+# ============================================================
+# DRIVER
+# ============================================================
+
+def find_front(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    The 3D front over rows with every objective finite, with
+    on_condition_front marking rows also on the exact 2D
+    (basis_size, log10_condition) front of the whole table.
+    """
+    ok = df[(df["spd_fail_flag"] == 0) & np.isfinite(df["log10_condition"])]
+
+    size = ok["basis_size"].to_numpy(np.float64)
+    cond = ok["log10_condition"].to_numpy(np.float64)
+    on_2d = ok.index[skyline_2d(size, cond)]
+
+    ok = ok[np.isfinite(ok["reconstruction_error"])]
+    front = ok[pareto_front(ok[OBJECTIVES].to_numpy(np.float64))].copy()
+    front["on_condition_front"] = front.index.isin(on_2d)
+
+    return front.sort_values(OBJECTIVES).reset_index(drop=True)
+
+
+def run_pareto():
+
+    torch.set_grad_enabled(False)
+
+    print("Loading parquet dataset...")
+    df = pd.read_parquet(INPUT_PARQUET)
+    print(f"  Total rows      : {len(df):,}")
+
+    if "reconstruction_error" not in df.columns:
+        df = attach_reconstruction_error(df[df["spd_fail_flag"] == 0])
+
+    front = find_front(df)
+    front = front[CONFIG_COLUMNS + OBJECTIVES + ["on_condition_front"]]
+
+    print(f"  Front size      : {len(front):,}")
+    print(front.to_string(index=False, max_rows=40))
+
+    front.to_parquet(OUTPUT_PARQUET, engine="pyarrow", compression="zstd", index=False)
+    print(f"  Written         : {OUTPUT_PARQUET}")
+
+
+if __name__ == "__main__":
+    run_pareto()
@@ -1,18 +1,10 @@
 import pandas as pd
 import glob
 
-# Path to your shards
-csv_files = sorted(glob.glob("phase1_output/phase1_batch_*.csv"))
-
-print(f"Found {len(csv_files)} batch files.")
-
-# Merge all shards
-df = pd.concat(
-    (pd.read_csv(f) for f in csv_files),
-    ignore_index=True
-)
 
-print("Loaded shape:", df.shape)
+# Path to your shards
+INPUT_GLOB = "phase1_output/phase1_batch_*.csv"
+OUTPUT_PARQUET = "stability_dataset.parquet"
 
 # Reduce small integer columns safely
 int8_cols = [
@@ -26,17 +18,36 @@ int8_cols = [
     "spd_fail_flag"
 ]
 
-for col in int8_cols:
-    if col in df.columns:
-        df[col] = df[col].astype("int8")
 
-print("Writing Parquet...")
+def run_merge(input_glob=INPUT_GLOB, output_path=OUTPUT_PARQUET):
+
+    csv_files = sorted(glob.glob(input_glob))
+
+    print(f"Found {len(csv_files)} batch files.")
+
+    # Merge all shards
+    df = pd.concat(
+        (pd.read_csv(f) for f in csv_files),
+        ignore_index=True
+    )
+
+    print("Loaded shape:", df.shape)
+
+    for col in int8_cols:
+        if col in df.columns:
+            df[col] = df[col].astype("int8")
+
+    print("Writing Parquet...")
+
+    df.to_parquet(
+        output_path,
+        engine="pyarrow",
+        compression="zstd",
+        index=False
+    )
+
+    print("Conversion complete.")
 
-df.to_parquet(
-    "stability_dataset.parquet",
-    engine="pyarrow",
-    compression="zstd", 
-    index=False
-)
 
-print("Conversion complete.")
\ No newline at end of file
+if __name__ == "__main__":
+    run_merge()
@@ -1,13 +1,19 @@
 import os
 import torch
-import pandas as pd
 import traceback
+from contextlib import nullcontext
 
-from engine.spectraldomain import SpectralDomain
+from engine.quadraturedomain import makeDomain
+from quadrature_tuner import tune_quadrature
 from engine.ghgsfexp import GHGSFMultiLobeBasisDualDomain
-from spectral_topology import generate_topology
+from engine.compiledkernels import warmup, compileStats
+from engine.conditionestimate import estimateSpectrum
+from spectral_topology import (
+    generate_topology, generate_topology_batch, unpad_topologies, load_custom_topologies
+)
 from torchconfig import TorchConfig
 from build_configs import build_phase1_configs
+from instrumentation import StageTimer, RateReport
 from schema import CONFIG_COLUMNS, METRIC_COLUMNS, SCALING_ID_MAP, PHASE1_VERSION
 
 # ============================================================
@@ -22,89 +28,261 @@ LAMBDA_MIN     = 380.0
 LAMBDA_MAX     = 830.0
 LAMBDA_SAMPLES = 4096
 
+# Transient bytes per basis build; None builds in one shot.
+# Set (e.g. 64 << 20) to tile the build for LAMBDA_SAMPLES of 65536+.
+MEMORY_BUDGET = None
+
+# Quadrature rule of the domain (engine.quadraturedomain.QUADRATURE_RULES):
+#   "trapezoid"        — uniform grid, the original rule
+#   "simpson"          — uniform grid, LAMBDA_SAMPLES must be odd
+#   "gauss"            — one Gauss-Legendre rule; ~384 nodes match the
+#                        4096-sample trapezoid Gram to round-off
+#   "composite_gauss"  — QUADRATURE_PANEL_POINTS-point rule per panel
+#                        (tuned rows use the panel size they were tuned at)
+#   "adaptive"         — composite panels concentrated around the lobes
+QUADRATURE_RULE         = "trapezoid"
+QUADRATURE_PANEL_POINTS = 16
+
+# Per-row resolution: when set, each row's rule and sample count come
+# from quadrature_tuner (cheapest rule whose Gram and projections are
+# within this relative tolerance for the row's order and smallest
+# sigma), overriding QUADRATURE_RULE / LAMBDA_SAMPLES. Tuned classes
+# are cached in quadrature_tuner.CACHE_PATH.
+QUADRATURE_TOL = None
+
+# Fuse the Hermite recurrence with torch.compile. Every (K, order, dtype)
+# shape is compiled once before the first batch so no row's timing
+# includes compilation.
+COMPILE = False
+
+# Eigen pass per row:
+#   "full"     — eigvalsh on every row
+#   "estimate" — Lanczos estimates only (engine.conditionestimate); exact
+#                trace/mean/std, spectral_entropy written as NaN
+#   "screen"   — estimate first, eigvalsh only for rows whose estimated
+#                condition number is below SCREEN_MAX_COND
+EIGEN_MODE      = "full"
+SCREEN_TOL      = 1e-4
+SCREEN_MAX_COND = 1e12
+
+# Order sweeps: constant-scaling rows (scaling_id 0) of one sub-batch
+# that share family, K, precision, both sigma_min values and the
+# quadrature are built once at their lowest order and extended
+# (basis.iterOrders) through the others — the Gram factor is bordered,
+# not rebuilt. linear / sqrt / power spread their sigmas over the order
+# count, so adding an order moves the existing columns and every such
+# row is still a full rebuild.
+# The default grid puts each order in a different disk batch; set
+# ORDER_SWEEP to reorder it so rows that differ only in order and
+# whitening are adjacent. Batch numbering follows the reordered grid,
+# so give such a run its own OUTPUT_DIR.
+ORDER_SWEEP = False
+
+# Restrict the sweep to these precision_id values (0 performance / TF32,
+# 1 reference / FP64); None sweeps both. Batch numbering follows the
+# filtered grid, so give a restricted run its own OUTPUT_DIR.
+PRECISION_IDS = None
+
+# Custom topology families to sweep after the five built-ins: a
+# save_custom_topologies file such as topology_search.py writes. Their
+# ids are added to the family grid and registered before any row is
+# built. None sweeps the built-ins only.
+CUSTOM_TOPOLOGIES = None
+
+# torch intra-op threads for CPU runs; None keeps torch's default
+NUM_THREADS = None
+
 OUTPUT_DIR = "phase1_output"
-os.makedirs(OUTPUT_DIR, exist_ok=True)
+
+# Per-stage timing tables, kept out of OUTPUT_DIR's shard glob
+# (parq.py merges phase1_batch_*.csv)
+TIMING_DIR = "timing"
 
 
 # ============================================================
 # METRIC COMPUTATION
 # Returns:
 #   (row_index, metrics_tensor, error_string)
+#
+# timer: optional StageTimer — stage names are
+#   topology, domain, basis, gram, cholesky, whiten, estimate, eigvalsh, pack
 # ============================================================
 
-def compute_metrics(args):
+def _stage(timer, name):
+    if timer is None:
+        return nullcontext()
+    return timer.stage(name)
 
-    row_index, config_vals = args
 
-    try:
-        (
-            family_id, K, order, scaling_id, precision_id, whitened,
-            wide_min, wide_max, narrow_min, narrow_max
-        ) = config_vals
-
-        K          = int(K)
-        order      = int(order)
-        family_id  = int(family_id)
-        scaling_id = int(scaling_id)
-        whitened   = int(whitened)
-
-        precision_mode = "performance" if precision_id == 0 else "reference"
-        torch_info = TorchConfig.set_mode(precision_mode, verbose=False)
+_custom_ids = None
 
-        device = torch_info["device"]
-        dtype  = torch_info["dtype"]
 
-        scale_type = SCALING_ID_MAP[scaling_id]
+def custom_families():
+    """
+    Registers CUSTOM_TOPOLOGIES (once per process) and returns their ids.
+    build_basis calls it too, so anything rebuilding sweep rows — validation,
+    pareto — can serve custom family_ids after setting CUSTOM_TOPOLOGIES.
+    """
+    global _custom_ids
+    if CUSTOM_TOPOLOGIES is None:
+        return []
+    if _custom_ids is None:
+        _custom_ids = load_custom_topologies(CUSTOM_TOPOLOGIES)
+    return _custom_ids
 
-        domain = SpectralDomain(
-            LAMBDA_MIN, LAMBDA_MAX, LAMBDA_SAMPLES,
-            device=device, dtype=dtype
-        )
 
-        centers  = generate_topology(family_id, K)
-        num_wide = K // 2
-
-        basis = GHGSFMultiLobeBasisDualDomain(
-            domain=domain,
-            centers=centers,
-            num_wide=num_wide,
-            wide_sigma_min=float(wide_min),
-            wide_sigma_max=float(wide_max),
-            wide_scale_type=scale_type,
-            narrow_sigma_min=float(narrow_min),
-            narrow_sigma_max=float(narrow_max),
-            narrow_scale_type=scale_type,
-            order=order
+def row_quadrature(order, sigma_min):
+    """
+    (rule, samples, points_per_panel) for one row — global, or tuned when
+    QUADRATURE_TOL is set. Raises ValueError when no rule reaches the tolerance.
+    """
+    if QUADRATURE_TOL is None:
+        return QUADRATURE_RULE, LAMBDA_SAMPLES, QUADRATURE_PANEL_POINTS
+
+    tuned = tune_quadrature(order, sigma_min, QUADRATURE_TOL, LAMBDA_MIN, LAMBDA_MAX)
+    return tuned["rule"], tuned["samples"], tuned["points_per_panel"]
+
+
+def build_basis(config_vals, timer=None, centers=None):
+    """
+    Builds the dual-domain basis for one config row, in the precision its
+    precision_id selects. Shared by the sweep and validation.py.
+
+    centers: precomputed lobe centers (process_sub_batch generates a
+    whole sub-batch at once); None generates them from the row.
+
+    Returns (basis, torch_info)
+    """
+    (
+        family_id, K, order, scaling_id, precision_id, whitened,
+        wide_min, wide_max, narrow_min, narrow_max
+    ) = config_vals
+
+    K          = int(K)
+    order      = int(order)
+    family_id  = int(family_id)
+    scaling_id = int(scaling_id)
+
+    precision_mode = "performance" if precision_id == 0 else "reference"
+    torch_info = TorchConfig.set_mode(precision_mode, verbose=False)
+
+    device = torch_info["device"]
+    dtype  = torch_info["dtype"]
+
+    scale_type = SCALING_ID_MAP[scaling_id]
+
+    sigma_min = min(float(wide_min), float(narrow_min))
+
+    if centers is None:
+        custom_families()
+        with _stage(timer, "topology"):
+            centers = generate_topology(family_id, K)
+
+    rule, samples, points_per_panel = row_quadrature(order, sigma_min)
+
+    rule_args = {}
+    if rule in ("composite_gauss", "adaptive"):
+        rule_args["pointsPerPanel"] = points_per_panel
+    if rule == "adaptive":
+        rule_args["centers"] = centers
+        rule_args["sigmas"]  = sigma_min
+
+    with _stage(timer, "domain"):
+        domain = makeDomain(
+            rule, LAMBDA_MIN, LAMBDA_MAX, samples,
+            device=device, dtype=dtype, **rule_args
         )
 
-        # ---- Gram selection ----
-        if whitened:
+    num_wide = K // 2
+
+    basis = GHGSFMultiLobeBasisDualDomain(
+        domain=domain,
+        centers=centers,
+        num_wide=num_wide,
+        wide_sigma_min=float(wide_min),
+        wide_sigma_max=float(wide_max),
+        wide_scale_type=scale_type,
+        narrow_sigma_min=float(narrow_min),
+        narrow_sigma_max=float(narrow_max),
+        narrow_scale_type=scale_type,
+        order=order,
+        profiler=timer,
+        memoryBudget=MEMORY_BUDGET,
+        compiled=COMPILE
+    )
+
+    return basis, torch_info
+
+
+def basis_metrics(basis, config_vals, timer=None) -> torch.Tensor:
+    """
+    Metrics row of one config on an already built basis. Raises on a
+    non-SPD Gram; compute_metrics turns that into a failed row.
+    """
+    (
+        family_id, K, order, scaling_id, precision_id, whitened,
+        wide_min, wide_max, narrow_min, narrow_max
+    ) = config_vals
+
+    K        = int(K)
+    order    = int(order)
+    whitened = int(whitened)
+
+    # ---- Gram selection ----
+    if whitened:
+        with _stage(timer, "whiten"):
             L   = basis.m_chol
             LiG = torch.linalg.solve_triangular(L, basis.m_gram, upper=False)
             G   = torch.linalg.solve_triangular(L, LiG.T, upper=False).T
-        else:
-            G = basis.m_gram
-
-        eigenvals = torch.linalg.eigvalsh(G)
-
-        # SPD guard
-        if eigenvals[0] <= 0.0:
-            raise ValueError(
-                f"Non-positive min eigenvalue {eigenvals[0].item():.3e} — Gram not SPD."
+    else:
+        G = basis.m_gram
+
+    survivor = True
+    if EIGEN_MODE != "full":
+        with _stage(timer, "estimate"):
+            est = estimateSpectrum(
+                G, chol=None if whitened else basis.m_chol, tol=SCREEN_TOL
             )
+        survivor = (
+            EIGEN_MODE == "screen"
+            and est["lam_min"] > 0.0
+            and est["lam_max"] / est["lam_min"] < SCREEN_MAX_COND
+        )
+
+    if survivor:
+        with _stage(timer, "eigvalsh"):
+            eigenvals = torch.linalg.eigvalsh(G)
 
         lam_min = eigenvals[0]
         lam_2   = eigenvals[1] if eigenvals.shape[0] > 1 else lam_min
         lam_max = eigenvals[-1]
+    else:
+        lam_min = est["lam_min"]
+        lam_2   = est["lam_2"]
+        lam_max = est["lam_max"]
+
+    # SPD guard
+    if lam_min <= 0.0:
+        raise ValueError(
+            f"Non-positive min eigenvalue {lam_min.item():.3e} — Gram not SPD."
+        )
 
+    with _stage(timer, "pack"):
         cond     = lam_max / lam_min
         log_cond = torch.log10(cond)
         trace_G  = torch.trace(G)
-        mean_eig = torch.mean(eigenvals)
-        std_eig  = torch.std(eigenvals)
 
-        prob             = eigenvals / torch.sum(eigenvals)
-        spectral_entropy = -torch.sum(prob * torch.log(prob + 1e-12))
+        if survivor:
+            mean_eig = torch.mean(eigenvals)
+            std_eig  = torch.std(eigenvals)
+
+            prob             = eigenvals / torch.sum(eigenvals)
+            spectral_entropy = -torch.sum(prob * torch.log(prob + 1e-12))
+        else:
+            mean_eig         = est["mean"]
+            std_eig          = est["std"]
+            spectral_entropy = est["entropy"]
+
         eigen_gap_ratio  = lam_2 / lam_min
 
         wide_bandwidth   = wide_max - wide_min
@@ -136,61 +314,229 @@ def compute_metrics(args):
             0.0
         ], dtype=torch.float64)
 
-        return row_index, metrics, ""
+    return metrics
+
+
+def _failed_row(error_str):
+    failed = torch.zeros(len(METRIC_COLUMNS), dtype=torch.float64)
+    failed[19] = 1.0  # spd_fail_flag
+    return failed, error_str
+
+
+def compute_metrics(args, timer=None, centers=None):
+
+    row_index, config_vals = args
+
+    try:
+        basis, _ = build_basis(config_vals, timer=timer, centers=centers)
+        return row_index, basis_metrics(basis, config_vals, timer=timer), ""
 
     except Exception:
-        error_str = traceback.format_exc()
+        return (row_index, *_failed_row(traceback.format_exc()))
+
 
-        failed = torch.zeros(len(METRIC_COLUMNS), dtype=torch.float64)
-        failed[19] = 1.0  # spd_fail_flag
+def compute_order_sweep(rows, timer=None, centers=None):
+    """
+    rows: [(row_index, config_vals)] of one constant-scaling group, sorted
+    by order. One build at the lowest order, extended order by order up
+    to the highest; each row is measured when the basis reaches its order.
 
-        return row_index, failed, error_str
+    A failed build or extension hands the rows not yet measured to
+    compute_metrics, so their results and tracebacks match a rebuild.
+
+    Returns [(row_index, metrics_tensor, error_string)]
+    """
+    results = []
+    pending = list(rows)
+
+    try:
+        basis, _ = build_basis(pending[0][1], timer=timer, centers=centers)
+
+        for _ in basis.iterOrders(int(pending[-1][1][2])):
+            while pending and int(pending[0][1][2]) == basis.m_N:
+                row_index, config_vals = pending.pop(0)
+                try:
+                    results.append((row_index, basis_metrics(basis, config_vals, timer=timer), ""))
+                except Exception:
+                    results.append((row_index, *_failed_row(traceback.format_exc())))
+
+    except Exception:
+        pass
+
+    results.extend(compute_metrics(row, timer=timer, centers=centers) for row in pending)
+    return results
 
 
 # ============================================================
 # SUB BATCH PROCESSING
 # ============================================================
 
-def process_sub_batch(config_tensor: torch.Tensor):
+def _sweep_key(row):
+    """Rows with equal keys share one basis up to order; None rebuilds per row."""
+    (
+        family_id, K, order, scaling_id, precision_id, whitened,
+        wide_min, wide_max, narrow_min, narrow_max
+    ) = row
+
+    if SCALING_ID_MAP[int(scaling_id)] != "constant":
+        return None
+
+    # Constant sigmas ignore wide_max / narrow_max; the row's own values
+    # still feed its bandwidth metrics. A tuned quadrature that changes
+    # with order splits the group, since the extension keeps the domain.
+    try:
+        quadrature = row_quadrature(order, min(wide_min, narrow_min))
+    except ValueError:
+        return None
+
+    return (family_id, K, precision_id, wide_min, narrow_min, quadrature)
+
+
+def process_sub_batch(config_tensor: torch.Tensor, timer=None):
 
     B = config_tensor.shape[0]
-    metrics_list = []
-    error_list   = []
+    metrics_list = [None] * B
+    error_list   = [None] * B
 
+    with _stage(timer, "topology"):
+        centers, mask = generate_topology_batch(config_tensor[:, 0], config_tensor[:, 1])
+        rows_centers  = unpad_topologies(centers, mask)
+
+    groups = {}
     for i in range(B):
         row = config_tensor[i].tolist()
-        row_idx, metrics, error_str = compute_metrics((i, row))
-        metrics_list.append(metrics)
-        error_list.append(error_str)
+        key = _sweep_key(row)
+        groups.setdefault(key if key is not None else ("row", i), []).append((i, row))
+
+    for rows in groups.values():
+        if len(rows) == 1:
+            results = [compute_metrics(rows[0], timer=timer, centers=rows_centers[rows[0][0]])]
+        else:
+            rows    = sorted(rows, key=lambda r: r[1][2])
+            results = compute_order_sweep(rows, timer=timer, centers=rows_centers[rows[0][0]])
+
+        for row_idx, metrics, error_str in results:
+            metrics_list[row_idx] = metrics
+            error_list[row_idx]   = error_str
 
     return torch.stack(metrics_list), error_list
 
 
+def order_sweep_permutation(configs: torch.Tensor) -> torch.Tensor:
+    """
+    Stable row order that puts rows differing only in order / whitening
+    next to each other (order ascending), so a sub-batch holds whole
+    order sweeps.
+    """
+    columns = [
+        "scaling_id", "family_id", "K", "precision_id",
+        "wide_min", "narrow_min", "wide_max", "narrow_max", "order", "whitened"
+    ]
+
+    perm = torch.arange(configs.shape[0])
+    for column in reversed(columns):
+        values = configs[perm, CONFIG_COLUMNS.index(column)]
+        perm   = perm[torch.sort(values, stable=True).indices]
+
+    return perm
+
+
 # ============================================================
 # MAIN SWEEP
 # ============================================================
 
+def warmup_compiled(configs):
+    """
+    Compiles the fused recurrence for every (K, order, samples) × precision in the
+    sweep. Tiled builds (MEMORY_BUDGET set) compile per tile shape lazily.
+    """
+    # K, order, min(wide_min, narrow_min)
+    keys = torch.stack([
+        configs[:, 1], configs[:, 2], torch.minimum(configs[:, 6], configs[:, 8])
+    ], dim=1)
+    keys = torch.unique(keys, dim=0).tolist()
+
+    # A class the tuner cannot resolve fails its rows in the sweep
+    # (compute_metrics); it just has no shape to compile here
+    shapes  = set()
+    skipped = 0
+    for K, N, s in keys:
+        try:
+            shapes.add((int(K), int(N), row_quadrature(N, s)[1]))
+        except ValueError:
+            skipped += 1
+    shapes = sorted(shapes)
+
+    print(f"  Compiling      : {len(shapes)} shapes × 2 precisions...")
+    if skipped:
+        print(f"  Not compiled   : {skipped} (K, order, sigma) classes with no converging quadrature")
+
+    for precision_mode in ("performance", "reference"):
+        torch_info = TorchConfig.set_mode(precision_mode, verbose=False)
+        warmup(
+            shapes,
+            device=torch_info["device"],
+            dtype=torch_info["dtype"]
+        )
+
+    stats = compileStats()
+    if not stats["available"]:
+        print(f"  Compile failed : {stats['failure']} — running eager")
+
+
 def run_phase1():
 
     torch.set_grad_enabled(False)
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    os.makedirs(os.path.join(OUTPUT_DIR, TIMING_DIR), exist_ok=True)
+
+    if NUM_THREADS is not None:
+        torch.set_num_threads(NUM_THREADS)
+
+    custom = custom_families()
+    configs = build_phase1_configs(custom_families=custom)
+    if PRECISION_IDS is not None:
+        precision = configs[:, CONFIG_COLUMNS.index("precision_id")]
+        configs   = configs[torch.isin(precision, torch.tensor(PRECISION_IDS, dtype=precision.dtype))]
+
+    # A custom family must place every K of the grid; fail here rather
+    # than crash each disk batch that reaches it
+    if custom:
+        Ks = torch.unique(configs[:, 1]).long()
+        for topology_id in custom:
+            generate_topology_batch(torch.full_like(Ks, topology_id), Ks)
+
+    if ORDER_SWEEP:
+        configs = configs[order_sweep_permutation(configs)]
 
-    configs       = build_phase1_configs()
     total_configs = configs.shape[0]
     num_batches   = (total_configs + DISK_BATCH_SIZE - 1) // DISK_BATCH_SIZE
 
     print(f"Phase 1 sweep")
     print(f"  Total configs  : {total_configs:,}")
+    if custom:
+        print(f"  Custom families: {custom} ({CUSTOM_TOPOLOGIES})")
     print(f"  Disk batches   : {num_batches}")
-    print(f"  Lambda samples : {LAMBDA_SAMPLES}")
+    if QUADRATURE_TOL is None:
+        print(f"  Lambda samples : {LAMBDA_SAMPLES} ({QUADRATURE_RULE})")
+    else:
+        print(f"  Lambda samples : per row (tuned to {QUADRATURE_TOL:g})")
     print(f"  Output dir     : {OUTPUT_DIR}")
 
+    if COMPILE:
+        warmup_compiled(configs)
+
+    rate = RateReport(total_configs)
+
     for batch_id in range(num_batches):
 
-        pt_path  = os.path.join(OUTPUT_DIR, f"phase1_batch_{batch_id}.pt")
-        csv_path = pt_path.replace(".pt", ".csv")
+        pt_path     = os.path.join(OUTPUT_DIR, f"phase1_batch_{batch_id}.pt")
+        csv_path    = pt_path.replace(".pt", ".csv")
+        timing_path = os.path.join(OUTPUT_DIR, TIMING_DIR, f"batch_{batch_id}.csv")
 
         if os.path.exists(pt_path):
             print(f"  Batch {batch_id:4d} — exists, skipping.")
+            rate.skip(min(DISK_BATCH_SIZE, total_configs - batch_id * DISK_BATCH_SIZE))
             continue
 
         try:
@@ -204,38 +550,48 @@ def run_phase1():
             all_metrics = []
             all_errors  = []
 
+            timer = StageTimer()
+
             for sub_start in range(0, disk_batch.shape[0], SUB_BATCH_SIZE):
                 sub_end   = min(sub_start + SUB_BATCH_SIZE, disk_batch.shape[0])
                 sub_batch = disk_batch[sub_start:sub_end]
 
-                metrics, errors = process_sub_batch(sub_batch)
+                metrics, errors = process_sub_batch(sub_batch, timer=timer)
                 all_metrics.append(metrics)
                 all_errors.extend(errors)
 
-                pct = 100.0 * sub_end / disk_batch.shape[0]
-                print(f"    {sub_end}/{disk_batch.shape[0]} ({pct:.0f}%)", end="\r")
+                rate.advance(sub_end - sub_start)
+                print(f"    {sub_end}/{disk_batch.shape[0]}  |  {rate.line()}", end="\r")
 
             print()
 
             all_metrics = torch.cat(all_metrics, dim=0)
 
-            torch.save({
-                "phase1_version": PHASE1_VERSION,
-                "configs":        disk_batch,
-                "metrics":        all_metrics,
-                "config_columns": CONFIG_COLUMNS,
-                "metric_columns": METRIC_COLUMNS,
-            }, pt_path)
+            with timer.stage("write_pt"):
+                torch.save({
+                    "phase1_version": PHASE1_VERSION,
+                    "configs":        disk_batch,
+                    "metrics":        all_metrics,
+                    "config_columns": CONFIG_COLUMNS,
+                    "metric_columns": METRIC_COLUMNS,
+                }, pt_path)
+
+            with timer.stage("write_csv"):
+                # pandas is only needed for this write — imported here so
+                # sweep workers start on torch alone
+                import pandas as pd
+
+                df_cfg = pd.DataFrame(disk_batch.numpy(), columns=CONFIG_COLUMNS)
+                df_met = pd.DataFrame(all_metrics.numpy(), columns=METRIC_COLUMNS)
+                df_err = pd.DataFrame({"error_msg": all_errors})
 
-            df_cfg = pd.DataFrame(disk_batch.numpy(), columns=CONFIG_COLUMNS)
-            df_met = pd.DataFrame(all_metrics.numpy(), columns=METRIC_COLUMNS)
-            df_err = pd.DataFrame({"error_msg": all_errors})
+                int_cols = ["family_id", "K", "order", "scaling_id", "precision_id", "whitened"]
+                for col in int_cols:
+                    df_cfg[col] = df_cfg[col].astype(int)
 
-            int_cols = ["family_id", "K", "order", "scaling_id", "precision_id", "whitened"]
-            for col in int_cols:
-                df_cfg[col] = df_cfg[col].astype(int)
+                pd.concat([df_cfg, df_met, df_err], axis=1).to_csv(csv_path, index=False)
 
-            pd.concat([df_cfg, df_met, df_err], axis=1).to_csv(csv_path, index=False)
+            timer.write_csv(timing_path)
 
             spd_fails = int(all_metrics[:, -1].sum().item())
             real_errors = sum(1 for e in all_errors if e)
@@ -243,7 +599,8 @@ def run_phase1():
             print(
                 f"  Batch {batch_id:4d} — done. "
                 f"SPD failures: {spd_fails}/{disk_batch.shape[0]}  "
-                f"({real_errors} with traceback)"
+                f"({real_errors} with traceback)  "
+                f"dominant stage: {timer.dominant()}"
             )
 
         except Exception:
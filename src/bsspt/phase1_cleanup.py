@@ -15,66 +15,74 @@ LOGCOND_MAX = 8.0
 VALID_FAMILIES = [0, 4]  # uniform, sawblade
 
 
-# ============================================================
-# Load Dataset
-# ============================================================
+def run_cleanup(
+    input_path=INPUT_PARQUET,
+    output_parquet=OUTPUT_PARQUET,
+    output_csv=OUTPUT_CSV,
+    logcond_min=LOGCOND_MIN,
+    logcond_max=LOGCOND_MAX,
+    valid_families=VALID_FAMILIES
+):
 
-print("Loading parquet dataset...")
-df = pd.read_parquet(INPUT_PARQUET)
+    # ============================================================
+    # Load Dataset
+    # ============================================================
 
-print("Total rows:", len(df))
+    print("Loading parquet dataset...")
+    df = pd.read_parquet(input_path)
 
+    print("Total rows:", len(df))
 
-# ============================================================
-# Drop invalid numerical rows
-# ============================================================
+    # ============================================================
+    # Drop invalid numerical rows
+    # ============================================================
 
-print("Removing SPD failures...")
-df = df[df["spd_fail_flag"] == 0]
+    print("Removing SPD failures...")
+    df = df[df["spd_fail_flag"] == 0]
 
+    # ============================================================
+    # Stability filter
+    # ============================================================
 
-# ============================================================
-# Stability filter
-# ============================================================
+    print("Filtering by condition number stability...")
+    df = df[
+        (df["log10_condition"] >= logcond_min) &
+        (df["log10_condition"] <= logcond_max)
+    ]
 
-print("Filtering by condition number stability...")
-df = df[
-    (df["log10_condition"] >= LOGCOND_MIN) &
-    (df["log10_condition"] <= LOGCOND_MAX)
-]
+    # ============================================================
+    # Family filter
+    # ============================================================
 
+    print("Filtering topology families...")
+    df = df[df["family_id"].isin(valid_families)]
 
-# ============================================================
-# Family filter
-# ============================================================
+    # ============================================================
+    # Drop error rows
+    # ============================================================
 
-print("Filtering topology families...")
-df = df[df["family_id"].isin(VALID_FAMILIES)]
+    if "error_msg" in df.columns:
+        df = df[df["error_msg"].isna()]
 
+    # ============================================================
+    # Reset index
+    # ============================================================
 
-# ============================================================
-# Drop error rows
-# ============================================================
-
-if "error_msg" in df.columns:
-    df = df[df["error_msg"].isna()]
-
-
-# ============================================================
-# Reset index
-# ============================================================
+    df = df.reset_index(drop=True)
 
-df = df.reset_index(drop=True)
+    # ============================================================
+    # Save cleaned dataset
+    # ============================================================
 
+    print("Saving cleaned dataset...")
 
-# ============================================================
-# Save cleaned dataset
-# ============================================================
+    df.to_parquet(output_parquet)
+    if output_csv is not None:
+        df.to_csv(output_csv, index=False)
 
-print("Saving cleaned dataset...")
+    print("Cleaned rows:", len(df))
+    print("Done.")
 
-df.to_parquet(OUTPUT_PARQUET)
-df.to_csv(OUTPUT_CSV, index=False)
 
-print("Cleaned rows:", len(df))
-print("Done.")
\ No newline at end of file
+if __name__ == "__main__":
+    run_cleanup()
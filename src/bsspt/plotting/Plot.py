@@ -11,13 +11,117 @@ Features:
 - Multi-panel support with automatic layout
 - Animation capabilities
 - Scientific annotation tools
+- Headless batch export with parallel rendering
 """
 
+import os
+import time
+import shutil
+import subprocess
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib.animation as animation
 from typing import Optional, Callable, Dict, List, Tuple, Any
 
+
+# matplotlib.pyplot, loaded by internalPyplot() on first use
+plt = None
+
+
+def internalPyplot():
+    """
+    Import matplotlib.pyplot on first use and apply the global rendering
+    settings, so importing this module loads neither matplotlib nor
+    touches rcParams until a figure is actually built.
+    """
+    global plt
+    if plt is None:
+        import matplotlib.pyplot as pyplot
+
+        # Configure matplotlib for research-grade rendering
+        pyplot.rcParams['font.family'] = 'DejaVu Sans'
+        pyplot.rcParams['mathtext.fontset'] = 'dejavusans'
+        pyplot.rcParams['mathtext.default'] = 'regular'
+
+        # Global rendering consistency
+        pyplot.rcParams['figure.autolayout'] = False
+        pyplot.rcParams['axes.titlepad'] = 8
+        pyplot.rcParams['axes.labelpad'] = 6
+
+        plt = pyplot
+    return plt
+
+
+def envelopeDecimate(xData: np.ndarray, yData: np.ndarray, buckets: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Min/max envelope decimation of a line for a given pixel width.
+
+    x is split into `buckets` equal-width columns; each column keeps its
+    first, last, lowest and highest sample, in original order. Drawn at
+    one column per pixel the polyline covers the same pixels as the full
+    data, with at most 4 * buckets points.
+
+    Data that is already small enough, not sorted by x, or contains
+    non-finite values is returned unchanged.
+    """
+    xData = np.asarray(xData)
+    yData = np.asarray(yData)
+    n = xData.shape[0]
+
+    if xData.ndim != 1 or yData.shape != xData.shape or n <= 4 * buckets:
+        return xData, yData
+    if not (np.all(np.isfinite(xData)) and np.all(np.isfinite(yData))):
+        return xData, yData
+    if np.any(np.diff(xData) < 0):
+        return xData, yData
+
+    span = xData[-1] - xData[0]
+    if span <= 0:
+        return xData, yData
+
+    column = np.minimum(((xData - xData[0]) / span * buckets).astype(np.int64), buckets - 1)
+
+    starts = np.flatnonzero(np.concatenate([[True], column[1:] != column[:-1]]))
+    ends = np.append(starts[1:], n) - 1
+
+    # Sorted by (column, y): each column's extremes sit at its run boundaries
+    order = np.lexsort((yData, column))
+
+    keep = np.unique(np.concatenate([starts, ends, order[starts], order[ends]]))
+    return xData[keep], yData[keep]
+
+
+def pixelDecimate(xData: np.ndarray, yData: np.ndarray,
+                  width: int, height: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Scatter decimation: keeps the first point of every occupied cell of a
+    width x height pixel grid over the data range. Markers are at least a
+    pixel wide, so the coverage is unchanged; only alpha stacking of
+    overlapping points differs.
+    """
+    xData = np.asarray(xData)
+    yData = np.asarray(yData)
+
+    if xData.ndim != 1 or yData.shape != xData.shape or xData.shape[0] <= width * height:
+        return xData, yData
+    if not (np.all(np.isfinite(xData)) and np.all(np.isfinite(yData))):
+        return xData, yData
+
+    def cells(values, count):
+        lo, hi = values.min(), values.max()
+        if hi <= lo:
+            return np.zeros(values.shape[0], dtype=np.int64)
+        return np.minimum(((values - lo) / (hi - lo) * count).astype(np.int64), count - 1)
+
+    cell = cells(xData, width) * height + cells(yData, height)
+    _, keep = np.unique(cell, return_index=True)
+    keep.sort()
+
+    return xData[keep], yData[keep]
+
+
 class PlotEngine:
     """
     Core plotting engine for single-panel scientific figures.
@@ -39,6 +143,9 @@ class PlotEngine:
         'tick': '#FFFFFF',  # White ticks
     }
 
+    # Target resolution for opt-in decimation (matches saveFigure's default)
+    s_decimationDpi = 300
+
     # Typography configuration
     s_fontSizes = {
         'suptitle': 14,
@@ -66,7 +173,7 @@ class PlotEngine:
 
     def internalInitializeFigure(self) -> None:
         """Create the matplotlib figure and axes."""
-        self.m_figure, self.m_axes = plt.subplots(figsize=self.m_figsize, facecolor=self.s_colors['figure_bg'])
+        self.m_figure, self.m_axes = internalPyplot().subplots(figsize=self.m_figsize, facecolor=self.s_colors['figure_bg'])
         self.m_figure.patch.set_facecolor(self.s_colors['figure_bg'])
         self.m_axes.set_facecolor(self.s_colors['axes_bg'])
         self.m_axes.patch.set_facecolor(self.s_colors['axes_bg'])
@@ -102,7 +209,8 @@ class PlotEngine:
                 color: Optional[str] = None,
                 linewidth: float = 1.5,
                 linestyle: str = '-',
-                alpha: float = 1.0) -> None:
+                alpha: float = 1.0,
+                decimate: bool = False):
         """
         Add a line plot to the axes.
 
@@ -114,7 +222,16 @@ class PlotEngine:
             linewidth: Line width in points
             linestyle: Line style ('-', '--', '-.', ':')
             alpha: Line transparency (0.0 to 1.0)
+            decimate: Reduce the line to a min/max envelope of one column per
+                pixel of the axes at s_decimationDpi (see envelopeDecimate)
+
+        Returns:
+            The Line2D artist, for in-place updates (set_data) in animations
         """
+        if decimate:
+            width, _ = self.internalPixelSize()
+            xData, yData = envelopeDecimate(xData, yData, width)
+
         if color is None:
             colorCycle = [self.s_colors['primary'],
                           self.s_colors['secondary'],
@@ -122,18 +239,21 @@ class PlotEngine:
             color = colorCycle[self.m_lineCounter % len(colorCycle)]
             self.m_lineCounter += 1
 
-        self.m_axes.plot(xData, yData, label=label, color=color,
-                         linewidth=linewidth, linestyle=linestyle, alpha=alpha)
+        line, = self.m_axes.plot(xData, yData, label=label, color=color,
+                                 linewidth=linewidth, linestyle=linestyle, alpha=alpha)
 
         # Prevent edge clipping
         self.m_axes.margins(x=0.01)
 
+        return line
+
     def addScatter(self, xData: np.ndarray, yData: np.ndarray,
                    label: Optional[str] = None,
                    color: Optional[str] = None,
                    marker: str = 'o',
                    size: float = 30,
-                   alpha: float = 0.7) -> None:
+                   alpha: float = 0.7,
+                   decimate: bool = False):
         """
         Add a scatter plot to the axes.
 
@@ -145,12 +265,27 @@ class PlotEngine:
             marker: Marker style
             size: Marker size
             alpha: Marker transparency
+            decimate: Keep one point per pixel of the axes at s_decimationDpi
+                (see pixelDecimate)
+
+        Returns:
+            The PathCollection artist, for in-place updates (set_offsets)
         """
+        if decimate:
+            xData, yData = pixelDecimate(xData, yData, *self.internalPixelSize())
+
         if color is None:
             color = self.s_colors['primary']
 
-        self.m_axes.scatter(xData, yData, label=label, color=color,
-                            marker=marker, s=size, alpha=alpha, edgecolors='none')
+        return self.m_axes.scatter(xData, yData, label=label, color=color,
+                                   marker=marker, s=size, alpha=alpha, edgecolors='none')
+
+    def internalPixelSize(self) -> Tuple[int, int]:
+        """Axes size in pixels at s_decimationDpi."""
+        figWidth, figHeight = self.m_figure.get_size_inches()
+        box = self.m_axes.get_position()
+        return (max(int(np.ceil(box.width * figWidth * self.s_decimationDpi)), 1),
+                max(int(np.ceil(box.height * figHeight * self.s_decimationDpi)), 1))
 
     def addHorizontalLine(self, yValue: float,
                           color: Optional[str] = None,
@@ -367,7 +502,7 @@ class PlotEngine:
 
     def show(self) -> None:
         """Display the figure."""
-        plt.show()
+        internalPyplot().show()
 
     def clear(self) -> None:
         """Clear the axes content."""
@@ -378,7 +513,7 @@ class PlotEngine:
     def close(self) -> None:
         """Close the figure and release resources."""
         if self.m_figure is not None:
-            plt.close(self.m_figure)
+            internalPyplot().close(self.m_figure)
             self.m_figure = None
             self.m_axes = None
 
@@ -420,7 +555,7 @@ class MultiPanelEngine:
     def internalInitializePanels(self) -> None:
         """Create figure with grid layout (supports both vertical stacking and grid)."""
         # Create subplots with optimized spacing
-        self.m_figure, axesArray = plt.subplots(
+        self.m_figure, axesArray = internalPyplot().subplots(
             self.m_nrows,
             self.m_ncols,
             figsize=self.m_figsize,
@@ -524,12 +659,12 @@ class MultiPanelEngine:
 
     def show(self) -> None:
         """Display the multi-panel figure."""
-        plt.show()
+        internalPyplot().show()
 
     def close(self) -> None:
         """Close the figure and release resources."""
         if self.m_figure is not None:
-            plt.close(self.m_figure)
+            internalPyplot().close(self.m_figure)
             self.m_figure = None
             self.m_axes = []
             self.m_panels = []
@@ -591,6 +726,10 @@ class AnimationEngine:
 
     Supports MP4 and GIF export with consistent theming
     and flicker-free rendering using blitting.
+
+    streamAnimation / streamAnimationParallel bypass FuncAnimation.save:
+    frames are rendered straight into the Agg buffer (blitting only the
+    artists updateFn returns) and piped to ffmpeg or a PNG sequence.
     """
 
     def __init__(self, plotEngine: PlotEngine):
@@ -616,6 +755,8 @@ class AnimationEngine:
             interval: Delay between frames in milliseconds
             useBlit: Use blitting for performance
         """
+        from matplotlib import animation
+
         self.m_animation = animation.FuncAnimation(
             self.m_plotEngine.m_figure,
             updateFn,
@@ -626,7 +767,9 @@ class AnimationEngine:
         )
 
     def saveAnimation(self, filepath: str, fps: int = 30,
-                      codec: str = 'h264') -> None:
+                      codec: str = 'h264',
+                      dpi: int = 100,
+                      bitrate: int = 1800) -> None:
         """
         Save animation to file.
 
@@ -634,35 +777,265 @@ class AnimationEngine:
             filepath: Output file path (.mp4 or .gif)
             fps: Frames per second
             codec: Video codec ('h264' for MP4)
+            dpi: Frame resolution in dots per inch
+            bitrate: Video bitrate in kbit/s
         """
         if self.m_animation is None:
             raise RuntimeError("No animation created. Call animate() first.")
 
+        from matplotlib import animation
+
         if filepath.endswith('.gif'):
             writer = animation.PillowWriter(fps=fps)
         else:
             writer = animation.FFMpegWriter(fps=fps, codec=codec,
-                                            bitrate=1800)
+                                            bitrate=bitrate)
+
+        self.m_animation.save(filepath, writer=writer, dpi=dpi)
+
+    def streamAnimation(self, filepath: str,
+                        updateFn: Callable[[int], List],
+                        frames: int,
+                        fps: int = 30,
+                        dpi: int = 100,
+                        codec: str = 'h264',
+                        bitrate: Optional[int] = None,
+                        useBlit: bool = True) -> float:
+        """
+        Render frames in-process and stream them to the encoder.
+
+        updateFn must set every animated artist from the frame index
+        alone (e.g. line.set_ydata(frames[i]) on artists preallocated by
+        addLine) and return them; nothing is re-created per frame.
+
+        Args:
+            filepath: Video file (.mp4, .gif, ...) or a directory for a PNG sequence
+            updateFn: Frame index -> updated artists
+            frames: Number of frames
+            fps: Frames per second
+            dpi: Frame resolution in dots per inch
+            codec: ffmpeg video codec
+            bitrate: Video bitrate in kbit/s (None = encoder default)
+            useBlit: Redraw only the returned artists over a cached
+                background; the rest of the figure must stay static
+
+        Returns:
+            Frames per second achieved (render + encode)
+        """
+        renderer = FrameRenderer(self.m_plotEngine.m_figure, updateFn, dpi, useBlit)
+        writer = FrameWriter(filepath, fps, codec, bitrate)
+
+        start = time.perf_counter()
+        try:
+            for frame in range(frames):
+                writer.write(renderer.render(frame))
+        finally:
+            writer.close()
+            renderer.close()
+
+        return internalReportFrames(filepath, frames, time.perf_counter() - start, 1)
+
+    @staticmethod
+    def streamAnimationParallel(filepath: str,
+                                buildFn: Callable[[], Tuple[Any, Callable[[int], List]]],
+                                frames: int,
+                                workers: Optional[int] = None,
+                                fps: int = 30,
+                                dpi: int = 100,
+                                codec: str = 'h264',
+                                bitrate: Optional[int] = None,
+                                useBlit: bool = True,
+                                chunkFrames: int = 16) -> float:
+        """
+        Render frames in a process pool and stream them, in order, to the encoder.
+
+        Every worker calls buildFn() once to get its own (engine, updateFn)
+        and renders contiguous chunks of frames; at most two chunks per
+        worker are in flight, so memory stays bounded for long animations.
+
+        Args:
+            filepath: Video file or a directory for a PNG sequence
+            buildFn: Module-level function returning (engine, updateFn)
+            frames: Number of frames
+            workers: Render processes (defaults to the CPU count)
+            fps, dpi, codec, bitrate, useBlit: As in streamAnimation
+            chunkFrames: Frames per task
 
-        self.m_animation.save(filepath, writer=writer, dpi=100)
+        Returns:
+            Frames per second achieved (render + encode)
+        """
+        workers = workers if workers is not None else (os.cpu_count() or 1)
+        chunks = [(first, min(first + chunkFrames, frames)) for first in range(0, frames, chunkFrames)]
+
+        writer = FrameWriter(filepath, fps, codec, bitrate)
+        context = multiprocessing.get_context('spawn')
+
+        start = time.perf_counter()
+        try:
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                     initializer=internalInitFrameWorker,
+                                     initargs=(buildFn, dpi, useBlit)) as pool:
+                pending = deque()
+                for chunk in chunks:
+                    pending.append(pool.submit(internalRenderFrameChunk, *chunk))
+                    if len(pending) >= 2 * workers:
+                        for frame in pending.popleft().result():
+                            writer.write(frame)
+                while pending:
+                    for frame in pending.popleft().result():
+                        writer.write(frame)
+        finally:
+            writer.close()
+
+        return internalReportFrames(filepath, frames, time.perf_counter() - start, workers)
 
     def show(self) -> None:
         """Display the animation."""
         if self.m_animation is None:
             raise RuntimeError("No animation created. Call animate() first.")
 
-        plt.show()
+        internalPyplot().show()
+
+
+class FrameRenderer:
+    """
+    Renders animation frames of a figure into its Agg pixel buffer.
+
+    With blitting the static background is drawn once and cached;
+    every frame restores it and draws only the artists updateFn returns.
+    """
 
+    def __init__(self, figure, updateFn: Callable[[int], List], dpi: int, useBlit: bool = True):
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
 
-# Configure matplotlib for research-grade rendering
-plt.rcParams['font.family'] = 'DejaVu Sans'
-plt.rcParams['mathtext.fontset'] = 'dejavusans'
-plt.rcParams['mathtext.default'] = 'regular'
+        self.m_figure = figure
+        self.m_updateFn = updateFn
+        self.m_figure.set_dpi(dpi)
 
-# Global rendering consistency
-plt.rcParams['figure.autolayout'] = False
-plt.rcParams['axes.titlepad'] = 8
-plt.rcParams['axes.labelpad'] = 6
+        # GUI canvases built on Agg expose buffer_rgba; anything else gets an Agg canvas
+        self.m_canvas = figure.canvas if hasattr(figure.canvas, 'buffer_rgba') else FigureCanvasAgg(figure)
+
+        self.m_artists = []
+        self.m_background = None
+
+        if useBlit:
+            self.m_artists = list(updateFn(0) or [])
+            for artist in self.m_artists:
+                artist.set_animated(True)
+            self.m_canvas.draw()
+            self.m_background = self.m_canvas.copy_from_bbox(figure.bbox)
+
+    def render(self, frame: int) -> memoryview:
+        """RGBA pixels [height, width, 4] of one frame (valid until the next render)."""
+        artists = self.m_updateFn(frame)
+
+        if self.m_background is None:
+            self.m_canvas.draw()
+        else:
+            self.m_canvas.restore_region(self.m_background)
+            for artist in artists or []:
+                self.m_figure.draw_artist(artist)
+
+        return self.m_canvas.buffer_rgba()
+
+    def close(self) -> None:
+        """Return the animated artists to normal drawing."""
+        for artist in self.m_artists:
+            artist.set_animated(False)
+        self.m_artists = []
+
+
+class FrameWriter:
+    """
+    Sink for RGBA frames: raw video piped to ffmpeg, or numbered PNGs
+    when the target is a directory (no extension or a trailing separator).
+    The output size is taken from the first frame.
+    """
+
+    def __init__(self, filepath: str, fps: int = 30,
+                 codec: str = 'h264', bitrate: Optional[int] = None):
+        self.m_filepath = filepath
+        self.m_fps = fps
+        self.m_codec = codec
+        self.m_bitrate = bitrate
+        self.m_process = None
+        self.m_count = 0
+        self.m_sequence = filepath.endswith(('/', os.sep)) or not os.path.splitext(filepath)[1]
+
+        if self.m_sequence:
+            os.makedirs(filepath, exist_ok=True)
+
+    def internalOpenEncoder(self, width: int, height: int) -> None:
+        """Start ffmpeg reading rgba frames of the given size from stdin."""
+        ffmpeg = shutil.which(internalPyplot().rcParams['animation.ffmpeg_path'])
+        if ffmpeg is None:
+            raise RuntimeError("ffmpeg not found; install it or stream to a PNG directory instead.")
+
+        command = [
+            ffmpeg, '-y', '-loglevel', 'error',
+            '-f', 'rawvideo', '-pix_fmt', 'rgba',
+            '-s', f'{width}x{height}', '-r', str(self.m_fps),
+            '-i', '-', '-an',
+        ]
+
+        if not self.m_filepath.endswith('.gif'):
+            # yuv420p needs even dimensions
+            command += ['-vcodec', self.m_codec, '-pix_fmt', 'yuv420p',
+                        '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2']
+            if self.m_bitrate is not None:
+                command += ['-b:v', f'{self.m_bitrate}k']
+
+        self.m_process = subprocess.Popen(command + [self.m_filepath], stdin=subprocess.PIPE)
+
+    def write(self, frame) -> None:
+        """
+        Append one frame.
+
+        Args:
+            frame: RGBA pixels [height, width, 4] (buffer or array)
+        """
+        pixels = np.asarray(frame)
+
+        if self.m_sequence:
+            internalPyplot().imsave(os.path.join(self.m_filepath, f'frame_{self.m_count:05d}.png'), pixels)
+        else:
+            if self.m_process is None:
+                self.internalOpenEncoder(pixels.shape[1], pixels.shape[0])
+            self.m_process.stdin.write(memoryview(np.ascontiguousarray(pixels)).cast('B'))
+
+        self.m_count += 1
+
+    def close(self) -> None:
+        """Flush and finalize the output."""
+        if self.m_process is not None:
+            self.m_process.stdin.close()
+            if self.m_process.wait() != 0:
+                raise RuntimeError(f"ffmpeg failed writing {self.m_filepath}")
+            self.m_process = None
+
+
+# Per-process state of streamAnimationParallel workers
+internalFrameWorker = {}
+
+
+def internalInitFrameWorker(buildFn: Callable, dpi: int, useBlit: bool) -> None:
+    """Pool initializer: build the figure once per worker process."""
+    useHeadlessBackend()
+    engine, updateFn = buildFn()
+    internalFrameWorker['engine'] = engine
+    internalFrameWorker['renderer'] = FrameRenderer(engine.m_figure, updateFn, dpi, useBlit)
+
+
+def internalRenderFrameChunk(first: int, last: int) -> List[np.ndarray]:
+    """Render frames [first, last) in this worker, copied out of the canvas buffer."""
+    renderer = internalFrameWorker['renderer']
+    return [np.array(renderer.render(frame)) for frame in range(first, last)]
+
+
+def internalReportFrames(filepath: str, frames: int, seconds: float, workers: int) -> float:
+    rate = frames / seconds if seconds > 0 else float('inf')
+    print(f"  {frames} frames in {seconds:.2f}s ({rate:.1f} frames/s, {workers} workers) -> {filepath}")
+    return rate
 
 
 class SurfaceEngine(PlotEngine):
@@ -672,7 +1045,7 @@ class SurfaceEngine(PlotEngine):
     """
 
     def internalInitializeFigure(self) -> None:
-        self.m_figure = plt.figure(figsize=self.m_figsize,
+        self.m_figure = internalPyplot().figure(figsize=self.m_figsize,
                                    facecolor=self.s_colors['figure_bg'])
         self.m_axes = self.m_figure.add_subplot(111, projection='3d')
         self.m_axes.set_facecolor(self.s_colors['axes_bg'])
@@ -700,4 +1073,121 @@ class SurfaceEngine(PlotEngine):
         self.m_axes.set_zlabel(zlabel)
 
     def setView(self, elev: float = 30, azim: float = 45):
-        self.m_axes.view_init(elev=elev, azim=azim)
\ No newline at end of file
+        self.m_axes.view_init(elev=elev, azim=azim)
+
+
+def useHeadlessBackend() -> None:
+    """Switch pyplot to the non-interactive Agg backend (no window, no event loop)."""
+    import matplotlib
+    matplotlib.use('Agg')
+
+
+def internalRenderJob(outputDir: str, name: str, fileFormat: str, dpi: int,
+                      buildFn: Callable, args: tuple, kwargs: dict) -> Tuple[str, float]:
+    """
+    Build one figure, write it via saveFigure and release it.
+
+    Module-level so the process pool can pickle it. The returned time
+    covers build, draw and encode.
+    """
+    useHeadlessBackend()
+
+    start = time.perf_counter()
+
+    engine = buildFn(*args, **kwargs)
+    filepath = os.path.join(outputDir, f"{name}.{fileFormat}")
+    engine.saveFigure(filepath, dpi=dpi)
+    engine.close()
+
+    return filepath, time.perf_counter() - start
+
+
+class FigureBatch:
+    """
+    Batch renderer for PlotEngine / MultiPanelEngine / SurfaceEngine figures.
+
+    Figures are queued as (name, buildFn, args): buildFn must be a
+    module-level function returning an engine, and args plain picklable
+    data (numpy arrays, lists) — not tensors or engines.
+
+    With an output directory every figure is rendered headless on the
+    Agg backend, in a process pool when workers > 1, and written via
+    saveFigure with its render time reported. Without one, figures are
+    built and shown interactively one by one, as the scripts used to.
+
+    Scripts that render in a pool must keep their top-level code under
+    if __name__ == "__main__" — workers are spawned and re-import them.
+    """
+
+    def __init__(self, outputDir: Optional[str] = None,
+                 workers: Optional[int] = None,
+                 dpi: int = 150,
+                 fileFormat: str = 'png'):
+        """
+        Initialize the batch.
+
+        Args:
+            outputDir: Directory the figures are written to (None = interactive)
+            workers: Render processes (defaults to the CPU count; <= 1 renders in-process)
+            dpi: Resolution of the written figures
+            fileFormat: File extension / matplotlib format ('png', 'pdf', 'svg', ...)
+        """
+        self.m_outputDir = outputDir
+        self.m_workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.m_dpi = dpi
+        self.m_fileFormat = fileFormat
+        self.m_jobs = []
+
+    def add(self, name: str, buildFn: Callable, *args, **kwargs) -> None:
+        """
+        Queue a figure.
+
+        Args:
+            name: Output file stem (unique within the batch)
+            buildFn: Module-level function building and returning an engine
+            *args, **kwargs: Passed to buildFn
+        """
+        self.m_jobs.append((name, buildFn, args, kwargs))
+
+    def render(self) -> List[Tuple[str, float]]:
+        """
+        Render every queued figure and clear the queue.
+
+        Returns:
+            (filepath, seconds) per figure in queue order (empty when interactive)
+        """
+        jobs, self.m_jobs = self.m_jobs, []
+
+        if self.m_outputDir is None:
+            for name, buildFn, args, kwargs in jobs:
+                engine = buildFn(*args, **kwargs)
+                engine.show()
+                engine.close()
+            return []
+
+        os.makedirs(self.m_outputDir, exist_ok=True)
+        workers = max(min(self.m_workers, len(jobs)), 1)
+        start = time.perf_counter()
+
+        if workers == 1:
+            useHeadlessBackend()
+            results = [internalRenderJob(self.m_outputDir, name, self.m_fileFormat, self.m_dpi,
+                                         buildFn, args, kwargs)
+                       for name, buildFn, args, kwargs in jobs]
+        else:
+            # Spawned workers: a forked child would inherit CUDA / GUI state
+            context = multiprocessing.get_context('spawn')
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+                futures = [pool.submit(internalRenderJob, self.m_outputDir, name, self.m_fileFormat,
+                                       self.m_dpi, buildFn, args, kwargs)
+                           for name, buildFn, args, kwargs in jobs]
+                results = [future.result() for future in futures]
+
+        wall = time.perf_counter() - start
+
+        for filepath, seconds in results:
+            print(f"  {seconds:6.2f}s  {filepath}")
+        print(f"  {len(results)} figures in {wall:.2f}s "
+              f"({sum(seconds for _, seconds in results):.2f}s of rendering, {workers} workers)")
+
+        return results
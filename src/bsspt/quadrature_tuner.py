@@ -0,0 +1,291 @@
+# ============================================================
+# Quadrature Auto-Tuner
+# Finds the smallest sample count (and the rule) at which the Gram
+# and the projection moments of a basis class converge to a
+# tolerance, and caches the answer per class in a JSON file so the
+# sweep can pick its resolution per row.
+#
+# A class is (highest order, smallest sigma): the finest feature a
+# Hermite function of order N and width σ carries is set by those
+# two alone. The probe basis puts PROBE_LOBES lobes of that width
+# and order across the topology range, including both ends, so the
+# worst placement any topology can produce is covered.
+#
+# Errors are max-abs relative to a converged reference (composite
+# Gauss, REFERENCE_SAMPLES nodes):
+#   gram_error       — max |G - G_ref| / max |G_ref|
+#   projection_error — max over PROJECTION_CASES of
+#                      max |b - b_ref| / max |b_ref|,  b = B W S
+# ============================================================
+
+import os
+import json
+import itertools
+from typing import Dict, Iterable, Optional, Tuple
+
+import torch
+
+from engine.hermitebasis import hermiteFunctions
+from engine.quadraturedomain import makeDomain
+from spectral_topology import L_MIN_DEFAULT, L_MAX_DEFAULT
+from stress_cases import CASES
+
+
+# ============================================================
+# SETTINGS
+# ============================================================
+
+CACHE_PATH = "quadrature_cache.json"
+
+# Rules tried, cheapest first on ties. "adaptive" depends on the
+# topology rather than the class and is not tuned here.
+CANDIDATE_RULES = ("gauss", "composite_gauss", "simpson", "trapezoid")
+
+# Points per composite_gauss panel. Stored with every tuned entry (and
+# part of its key) so the sweep builds the domain it was tuned on
+PANEL_POINTS = 16
+
+MIN_SAMPLES = 32
+MAX_SAMPLES = 16384
+
+# Bisection stops when the bracket is this narrow
+SAMPLE_RESOLUTION = 16
+
+REFERENCE_SAMPLES = 16384
+
+PROBE_LOBES = 16
+
+# Smooth cases only — Step / Laser / Comb are limited by how finely
+# the spectrum itself is sampled, not by the quadrature rule
+PROJECTION_CASES = ("D65", "LED", "Blackbody")
+
+# Sigmas are rounded down to this step, so a class is tuned at its
+# narrowest member
+SIGMA_STEP = 0.5
+
+
+# ============================================================
+# ERROR MEASUREMENT
+# ============================================================
+
+def _probe(order: int, sigma: float, rule: str, samples: int, lambda_min: float, lambda_max: float):
+    """(G [M, M], b [C, M]) of the probe basis on one domain, in float64 on CPU."""
+    rule_args = {"pointsPerPanel": PANEL_POINTS} if rule == "composite_gauss" else {}
+    domain = makeDomain(rule, lambda_min, lambda_max, samples, **rule_args)
+
+    centers = torch.linspace(L_MIN_DEFAULT, L_MAX_DEFAULT, PROBE_LOBES, dtype=torch.float64)
+    sigmas  = torch.full((PROBE_LOBES, order), sigma, dtype=torch.float64)
+
+    B  = hermiteFunctions(domain.m_lambda, centers, sigmas)     # [M, L]
+    BW = B * domain.m_weights
+
+    spectra = torch.stack([CASES[name](domain.m_lambda) for name in PROJECTION_CASES])
+
+    return BW @ B.T, spectra @ BW.T
+
+
+def _relative(a: torch.Tensor, ref: torch.Tensor) -> float:
+    return ((a - ref).abs().amax() / ref.abs().amax()).item()
+
+
+def _reference(order: int, sigma: float, lambda_min: float, lambda_max: float):
+    return _probe(order, sigma, "composite_gauss", REFERENCE_SAMPLES, lambda_min, lambda_max)
+
+
+def quadrature_error(
+    order: int,
+    sigma: float,
+    rule: str,
+    samples: int,
+    lambda_min: float,
+    lambda_max: float,
+    reference=None
+) -> Tuple[float, float]:
+    """Returns (gram_error, projection_error) of one rule at one sample count."""
+    if reference is None:
+        reference = _reference(order, sigma, lambda_min, lambda_max)
+
+    G_ref, b_ref = reference
+    G, b = _probe(order, sigma, rule, samples, lambda_min, lambda_max)
+
+    proj = max(_relative(b[c], b_ref[c]) for c in range(b.shape[0]))
+    return _relative(G, G_ref), proj
+
+
+# ============================================================
+# SEARCH
+# ============================================================
+
+def _valid_samples(rule: str, n: int) -> int:
+    """Smallest sample count ≥ n the rule accepts."""
+    if rule == "composite_gauss":
+        return -(-n // PANEL_POINTS) * PANEL_POINTS
+    if rule == "simpson":
+        return n if n % 2 == 1 else n + 1
+    return n
+
+
+def min_samples(
+    order: int,
+    sigma: float,
+    rule: str,
+    tol: float,
+    lambda_min: float,
+    lambda_max: float,
+    reference=None
+) -> Optional[dict]:
+    """
+    Doubles the sample count from MIN_SAMPLES until both errors are
+    within tol, then bisects the last bracket down to SAMPLE_RESOLUTION.
+    Assumes the error falls monotonically with the sample count, which
+    holds for all four rules once the node spacing resolves σ.
+
+    Returns {"samples", "gram_error", "projection_error"} or None if
+    MAX_SAMPLES is not enough.
+    """
+    if reference is None:
+        reference = _reference(order, sigma, lambda_min, lambda_max)
+
+    def check(n):
+        n = _valid_samples(rule, n)
+        errs = quadrature_error(order, sigma, rule, n, lambda_min, lambda_max, reference)
+        return n, errs, max(errs) <= tol
+
+    lo, hi, best = None, MIN_SAMPLES, None
+    while hi <= MAX_SAMPLES:
+        n, errs, ok = check(hi)
+        if ok:
+            best = (n, errs)
+            break
+        lo, hi = hi, 2 * hi
+
+    if best is None:
+        return None
+
+    while lo is not None and best[0] - lo > SAMPLE_RESOLUTION:
+        mid = (lo + best[0]) // 2
+        n, errs, ok = check(mid)
+        if ok and n < best[0]:
+            best = (n, errs)
+        else:
+            lo = mid
+
+    return {"samples": best[0], "gram_error": best[1][0], "projection_error": best[1][1]}
+
+
+# ============================================================
+# CACHE
+# ============================================================
+
+_cache: Optional[Dict[str, dict]] = None
+
+
+def _load_cache(path: str) -> Dict[str, dict]:
+    global _cache
+    if _cache is None:
+        _cache = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                _cache = json.load(f)
+    return _cache
+
+
+def _save_cache(path: str):
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(_cache, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def config_class(
+    order: int,
+    sigma_min: float,
+    tol: float,
+    lambda_min: float,
+    lambda_max: float,
+    rules: Iterable[str] = CANDIDATE_RULES,
+    points_per_panel: int = PANEL_POINTS
+) -> str:
+    """
+    Cache key; the candidate rules and the panel size are part of it so
+    a narrower rule set never reads a wider set's winner, and a new
+    PANEL_POINTS never reads counts tuned for another panel size.
+    """
+    sigma = SIGMA_STEP * (float(sigma_min) // SIGMA_STEP)
+    return (f"order={int(order)}|sigma={sigma:g}|tol={tol:g}|domain={lambda_min:g}-{lambda_max:g}"
+            f"|rules={','.join(sorted(set(rules)))}|panel={int(points_per_panel)}")
+
+
+def tune_quadrature(
+    order: int,
+    sigma_min: float,
+    tol: float,
+    lambda_min: float,
+    lambda_max: float,
+    rules: Iterable[str] = CANDIDATE_RULES,
+    cache_path: Optional[str] = CACHE_PATH
+) -> dict:
+    """
+    Cheapest (rule, samples) for the class of (order, sigma_min) within
+    tol, tuned once and then read from the cache.
+
+    Returns {"rule", "samples", "points_per_panel", "gram_error",
+    "projection_error", "per_rule": {rule: samples or None}}; build the
+    domain with points_per_panel when the rule is composite_gauss.
+    """
+    rules = list(rules)
+    key   = config_class(order, sigma_min, tol, lambda_min, lambda_max, rules, PANEL_POINTS)
+    cache = _load_cache(cache_path) if cache_path is not None else {}
+
+    if key in cache:
+        return cache[key]
+
+    sigma     = SIGMA_STEP * (float(sigma_min) // SIGMA_STEP)
+    reference = _reference(int(order), sigma, lambda_min, lambda_max)
+
+    per_rule = {}
+    best     = None
+    for rule in rules:
+        found = min_samples(int(order), sigma, rule, tol, lambda_min, lambda_max, reference)
+        per_rule[rule] = None if found is None else found["samples"]
+        if found is not None and (best is None or found["samples"] < best["samples"]):
+            best = {"rule": rule, **found}
+
+    if best is None:
+        raise ValueError(f"No rule converges to {tol:g} within {MAX_SAMPLES} samples for {key}")
+
+    best["per_rule"]         = per_rule
+    best["points_per_panel"] = PANEL_POINTS
+
+    if cache_path is not None:
+        cache[key] = best
+        _save_cache(cache_path)
+
+    return best
+
+
+# ============================================================
+# DRIVER
+# ============================================================
+
+def run_tuner(tol: float = 1e-12, lambda_min: float = 380.0, lambda_max: float = 830.0):
+    """Tunes every (order, sigma_min) class of the phase 1 sweep."""
+
+    torch.set_grad_enabled(False)
+
+    orders = range(4, 13)
+    sigmas = torch.arange(6.0, 12.0, SIGMA_STEP).tolist()
+
+    print(f"Quadrature tuner  (tol {tol:g}, {lambda_min:g}-{lambda_max:g} nm)")
+    print(f"  {'order':>5} {'sigma':>6}  {'rule':<16}{'samples':>8}  per rule")
+
+    for order, sigma in itertools.product(orders, sigmas):
+        best = tune_quadrature(order, sigma, tol, lambda_min, lambda_max)
+        per_rule = "  ".join(f"{r}={n}" for r, n in best["per_rule"].items())
+        print(f"  {order:>5} {sigma:>6g}  {best['rule']:<16}{best['samples']:>8}  {per_rule}")
+
+    print(f"  Cache           : {CACHE_PATH}")
+
+
+if __name__ == "__main__":
+    run_tuner()
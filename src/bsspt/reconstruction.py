@@ -0,0 +1,155 @@
+# ============================================================
+# Reconstruction Metrics
+# Projection / reconstruction error of a batch of spectra through
+# one basis, every metric for every spectrum in one pass, plus a
+# sweep driver that runs the stress cases over a grid of bases and
+# writes one Parquet table.
+# ============================================================
+
+import itertools
+from typing import TYPE_CHECKING, Iterable, Optional
+
+import torch
+from torch import Tensor
+
+from engine.spectraldomain import SpectralDomain
+from engine.ghgsfbasisscaled import GHGSFMultiLobeBasisScaled
+from stress_cases import stack_cases
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+# Columns of evaluate_reconstruction's output, in order
+RECONSTRUCTION_METRICS = [
+    "l2_error",          # sqrt(∫ (S - R)² dλ)
+    "linf_error",        # max |S - R|
+    "energy_error",      # |∫ S dλ - ∫ R dλ|
+    "max_alpha",         # max |α|
+    "max_alpha_white",   # max |α̃|,  α̃ = Lᵀ α
+    "norm_alpha",        # ‖α‖
+    "norm_alpha_white",  # ‖α̃‖ = ‖α‖_G
+]
+
+
+def evaluate_reconstruction(basis, spectra: Tensor, return_recon: bool = False):
+    """
+    spectra : [S, L] sampled on basis.m_domain
+
+    Projects and reconstructs all spectra with one Gram solve and one
+    matmul, then reduces every metric along L.
+
+    Returns
+    -------
+    Tensor [S, len(RECONSTRUCTION_METRICS)], and with return_recon the
+    reconstructions [S, L] as a second value
+    """
+    B = basis.m_basisRaw
+    w = basis.m_domain.m_weights
+
+    spectra = spectra.to(device=B.device, dtype=B.dtype)
+
+    alpha       = basis.projectBatch(spectra)     # [S, M]
+    recon       = alpha @ B                       # [S, L]
+    alpha_white = alpha @ basis.m_chol            # (Lᵀ αᵀ)ᵀ
+
+    diff = spectra - recon
+
+    metrics = torch.stack([
+        torch.sqrt(diff.square() @ w),
+        diff.abs().amax(dim=1),
+        (spectra @ w - recon @ w).abs(),
+        alpha.abs().amax(dim=1),
+        alpha_white.abs().amax(dim=1),
+        torch.linalg.norm(alpha, dim=1),
+        torch.linalg.norm(alpha_white, dim=1),
+    ], dim=1)
+
+    return (metrics, recon) if return_recon else metrics
+
+
+# ============================================================
+# STRESS SWEEP
+# ============================================================
+
+LAMBDA_MIN     = 400.0
+LAMBDA_MAX     = 700.0
+LAMBDA_SAMPLES = 256
+
+SIGMA_MIN = 5.0
+SIGMA_MAX = 9.0
+
+SWEEP_ORDERS = range(4, 13)
+SWEEP_LOBES  = range(4, 13)
+
+CENTER_MIN = 420.0
+CENTER_MAX = 680.0
+
+OUTPUT_PATH = "stress_sweep.parquet"
+
+
+def run_stress_sweep(
+    orders: Iterable[int] = SWEEP_ORDERS,
+    lobes: Iterable[int] = SWEEP_LOBES,
+    device: Optional[torch.device] = None,
+    dtype: torch.dtype = torch.float64,
+    output_path: Optional[str] = OUTPUT_PATH
+) -> "pd.DataFrame":
+    """
+    One row per (order, lobes, case): basis size, Gram condition number
+    and every RECONSTRUCTION_METRICS column. Bases that fail to factor
+    are recorded with their error and NaN metrics.
+    """
+    import pandas as pd
+
+    torch.set_grad_enabled(False)
+
+    if device is None:
+        device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+
+    domain = SpectralDomain(LAMBDA_MIN, LAMBDA_MAX, LAMBDA_SAMPLES, device=device, dtype=dtype)
+    names, spectra = stack_cases(domain)
+
+    frames = []
+
+    for order, n_lobes in itertools.product(orders, lobes):
+
+        centers = torch.linspace(CENTER_MIN, CENTER_MAX, n_lobes).tolist()
+
+        frame = pd.DataFrame({"order": order, "lobes": n_lobes, "case": names})
+
+        try:
+            basis = GHGSFMultiLobeBasisScaled(
+                domain=domain,
+                centers=centers,
+                sigma_min=SIGMA_MIN,
+                sigma_max=SIGMA_MAX,
+                order=order
+            )
+            eig     = torch.linalg.eigvalsh(basis.m_gram)
+            metrics = evaluate_reconstruction(basis, spectra).cpu().numpy()
+
+            frame["basis_size"] = basis.m_M
+            frame["condition"]  = (eig[-1] / eig[0]).item()
+            frame[RECONSTRUCTION_METRICS] = metrics
+            frame["error_msg"]  = None
+
+        except Exception as exc:
+            frame["basis_size"] = n_lobes * order
+            frame["condition"]  = float("nan")
+            frame[RECONSTRUCTION_METRICS] = float("nan")
+            frame["error_msg"]  = f"{type(exc).__name__}: {exc}"
+
+        frames.append(frame)
+
+    df = pd.concat(frames, ignore_index=True)
+
+    if output_path is not None:
+        df.to_parquet(output_path, engine="pyarrow", compression="zstd", index=False)
+
+    return df
+
+
+if __name__ == "__main__":
+    df = run_stress_sweep()
+    print(df.groupby("case")[["l2_error", "linf_error", "energy_error"]].median())
@@ -1,7 +1,7 @@
 import numpy as np
-import pandas as pd
 
-from plotting.Plot import SurfaceEngine
+from plotting.Plot import SurfaceEngine, FigureBatch
+from aggregate import aggregate_parquet, top_rows
 
 
 # -------------------------------------------------
@@ -10,112 +10,116 @@ from plotting.Plot import SurfaceEngine
 
 DATA_PATH = "datasets/stability_dataset.parquet"
 
-
-print("Loading dataset...")
-df = pd.read_parquet(DATA_PATH)
-
-print(f"Total rows: {len(df):,}")
+# Batch rendering: write figures here instead of showing them (None = interactive)
+OUTPUT_DIR = None                      # e.g. "figures/scores"
+RENDER_WORKERS = None                  # None = CPU count
 
 
 # -------------------------------------------------
-# FILTER BAD CONFIGS
+# FIGURE
 # -------------------------------------------------
 
-df = df[df["spd_fail_flag"] == 0]
+def stability_surface(family, X, Y, Z):
 
-print(f"Rows after SPD filter: {len(df):,}")
+    engine = SurfaceEngine(figsize=(10, 8))
 
+    engine.setTitle(f"GHGSF Stability Landscape | Family {family}")
 
-# -------------------------------------------------
-# BUILD STABILITY SCORE
-# -------------------------------------------------
+    engine.addSurface(X, Y, Z)
 
-safe_lambda = df["lambda_min"].clip(lower=1e-20)
+    engine.setLabels(
+        "Lobes (K)",
+        "Polynomial Order",
+        "Stability Score"
+    )
 
-df["log_lambda_min"] = np.log10(safe_lambda)
+    engine.setView(elev=35, azim=50)
 
-df["stability_score"] = -df["log10_condition"]
+    return engine
 
-# -------------------------------------------------
-# AGGREGATE OVER HIDDEN AXES
-# -------------------------------------------------
 
-agg = (
-    df.groupby(["family_id", "K", "order"])
-    .agg({
-        "stability_score": "mean"
-    })
-    .reset_index()
-)
+def run_scores():
 
-print("Aggregation complete")
+    # -------------------------------------------------
+    # AGGREGATE OVER HIDDEN AXES
+    # Single pass, SPD failures filtered in the scan;
+    # stability_score = -log10_condition, so its mean is -mean
+    # -------------------------------------------------
 
+    print("Aggregating dataset...")
+    agg = aggregate_parquet(
+        DATA_PATH,
+        by=["family_id", "K", "order"],
+        metrics=["log10_condition"],
+        stats=("mean",),
+        filters={"spd_fail_flag": 0}
+    )
 
-# -------------------------------------------------
-# VISUALIZE PER FAMILY
-# -------------------------------------------------
+    agg["stability_score"] = -agg.pop("log10_condition_mean")
 
-families = sorted(agg["family_id"].unique())
+    print("Aggregation complete")
 
+    # -------------------------------------------------
+    # VISUALIZE PER FAMILY
+    # -------------------------------------------------
 
-for family in families:
+    families = sorted(agg["family_id"].unique())
 
-    print(f"\nRendering family {family}")
+    batch = FigureBatch(OUTPUT_DIR, workers=RENDER_WORKERS)
 
-    family_df = agg[agg["family_id"] == family]
+    for family in families:
 
-    pivot = family_df.pivot(
-        index="order",
-        columns="K",
-        values="stability_score"
-    )
+        print(f"\nRendering family {family}")
 
-    pivot = pivot.sort_index().sort_index(axis=1)
+        family_df = agg[agg["family_id"] == family]
 
-    K_vals = pivot.columns.values
-    order_vals = pivot.index.values
+        pivot = family_df.pivot(
+            index="order",
+            columns="K",
+            values="stability_score"
+        )
 
-    X, Y = np.meshgrid(K_vals, order_vals)
-    Z = pivot.values
+        pivot = pivot.sort_index().sort_index(axis=1)
 
+        K_vals = pivot.columns.values
+        order_vals = pivot.index.values
 
-    # -------------------------------------------------
-    # PLOT
-    # -------------------------------------------------
+        X, Y = np.meshgrid(K_vals, order_vals)
+        Z = pivot.values
 
-    engine = SurfaceEngine(figsize=(10, 8))
+        batch.add(f"stability_surface_family_{family}", stability_surface, family, X, Y, Z)
 
-    engine.setTitle(f"GHGSF Stability Landscape | Family {family}")
+    batch.render()
 
-    engine.addSurface(X, Y, Z)
+    # -------------------------------------------------
+    # PRINT BEST CONFIGS
+    # -------------------------------------------------
 
-    engine.setLabels(
-        "Lobes (K)",
-        "Polynomial Order",
-        "Stability Score"
+    # Highest stability_score = lowest log10_condition
+    best = top_rows(
+        DATA_PATH,
+        "log10_condition",
+        20,
+        columns=["family_id", "K", "order", "lambda_min", "spectral_entropy"],
+        filters={"spd_fail_flag": 0},
+        ascending=True
     )
 
-    engine.setView(elev=35, azim=50)
-
-    engine.show()
-    engine.close()
-
-
-# -------------------------------------------------
-# PRINT BEST CONFIGS
-# -------------------------------------------------
+    best["stability_score"] = -best["log10_condition"]
+
+    print("\nTop 20 configurations:")
+    print(
+        best[[
+            "family_id",
+            "K",
+            "order",
+            "stability_score",
+            "log10_condition",
+            "lambda_min",
+            "spectral_entropy"
+        ]]
+    )
 
-best = df.sort_values("stability_score", ascending=False).head(20)
 
-print("\nTop 20 configurations:")
-print(
-    best[[
-        "family_id",
-        "K",
-        "order",
-        "stability_score",
-        "log10_condition",
-        "lambda_min",
-        "spectral_entropy"
-    ]]
-)
\ No newline at end of file
+if __name__ == "__main__":
+    run_scores()
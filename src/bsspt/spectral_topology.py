@@ -1,27 +1,61 @@
 # ============================================================
 # Spectral Topology Family Generators
+#
+# Every family is a batched tensor function of
+#   j     [1, Kmax]  lobe index
+#   K     [F, 1]     lobe count per row
+# returning centers [F, Kmax]; entries with j >= K are padding.
+# generate_topology_batch evaluates many (family, K) pairs at once;
+# the per-family functions and generate_topology are the F = 1 case
+# and return Python lists as before.
+#
+# Ids from NUM_FAMILIES up are custom families (e.g. topologies found
+# by topology_search.py), stored as registered placements per K.
 # ============================================================
 
+import json
 import torch
-from typing import List
+from torch import Tensor
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 
 L_MIN_DEFAULT = 380.0
 L_MAX_DEFAULT = 780.0
 
+NUM_FAMILIES = 5
+
+
+# ============================================================
+# Batched linspace
+# Same arithmetic as torch.linspace: forward from start for the
+# first half, backward from end for the second, each point one
+# fused multiply-add. Narrower dtypes emulate the FMA by rounding
+# once from float64, so F = 1 in float32 matches the old
+# per-family torch.linspace calls bit for bit.
+# ============================================================
+
+def _linspace(start, end, steps: Tensor, j: Tensor, dtype: torch.dtype) -> Tensor:
+
+    start = torch.as_tensor(start, dtype=dtype, device=steps.device)
+    end   = torch.as_tensor(end,   dtype=dtype, device=steps.device)
+    step  = (end - start) / (steps - 1).clamp_min(1).to(dtype)
+
+    wide = torch.float64
+    out = torch.where(
+        j < steps // 2,
+        start.to(wide) + step.to(wide) * j,
+        end.to(wide) - step.to(wide) * (steps - 1 - j)
+    ).to(dtype)
+
+    return torch.where(steps == 1, start, out)
+
 
 # ============================================================
 # 1. Uniform
 # Even spacing across full domain
 # ============================================================
 
-def topology_uniform(
-    K: int,
-    lambda_min: float = L_MIN_DEFAULT,
-    lambda_max: float = L_MAX_DEFAULT
-) -> List[float]:
-
-    centers = torch.linspace(lambda_min, lambda_max, K)
-    return centers.tolist()
+def _uniform(j, K, lambda_min, lambda_max, dtype):
+    return _linspace(lambda_min, lambda_max, K, j, dtype)
 
 
 # ============================================================
@@ -29,50 +63,42 @@ def topology_uniform(
 # Warped using cosine compression toward center
 # ============================================================
 
-def topology_bell(
-    K: int,
-    lambda_min: float = L_MIN_DEFAULT,
-    lambda_max: float = L_MAX_DEFAULT
-) -> List[float]:
-
-    t = torch.linspace(0.0, 1.0, K)
+def _bell(j, K, lambda_min, lambda_max, dtype):
+    t = _linspace(0.0, 1.0, K, j, dtype)
     warped = 0.5 * (1.0 - torch.cos(torch.pi * t))
-    centers = lambda_min + warped * (lambda_max - lambda_min)
-    return centers.tolist()
+    return lambda_min + warped * (lambda_max - lambda_min)
 
 
 # ============================================================
 # 3. Tristimulus (RGB Anchored)
 # 3 primary regions around 450 / 550 / 650 nm
+#
+# Bands get K // 3 lobes each, the first K % 3 bands one extra;
+# a band of one lobe sits on its anchor, larger bands spread
+# evenly over ±20 nm.
 # ============================================================
 
-def topology_tristimulus(
-    K: int,
-    lambda_min: float = L_MIN_DEFAULT,
-    lambda_max: float = L_MAX_DEFAULT
-) -> List[float]:
+TRISTIMULUS_ANCHORS = (450.0, 550.0, 650.0)
+TRISTIMULUS_SPREAD  = 40.0
 
-    anchors = torch.tensor([450.0, 550.0, 650.0])
 
-    if K <= 3:
-        return anchors[:K].tolist()
+def _tristimulus(j, K, lambda_min, lambda_max, dtype):
 
-    per_band = K // 3
-    remainder = K % 3
+    anchors = torch.tensor(TRISTIMULUS_ANCHORS, dtype=dtype, device=K.device)
 
-    centers = []
+    band_idx = torch.arange(3, device=K.device)
+    counts   = K // 3 + (band_idx < K % 3).to(K.dtype)              # [F, 3]
+    starts   = torch.cumsum(counts, dim=1) - counts                  # [F, 3]
 
-    for i in range(3):
-        count = per_band + (1 if i < remainder else 0)
+    band  = (j >= starts[:, 1:2]).long() + (j >= starts[:, 2:3]).long()
+    count = counts.gather(1, band)                                   # [F, Kmax]
+    local = j - starts.gather(1, band)
 
-        if count == 1:
-            centers.append(anchors[i].item())
-        else:
-            spread = 40.0
-            local = torch.linspace(-spread/2, spread/2, count)
-            centers.extend((anchors[i] + local).tolist())
+    offset = _linspace(
+        -TRISTIMULUS_SPREAD / 2, TRISTIMULUS_SPREAD / 2, count, local, dtype
+    )
 
-    return centers[:K]
+    return anchors[band] + torch.where(count == 1, torch.zeros_like(offset), offset)
 
 
 # ============================================================
@@ -80,16 +106,10 @@ def topology_tristimulus(
 # Inverse bell mapping
 # ============================================================
 
-def topology_valley(
-    K: int,
-    lambda_min: float = L_MIN_DEFAULT,
-    lambda_max: float = L_MAX_DEFAULT
-) -> List[float]:
-
-    t = torch.linspace(0.0, 1.0, K)
+def _valley(j, K, lambda_min, lambda_max, dtype):
+    t = _linspace(0.0, 1.0, K, j, dtype)
     warped = torch.sin(torch.pi * t / 2.0) ** 2
-    centers = lambda_min + warped * (lambda_max - lambda_min)
-    return centers.tolist()
+    return lambda_min + warped * (lambda_max - lambda_min)
 
 
 # ============================================================
@@ -97,51 +117,209 @@ def topology_valley(
 # Uniform base + alternating perturbation
 # ============================================================
 
-def topology_sawblade(
-    K: int,
+def _sawblade(j, K, lambda_min, lambda_max, dtype):
+    base    = _linspace(lambda_min, lambda_max, K, j, dtype)
+    perturb = ((lambda_max - lambda_min) / (4.0 * K.to(torch.float64))).to(dtype)
+    sign    = torch.where(j % 2 == 0, -1.0, 1.0).to(dtype)
+    return torch.clamp(base + sign * perturb, lambda_min, lambda_max)
+
+
+_FAMILIES = (_uniform, _bell, _tristimulus, _valley, _sawblade)
+
+
+# ============================================================
+# Custom families (ids >= NUM_FAMILIES)
+# One placement per K, stored normalized to t ∈ [0, 1] of the
+# range it was registered for and mapped onto the requested
+# [lambda_min, lambda_max] like the built-ins.
+# ============================================================
+
+_CUSTOM: Dict[int, Dict[int, List[float]]] = {}
+
+
+def register_topology(
+    centers_by_K: Dict[int, Sequence[float]],
     lambda_min: float = L_MIN_DEFAULT,
-    lambda_max: float = L_MAX_DEFAULT
-) -> List[float]:
+    lambda_max: float = L_MAX_DEFAULT,
+    topology_id: Optional[int] = None
+) -> int:
+    """
+    Adds (or replaces) a custom family; returns its topology_id.
+    Without topology_id the next free id is used.
+    """
+    if topology_id is None:
+        topology_id = max(_CUSTOM, default=NUM_FAMILIES - 1) + 1
+    if topology_id < NUM_FAMILIES:
+        raise ValueError(f"Custom topology ids start at {NUM_FAMILIES}")
+
+    span = lambda_max - lambda_min
+    _CUSTOM[int(topology_id)] = {
+        int(K): [(float(c) - lambda_min) / span for c in centers]
+        for K, centers in centers_by_K.items()
+    }
+    for K, t in _CUSTOM[int(topology_id)].items():
+        if len(t) != K:
+            raise ValueError(f"Custom topology {topology_id}: K={K} has {len(t)} centers")
+
+    return int(topology_id)
+
+
+def save_custom_topologies(path: str):
+    with open(path, "w") as f:
+        json.dump({str(i): {str(K): t for K, t in fam.items()} for i, fam in _CUSTOM.items()}, f, indent=2)
+
+
+def load_custom_topologies(path: str) -> List[int]:
+    """Registers every family in a save_custom_topologies file; returns their ids."""
+    with open(path) as f:
+        data = json.load(f)
+
+    for i, fam in data.items():
+        _CUSTOM[int(i)] = {int(K): [float(x) for x in t] for K, t in fam.items()}
+
+    return sorted(int(i) for i in data)
+
 
-    base = torch.linspace(lambda_min, lambda_max, K)
-    perturb = (lambda_max - lambda_min) / (4.0 * K)
+def _custom(ids: Tensor, j: Tensor, K: Tensor, lambda_min, lambda_max, dtype) -> Tensor:
+    """[F, Kmax] centers of custom rows (NaN elsewhere and where K is not registered)."""
+    custom_ids = sorted(_CUSTOM)
+    width      = max((k for fam in _CUSTOM.values() for k in fam), default=0)
 
-    for i in range(K):
-        if i % 2 == 0:
-            base[i] -= perturb
-        else:
-            base[i] += perturb
+    # table[c, K, j] = t_j of family custom_ids[c] at lobe count K
+    table = torch.full((len(custom_ids), width + 1, max(width, 1)), float("nan"), dtype=torch.float64)
+    for c, i in enumerate(custom_ids):
+        for k, t in _CUSTOM[i].items():
+            table[c, k, :k] = torch.tensor(t, dtype=torch.float64)
+    table = table.to(device=K.device, dtype=dtype)
 
-    base = torch.clamp(base, lambda_min, lambda_max)
+    lookup = torch.full((max(custom_ids) + 1,), 0, dtype=torch.int64)
+    lookup[custom_ids] = torch.arange(len(custom_ids))
+    row = lookup.to(K.device)[ids.clamp(NUM_FAMILIES, max(custom_ids))]      # [F, 1]
 
-    return base.tolist()
+    inside = (K <= width) & (j < width)
+    t = table[row, K.clamp_max(width), j.clamp_max(max(width, 1) - 1)]
+    t = torch.where(inside, t, torch.full_like(t, float("nan")))
+
+    return lambda_min + t * (lambda_max - lambda_min)
 
 
 # ============================================================
-# Dispatcher
+# Batched dispatcher
 # ============================================================
 
-def generate_topology(
-    topology_id: int,
+def generate_topology_batch(
+    topology_ids: Union[Sequence[int], Tensor],
+    Ks: Union[Sequence[int], Tensor],
+    lambda_min: float = L_MIN_DEFAULT,
+    lambda_max: float = L_MAX_DEFAULT,
+    device: Optional[torch.device] = None,
+    dtype: Optional[torch.dtype] = None
+) -> Tuple[Tensor, Tensor]:
+    """
+    Centers for F (family, K) pairs in one pass.
+
+    Every family is evaluated over the whole [F, Kmax] grid and the
+    row's own family is selected with a gather — five cheap
+    elementwise passes instead of a Python loop over rows.
+
+    Returns
+    -------
+    centers : Tensor [F, Kmax], padding entries are NaN
+    mask : BoolTensor [F, Kmax], True where j < K
+    """
+    if dtype is None:
+        dtype = torch.get_default_dtype()
+
+    ids = torch.as_tensor(topology_ids, dtype=torch.int64, device=device).reshape(-1, 1)
+    K   = torch.as_tensor(Ks, dtype=torch.int64, device=device).reshape(-1, 1)
+
+    is_custom = ids >= NUM_FAMILIES
+    if ids.numel():
+        unknown = set(ids[is_custom].unique().tolist()) - set(_CUSTOM)
+        if ids.min() < 0 or unknown:
+            raise ValueError(
+                f"Invalid topology_id (must be 0–{NUM_FAMILIES - 1} or a registered custom id)"
+            )
+
+    Kmax = int(K.max()) if K.numel() else 0
+    j    = torch.arange(Kmax, device=K.device).unsqueeze(0)          # [1, Kmax]
+    mask = j < K
+
+    every = torch.stack([
+        family(j, K, lambda_min, lambda_max, dtype) for family in _FAMILIES
+    ])                                                               # [5, F, Kmax]
+
+    builtin = ids.clamp_max(NUM_FAMILIES - 1)
+    centers = every.gather(0, builtin.expand(-1, Kmax).unsqueeze(0))[0]
+
+    if bool(is_custom.any()):
+        custom  = _custom(ids, j, K, lambda_min, lambda_max, dtype)
+        centers = torch.where(is_custom, custom, centers)
+
+        if bool((custom.isnan() & mask & is_custom).any()):
+            raise ValueError("Custom topology not registered for one of the requested K")
+
+    return centers.masked_fill(~mask, float("nan")), mask
+
+
+def unpad_topologies(centers: Tensor, mask: Tensor) -> Tuple[Tensor, ...]:
+    """Ragged view of a padded batch — one [K_f] tensor per row."""
+    return torch.split(centers[mask], mask.sum(dim=1).tolist())
+
+
+# ============================================================
+# Single-topology API (F = 1)
+# ============================================================
+
+def _single(topology_id: int, K: int, lambda_min: float, lambda_max: float) -> List[float]:
+    centers, _ = generate_topology_batch([topology_id], [K], lambda_min, lambda_max)
+    return centers[0].tolist()
+
+
+def topology_uniform(
+    K: int,
+    lambda_min: float = L_MIN_DEFAULT,
+    lambda_max: float = L_MAX_DEFAULT
+) -> List[float]:
+    return _single(0, K, lambda_min, lambda_max)
+
+
+def topology_bell(
     K: int,
     lambda_min: float = L_MIN_DEFAULT,
     lambda_max: float = L_MAX_DEFAULT
 ) -> List[float]:
+    return _single(1, K, lambda_min, lambda_max)
 
-    if topology_id == 0:
-        return topology_uniform(K, lambda_min, lambda_max)
 
-    elif topology_id == 1:
-        return topology_bell(K, lambda_min, lambda_max)
+def topology_tristimulus(
+    K: int,
+    lambda_min: float = L_MIN_DEFAULT,
+    lambda_max: float = L_MAX_DEFAULT
+) -> List[float]:
+    return _single(2, K, lambda_min, lambda_max)
 
-    elif topology_id == 2:
-        return topology_tristimulus(K, lambda_min, lambda_max)
 
-    elif topology_id == 3:
-        return topology_valley(K, lambda_min, lambda_max)
+def topology_valley(
+    K: int,
+    lambda_min: float = L_MIN_DEFAULT,
+    lambda_max: float = L_MAX_DEFAULT
+) -> List[float]:
+    return _single(3, K, lambda_min, lambda_max)
 
-    elif topology_id == 4:
-        return topology_sawblade(K, lambda_min, lambda_max)
 
-    else:
-        raise ValueError("Invalid topology_id (must be 0–4)")
+def topology_sawblade(
+    K: int,
+    lambda_min: float = L_MIN_DEFAULT,
+    lambda_max: float = L_MAX_DEFAULT
+) -> List[float]:
+    return _single(4, K, lambda_min, lambda_max)
+
+
+def generate_topology(
+    topology_id: int,
+    K: int,
+    lambda_min: float = L_MIN_DEFAULT,
+    lambda_max: float = L_MAX_DEFAULT
+) -> List[float]:
+    return _single(topology_id, K, lambda_min, lambda_max)
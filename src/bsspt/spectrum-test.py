@@ -4,196 +4,145 @@ import numpy as np
 from engine.ghgsfbasisscaled import GHGSFMultiLobeBasisScaled
 from engine.spectraldomain import SpectralDomain
 from engine.ghgsfbasis import GHGSFMultiLobeBasis
-from engine.spectralstate import SpectralState
-from engine.whitening import WhitenOperator
+from stress_cases import build_cases
+from reconstruction import evaluate_reconstruction
 
-from plotting.Plot import MultiPanelEngine
+from plotting.Plot import MultiPanelEngine, FigureBatch
 
 
 # ============================================================
-# Domain
+# Stress Sweep Settings
 # ============================================================
 
-domain = SpectralDomain(
-    lambdaMin=400.0,
-    lambdaMax=700.0,
-    numSamples=256,
-    device=torch.device("cuda"),
-    dtype=torch.float64
-)
-
-lbd = domain.m_lambda
-
-
-# ============================================================
-# Utility
-# ============================================================
+sigma_min = 5
+sigma_max = 9
+orders = range(6, 9)
+lobe_counts = range(6, 9)
 
-def normalize(S):
-    return S / domain.integrate(torch.abs(S))
+# Batch rendering: write figures here instead of showing them (None = interactive)
+OUTPUT_DIR = None                      # e.g. "figures/stress"
+RENDER_WORKERS = None                  # None = CPU count
 
 
 # ============================================================
-# Real Spectral Cases
+# Figure
 # ============================================================
 
-def d65(l):
-    return (
-        torch.exp(-0.5 * ((l - 445.0) / 40.0)**2) +
-        0.9 * torch.exp(-0.5 * ((l - 540.0) / 50.0)**2) +
-        0.6 * torch.exp(-0.5 * ((l - 610.0) / 60.0)**2)
-    )
+def stress_figure(n_lobes, order, cond, lam, panels):
+    """panels: (name, original, reconstruction, metrics) per stress case"""
 
-def leds(l):
-    return (
-        1.2 * torch.exp(-0.5 * ((l - 450.0) / 6.0)**2) +
-        1.0 * torch.exp(-0.5 * ((l - 530.0) / 5.0)**2) +
-        0.9 * torch.exp(-0.5 * ((l - 625.0) / 7.0)**2)
+    engine = MultiPanelEngine(
+        nrows=3,
+        ncols=2,
+        figsize=(14, 12),
+        compact=True
     )
 
-def blackbody(l, T=6500.0):
-    c2 = 1.4388e7
-    return (l**-5) / (torch.exp(c2 / (l * T)) - 1.0)
-
-def step_spectrum(l):
-    return torch.where(l < 550.0, 1.0, 0.25)
-
-def laser_spike(l):
-    return torch.exp(-0.5 * ((l - 532.0) / 1.0)**2)
-
-def comb_spectrum(l):
-    centers = torch.linspace(420.0, 680.0, 12, device=l.device, dtype=l.dtype)
-    S = torch.zeros_like(l)
-    for c in centers:
-        S += torch.exp(-0.5 * ((l - c) / 1.5)**2)
-    return S
+    for i, (name, S_cpu, R_cpu, metrics) in enumerate(panels):
 
+        (
+            L2, Linf, energy_err,
+            max_alpha_raw, max_alpha_white,
+            norm_raw, norm_white
+        ) = metrics
 
-cases = {
-    "D65": normalize(d65(lbd)),
-    "LED": normalize(leds(lbd)),
-    "Blackbody": normalize(blackbody(lbd)),
-    "Step": normalize(step_spectrum(lbd)),
-    "Laser": normalize(laser_spike(lbd)),
-    "Comb": normalize(comb_spectrum(lbd)),
-}
+        panel = engine.getPanel(i)
 
+        panel.addLine(lam, S_cpu, linewidth=2.2, label="Original")
+        panel.addLine(lam, R_cpu, linestyle="--", linewidth=2.0, label="Reconstruction")
 
-# ============================================================
-# Stress Sweep
-# ============================================================
-
-sigma_min = 5
-sigma_max = 9
-orders = range(6, 9)
-lobe_counts = range(6, 9)
+        panel.setTitle(name)
+        panel.setLabels("Wavelength (nm)", "Power")
 
-for order in orders:
-    for n_lobes in lobe_counts:
+        panel.annotateMetricsBlock({
+            "L2": f"{L2:.2e}",
+            "L∞": f"{Linf:.2e}",
+            "ΔE": f"{energy_err:.2e}",
+            "max|α|": f"{max_alpha_raw:.2e}",
+            "max|α̃|": f"{max_alpha_white:.2e}",
+            "||α||": f"{norm_raw:.2e}",
+            "||α̃||": f"{norm_white:.2e}"
+        }, position='upper left')
 
-        centers = torch.linspace(420.0, 680.0, n_lobes).tolist()
+    engine.addLegendOnlyFirst()
+    engine.applyDenseLayout()
+    engine.applyPublicationPreset()
 
-        basis = GHGSFMultiLobeBasisScaled(
-            domain=domain,
-            centers=centers,
-            sigma_min=sigma_min,  # narrow capture
-            sigma_max=sigma_max,  # smooth correction
-            order=order
-        )
-
-        cond = torch.linalg.cond(basis.m_gram).item()
-
-        print(f"Running {n_lobes} lobes × order {order} | cond={cond:.2e}")
-
-        engine = MultiPanelEngine(
-            nrows=3,
-            ncols=2,
-            figsize=(14, 12),
-            compact=True
-        )
-
-        # Build whitening operator once per basis
-        W = WhitenOperator.create(basis)
+    engine.setMainTitle(
+        f"GHGSF Stress Test — {n_lobes} lobes × order {order}\n"
+        f"σ = {sigma_min} nm  to {sigma_max} nm| Gram cond = {cond:.2e}"
+    )
 
-        for i, (name, S) in enumerate(cases.items()):
+    return engine
 
-            # ------------------------------------------------
-            # Projection & Reconstruction
-            # ------------------------------------------------
 
-            coeffs = basis.project(S)
-            R = basis.reconstruct(coeffs)
+def run_stress_test():
 
-            # ------------------------------------------------
-            # Raw State
-            # ------------------------------------------------
+    # ============================================================
+    # Domain
+    # ============================================================
 
-            state_raw = SpectralState(basis, coeffs)
+    domain = SpectralDomain(
+        lambdaMin=400.0,
+        lambdaMax=700.0,
+        numSamples=256,
+        device=torch.device("cuda"),
+        dtype=torch.float64
+    )
 
-            # ------------------------------------------------
-            # Whitened State
-            # ------------------------------------------------
+    lam_cpu = domain.m_lambda.detach().cpu().numpy()
 
-            state_white = state_raw.clone()
-            W.apply(state_white)
+    # ============================================================
+    # Stress Cases  (see stress_cases.py)
+    # ============================================================
 
-            alpha_raw = state_raw.m_coeffs
-            alpha_white = state_white.m_coeffs
+    cases = build_cases(domain)
 
-            # ------------------------------------------------
-            # Error Metrics
-            # ------------------------------------------------
+    names   = list(cases)
+    spectra = torch.stack(list(cases.values()))
+    S_cpu   = spectra.detach().cpu().numpy()
 
-            L2 = torch.sqrt(
-                domain.integrate((S - R)**2)
-            ).item()
+    # ============================================================
+    # Stress Sweep
+    # Bases and metrics on the device here; only the numpy curves
+    # travel to the figure builders
+    # ============================================================
 
-            Linf = torch.max(torch.abs(S - R)).item()
+    batch = FigureBatch(OUTPUT_DIR, workers=RENDER_WORKERS)
 
-            energy_err = torch.abs(
-                domain.integrate(S) -
-                domain.integrate(R)
-            ).item()
+    for order in orders:
+        for n_lobes in lobe_counts:
 
-            max_alpha_raw = torch.max(torch.abs(alpha_raw)).item()
-            max_alpha_white = torch.max(torch.abs(alpha_white)).item()
+            centers = torch.linspace(420.0, 680.0, n_lobes).tolist()
 
-            norm_raw = torch.linalg.norm(alpha_raw).item()
-            norm_white = torch.linalg.norm(alpha_white).item()
+            basis = GHGSFMultiLobeBasisScaled(
+                domain=domain,
+                centers=centers,
+                sigma_min=sigma_min,  # narrow capture
+                sigma_max=sigma_max,  # smooth correction
+                order=order
+            )
 
-            # ------------------------------------------------
-            # Plot
-            # ------------------------------------------------
+            cond = torch.linalg.cond(basis.m_gram).item()
 
-            panel = engine.getPanel(i)
+            print(f"Running {n_lobes} lobes × order {order} | cond={cond:.2e}")
 
-            lam_cpu = lbd.detach().cpu().numpy()
-            S_cpu = S.detach().cpu().numpy()
-            R_cpu = R.detach().cpu().numpy()
+            # Every metric for every case in one pass
+            metrics, recons = evaluate_reconstruction(basis, spectra, return_recon=True)
+            metrics = metrics.tolist()
 
-            panel.addLine(lam_cpu, S_cpu, linewidth=2.2, label="Original")
-            panel.addLine(lam_cpu, R_cpu, linestyle="--", linewidth=2.0, label="Reconstruction")
+            R_cpu = recons.detach().cpu().numpy()
 
-            panel.setTitle(name)
-            panel.setLabels("Wavelength (nm)", "Power")
+            panels = [
+                (name, S_cpu[i], R_cpu[i], metrics[i])
+                for i, name in enumerate(names)
+            ]
 
-            panel.annotateMetricsBlock({
-                "L2": f"{L2:.2e}",
-                "L∞": f"{Linf:.2e}",
-                "ΔE": f"{energy_err:.2e}",
-                "max|α|": f"{max_alpha_raw:.2e}",
-                "max|α̃|": f"{max_alpha_white:.2e}",
-                "||α||": f"{norm_raw:.2e}",
-                "||α̃||": f"{norm_white:.2e}"
-            }, position='upper left')
+            batch.add(f"stress_{n_lobes}_lobes_order_{order}", stress_figure,
+                      n_lobes, order, cond, lam_cpu, panels)
 
-        engine.addLegendOnlyFirst()
-        engine.applyDenseLayout()
-        engine.applyPublicationPreset()
+    batch.render()
 
-        engine.setMainTitle(
-            f"GHGSF Stress Test — {n_lobes} lobes × order {order}\n"
-            f"σ = {sigma_min} nm  to {sigma_max} nm| Gram cond = {cond:.2e}"
-        )
 
-        engine.show()
+if __name__ == "__main__":
+    run_stress_test()
@@ -0,0 +1,78 @@
+# ============================================================
+# Stress Spectra
+# Analytic test spectra shared by spectrum-test.py, the
+# reconstruction sweep and precision validation.
+# ============================================================
+
+import torch
+from torch import Tensor
+from typing import Dict, List, Tuple
+
+from engine.spectraldomain import SpectralDomain
+
+
+# ============================================================
+# Real Spectral Cases
+# ============================================================
+
+def d65(l):
+    return (
+        torch.exp(-0.5 * ((l - 445.0) / 40.0)**2) +
+        0.9 * torch.exp(-0.5 * ((l - 540.0) / 50.0)**2) +
+        0.6 * torch.exp(-0.5 * ((l - 610.0) / 60.0)**2)
+    )
+
+def leds(l):
+    return (
+        1.2 * torch.exp(-0.5 * ((l - 450.0) / 6.0)**2) +
+        1.0 * torch.exp(-0.5 * ((l - 530.0) / 5.0)**2) +
+        0.9 * torch.exp(-0.5 * ((l - 625.0) / 7.0)**2)
+    )
+
+def blackbody(l, T=6500.0):
+    c2 = 1.4388e7
+    return (l**-5) / (torch.exp(c2 / (l * T)) - 1.0)
+
+def step_spectrum(l):
+    return torch.where(l < 550.0, 1.0, 0.25).to(l.dtype)
+
+def laser_spike(l):
+    return torch.exp(-0.5 * ((l - 532.0) / 1.0)**2)
+
+def comb_spectrum(l):
+    centers = torch.linspace(420.0, 680.0, 12, device=l.device, dtype=l.dtype)
+    return torch.exp(-0.5 * ((l.unsqueeze(0) - centers.unsqueeze(1)) / 1.5)**2).sum(dim=0)
+
+
+CASES = {
+    "D65":       d65,
+    "LED":       leds,
+    "Blackbody": blackbody,
+    "Step":      step_spectrum,
+    "Laser":     laser_spike,
+    "Comb":      comb_spectrum,
+}
+
+
+# ============================================================
+# Sampling
+# ============================================================
+
+def build_cases(domain: SpectralDomain) -> Dict[str, Tensor]:
+    """
+    Every case sampled on domain.m_lambda, normalized to unit ∫|S| dλ.
+    """
+    lbd = domain.m_lambda
+    out = {}
+    for name, fn in CASES.items():
+        S = fn(lbd)
+        out[name] = S / domain.integrate(torch.abs(S))
+    return out
+
+
+def stack_cases(domain: SpectralDomain) -> Tuple[List[str], Tensor]:
+    """
+    Returns (names, spectra [S, L]) in CASES order.
+    """
+    cases = build_cases(domain)
+    return list(cases), torch.stack(list(cases.values()))
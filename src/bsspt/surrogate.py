@@ -0,0 +1,345 @@
+# ============================================================
+# Stability Surrogate
+# A small MLP ensemble trained on the phase 1 shards that predicts
+# log10_condition and spd_fail_flag straight from CONFIG_COLUMNS,
+# so hypothetical configs can be screened without building a basis.
+#
+# Ensemble: SURROGATE_MEMBERS MLPs stored as stacked weights
+# [E, in, out], so one batched matmul per layer evaluates every
+# member. Members see independent bootstrap minibatches. Their
+# spread is the confidence estimate.
+#
+# family_id is one-hot over the families the model was trained on —
+# the built-ins plus any custom topology ids (>= NUM_FAMILIES) in the
+# shards — kept with the model, plus one "other" column that every
+# family it has not seen falls into.
+#
+# A config still needs the real compute_metrics when
+#   std of predicted log10_condition  > LOGCOND_STD_MAX, or
+#   mean fail probability inside FAIL_BAND, or
+#   predicted log10_condition within BOUNDARY_MARGIN of a
+#   stability threshold (4, 6, 12 — the tf32/fp32/fp64 flags).
+# ============================================================
+
+import glob
+import math
+import time
+from typing import Dict, Optional, Sequence
+
+import torch
+import torch.nn.functional as F
+
+from schema import CONFIG_COLUMNS, METRIC_COLUMNS
+from spectral_topology import NUM_FAMILIES
+
+
+# ============================================================
+# SETTINGS
+# ============================================================
+
+SHARD_GLOB = "phase1_output/phase1_batch_*.pt"
+MODEL_PATH = "surrogate.pt"
+
+SURROGATE_MEMBERS = 5
+HIDDEN            = 32
+
+TRAIN_STEPS   = 3000
+BATCH_SIZE    = 4096
+LEARNING_RATE = 3e-3
+HOLDOUT       = 0.1
+SEED          = 0
+
+LOGCOND_STD_MAX = 0.25
+FAIL_BAND       = (0.05, 0.95)
+BOUNDARY_MARGIN = 0.25
+THRESHOLDS      = (4.0, 6.0, 12.0)
+
+# Rows per forward pass when predicting — small enough that the
+# [E, chunk, HIDDEN] activations stay in cache
+PREDICT_CHUNK = 1 << 14
+
+NUM_SCALINGS = 4
+
+_COL = {c: i for i, c in enumerate(CONFIG_COLUMNS)}
+_LOGCOND = METRIC_COLUMNS.index("log10_condition")
+_FAIL    = METRIC_COLUMNS.index("spd_fail_flag")
+
+NUMERIC_COLUMNS = [
+    "K", "order", "precision_id", "whitened",
+    "wide_min", "wide_max", "narrow_min", "narrow_max",
+]
+
+
+# ============================================================
+# FEATURES
+# ============================================================
+
+BUILTIN_FAMILIES = tuple(range(NUM_FAMILIES))
+
+
+def encode_configs(configs: torch.Tensor, families: Sequence[int] = BUILTIN_FAMILIES) -> torch.Tensor:
+    """
+    configs [n, len(CONFIG_COLUMNS)] → features [n, F]:
+    family one-hot over `families` plus an "other" column, scaling
+    one-hot, the numeric columns and basis_size.
+    """
+    configs = configs.to(torch.float32)
+
+    known   = torch.as_tensor(list(families), dtype=torch.int64)
+    match   = configs[:, _COL["family_id"]].long().unsqueeze(1) == known      # [n, len(families)]
+    family  = torch.cat([match, ~match.any(dim=1, keepdim=True)], dim=1)
+    scaling = F.one_hot(configs[:, _COL["scaling_id"]].long(), NUM_SCALINGS)
+    numeric = configs[:, [_COL[c] for c in NUMERIC_COLUMNS]]
+    size    = (configs[:, _COL["K"]] * configs[:, _COL["order"]]).unsqueeze(1)
+
+    return torch.cat([family.float(), scaling.float(), numeric, size], dim=1)
+
+
+# ============================================================
+# MODEL
+# ============================================================
+
+class SurrogateEnsemble(torch.nn.Module):
+    """
+    E two-hidden-layer MLPs, outputs per member:
+        [..., 0] standardized log10_condition
+        [..., 1] spd_fail logit
+    """
+
+    def __init__(
+        self,
+        inputs: int,
+        hidden: int = HIDDEN,
+        members: int = SURROGATE_MEMBERS,
+        families: Sequence[int] = BUILTIN_FAMILIES
+    ):
+        super().__init__()
+
+        # family_id values with their own one-hot column (encode_configs)
+        self.register_buffer("families", torch.as_tensor(list(families), dtype=torch.int64))
+
+        def layer(i, o):
+            w = torch.empty(members, i, o)
+            for e in range(members):
+                torch.nn.init.kaiming_uniform_(w[e].T, a=math.sqrt(5))
+            return torch.nn.Parameter(w), torch.nn.Parameter(torch.zeros(members, 1, o))
+
+        self.w1, self.b1 = layer(inputs, hidden)
+        self.w2, self.b2 = layer(hidden, hidden)
+        self.w3, self.b3 = layer(hidden, 2)
+
+        # Feature / target standardization, fitted on the training split
+        self.register_buffer("x_mean", torch.zeros(inputs))
+        self.register_buffer("x_std",  torch.ones(inputs))
+        self.register_buffer("y_mean", torch.zeros(()))
+        self.register_buffer("y_std",  torch.ones(()))
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        """x [n, in] (shared by every member) or [E, n, in] → [E, n, 2]"""
+        x = (x - self.x_mean) / self.x_std
+        h = F.silu(torch.matmul(x, self.w1) + self.b1)
+        h = F.silu(torch.matmul(h, self.w2) + self.b2)
+        return torch.matmul(h, self.w3) + self.b3
+
+
+# ============================================================
+# DATA
+# ============================================================
+
+def load_shards(pattern: str = SHARD_GLOB):
+    """Concatenated (configs [n, 10], metrics [n, 20]) of every phase 1 .pt shard."""
+    paths = sorted(glob.glob(pattern))
+    if not paths:
+        raise FileNotFoundError(f"No shards match {pattern}")
+
+    shards = [torch.load(p, weights_only=False) for p in paths]
+    return (
+        torch.cat([s["configs"] for s in shards]),
+        torch.cat([s["metrics"] for s in shards]),
+    )
+
+
+# ============================================================
+# TRAINING
+# ============================================================
+
+def train_surrogate(
+    configs: torch.Tensor,
+    metrics: torch.Tensor,
+    steps: int = TRAIN_STEPS,
+    batch_size: int = BATCH_SIZE,
+    lr: float = LEARNING_RATE,
+    seed: int = SEED
+) -> SurrogateEnsemble:
+    """
+    Fits the ensemble. log10_condition is regressed only on rows that
+    factor (spd_fail_flag == 0); every row trains the fail head.
+    """
+    gen = torch.Generator().manual_seed(seed)
+
+    seen     = configs[:, _COL["family_id"]].long().unique().tolist()
+    families = sorted(set(BUILTIN_FAMILIES) | set(seen))
+
+    x    = encode_configs(configs, families)
+    y    = metrics[:, _LOGCOND].to(torch.float32)
+    fail = metrics[:, _FAIL].to(torch.float32)
+    ok   = (fail == 0) & torch.isfinite(y)
+
+    model = SurrogateEnsemble(x.shape[1], families=families)
+    model.x_mean.copy_(x.mean(dim=0))
+    # Columns constant in training (e.g. the "other" family) keep unit
+    # scale, so a config that sets them is not blown up by a tiny std
+    x_std = x.std(dim=0)
+    model.x_std.copy_(torch.where(x_std > 1e-6, x_std, torch.ones_like(x_std)))
+    model.y_mean.copy_(y[ok].mean())
+    model.y_std.copy_(y[ok].std().clamp_min(1e-6))
+
+    y_std = torch.where(ok, (y - model.y_mean) / model.y_std, torch.zeros_like(y))
+
+    opt   = torch.optim.Adam(model.parameters(), lr=lr)
+    sched = torch.optim.lr_scheduler.CosineAnnealingLR(opt, steps)
+    E     = model.w1.shape[0]
+
+    with torch.enable_grad():
+        for _ in range(steps):
+            # Independent bootstrap minibatch per member
+            idx = torch.randint(0, x.shape[0], (E, batch_size), generator=gen)
+            out = model(x[idx])                                       # [E, B, 2]
+
+            w_reg = ok[idx].float()
+            reg   = ((out[..., 0] - y_std[idx]).square() * w_reg).sum() / w_reg.sum().clamp_min(1.0)
+            cls   = F.binary_cross_entropy_with_logits(out[..., 1], fail[idx])
+
+            opt.zero_grad(set_to_none=True)
+            (reg + cls).backward()
+            opt.step()
+            sched.step()
+
+    return model.eval()
+
+
+# ============================================================
+# PREDICTION / SCREENING
+# ============================================================
+
+@torch.no_grad()
+def predict(model: SurrogateEnsemble, configs: torch.Tensor, chunk: int = PREDICT_CHUNK) -> Dict[str, torch.Tensor]:
+    """
+    Returns per config:
+        log10_condition, log10_condition_std  (ensemble mean / spread)
+        fail_prob, fail_prob_std
+        needs_evaluation                      (bool, see header)
+    """
+    families = model.families.tolist()
+
+    parts = []
+    for start in range(0, configs.shape[0], chunk):
+        out = model(encode_configs(configs[start:start + chunk], families))      # [E, n, 2]
+
+        logcond = out[..., 0] * model.y_std + model.y_mean
+        prob    = torch.sigmoid(out[..., 1])
+
+        parts.append(torch.stack([
+            logcond.mean(dim=0), logcond.std(dim=0),
+            prob.mean(dim=0),    prob.std(dim=0),
+        ], dim=1))
+
+    pred = torch.cat(parts) if parts else torch.zeros((0, 4))
+    logcond, logcond_std, prob, prob_std = pred.unbind(dim=1)
+
+    near = torch.zeros_like(logcond, dtype=torch.bool)
+    for t in THRESHOLDS:
+        near |= (logcond - t).abs() < BOUNDARY_MARGIN
+
+    needs = (
+        (logcond_std > LOGCOND_STD_MAX)
+        | ((prob > FAIL_BAND[0]) & (prob < FAIL_BAND[1]))
+        | near
+    )
+
+    return {
+        "log10_condition":     logcond,
+        "log10_condition_std": logcond_std,
+        "fail_prob":           prob,
+        "fail_prob_std":       prob_std,
+        "needs_evaluation":    needs,
+    }
+
+
+def save_surrogate(model: SurrogateEnsemble, path: str = MODEL_PATH):
+    torch.save({"inputs": model.w1.shape[1], "hidden": model.w1.shape[2],
+                "members": model.w1.shape[0], "families": model.families.tolist(),
+                "state": model.state_dict()}, path)
+
+
+def load_surrogate(path: str = MODEL_PATH) -> SurrogateEnsemble:
+    blob  = torch.load(path, weights_only=False)
+    model = SurrogateEnsemble(blob["inputs"], blob["hidden"], blob["members"], blob["families"])
+    model.load_state_dict(blob["state"])
+    return model.eval()
+
+
+# ============================================================
+# DRIVER
+# ============================================================
+
+def evaluate_holdout(model: SurrogateEnsemble, configs: torch.Tensor, metrics: torch.Tensor) -> Dict[str, float]:
+    pred = predict(model, configs)
+
+    y    = metrics[:, _LOGCOND].to(torch.float32)
+    fail = metrics[:, _FAIL] != 0
+    ok   = ~fail & torch.isfinite(y)
+
+    trusted = ~pred["needs_evaluation"]
+    err     = (pred["log10_condition"] - y).abs()
+
+    return {
+        "mae_log10_condition":         err[ok].mean().item(),
+        "mae_log10_condition_trusted": err[ok & trusted].mean().item(),
+        "fail_accuracy":               ((pred["fail_prob"] > 0.5) == fail).float().mean().item(),
+        "fail_accuracy_trusted":       ((pred["fail_prob"] > 0.5) == fail)[trusted].float().mean().item(),
+        "needs_evaluation":            pred["needs_evaluation"].float().mean().item(),
+    }
+
+
+def run_surrogate(shard_glob: str = SHARD_GLOB, model_path: Optional[str] = MODEL_PATH):
+
+    torch.set_grad_enabled(False)
+    torch.manual_seed(SEED)
+
+    configs, metrics = load_shards(shard_glob)
+    print("Stability surrogate")
+    print(f"  Training rows   : {configs.shape[0]:,}")
+
+    perm  = torch.randperm(configs.shape[0], generator=torch.Generator().manual_seed(SEED))
+    n_val = int(HOLDOUT * configs.shape[0])
+    val, train = perm[:n_val], perm[n_val:]
+
+    start = time.perf_counter()
+    model = train_surrogate(configs[train], metrics[train])
+    print(f"  Train time      : {time.perf_counter() - start:.1f}s")
+
+    if n_val > 0:
+        for name, value in evaluate_holdout(model, configs[val], metrics[val]).items():
+            print(f"  {name:<30}: {value:.4f}")
+    else:
+        print("  Holdout         : none (too few rows)")
+
+    from build_configs import build_phase1_configs
+    custom = [f for f in model.families.tolist() if f >= NUM_FAMILIES]
+    grid   = build_phase1_configs(custom_families=custom)
+
+    start = time.perf_counter()
+    pred  = predict(model, grid)
+    elapsed = time.perf_counter() - start
+    print(f"  Screened        : {grid.shape[0]:,} configs in {elapsed:.2f}s "
+          f"({grid.shape[0] / elapsed / 1e6:.1f}M/s), "
+          f"{int(pred['needs_evaluation'].sum()):,} need evaluation")
+
+    if model_path is not None:
+        save_surrogate(model, model_path)
+        print(f"  Written         : {model_path}")
+
+
+if __name__ == "__main__":
+    run_surrogate()
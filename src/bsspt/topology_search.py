@@ -0,0 +1,194 @@
+# ============================================================
+# Topology Search
+# Runs the multi-start topology optimizer (engine.topologyoptimizer)
+# for every lobe count of the sweep, seeded with the five built-in
+# families, and registers the winners as one new custom family that
+# generate_topology can serve (ids >= 5). The sweep picks the saved
+# families up with `cli.py sweep --topologies OUTPUT_PATH`
+# (phase1.CUSTOM_TOPOLOGIES); SEARCH_LOBES must cover its K range.
+#
+# The template basis fixes the sigma layout (dual-domain, one phase 1
+# parameter set); only the centers move. The optimizer's per-lobe sigma
+# scales (optimizeSigmas) are deliberately not used: a registered family
+# stores centers only, and the sweep derives sigmas from its own config
+# columns, so centers tuned jointly with sigmas would not reproduce the
+# objective reported here.
+#
+# Each winner is then refined greedily one lobe at a time: the lobe is
+# removed from a built basis (removeLobe downdates the Cholesky factor),
+# nearby placements are tried with addLobe (a bordered factor update),
+# and the best one is kept. Only the moved lobe is ever re-sampled.
+# ============================================================
+
+import torch
+
+import spectral_topology
+from spectral_topology import generate_topology_batch, L_MIN_DEFAULT, L_MAX_DEFAULT
+from engine.quadraturedomain import makeDomain
+from engine.ghgsfexp import GHGSFMultiLobeBasisDualDomain
+from engine.ghgsfbasisbase import GHGSFMultiLobeBasisBase
+from engine.topologyoptimizer import optimizeTopology, topologyObjective, basisObjective
+from stress_cases import stack_cases
+
+
+# ============================================================
+# SETTINGS
+# ============================================================
+
+OUTPUT_PATH = "custom_topologies.json"
+
+SEARCH_LOBES = range(4, 13)
+ORDER        = 8
+
+# Template sigma layout (phase 1 columns wide_min .. narrow_max, sqrt scaling)
+WIDE_SIGMA   = (6.5, 7.0)
+NARROW_SIGMA = (6.0, 6.5)
+SCALE_TYPE   = "sqrt"
+
+# Gauss-Legendre domain — converged Gram at a fraction of the sweep's
+# LAMBDA_SAMPLES, which keeps the [S, M, L] autograd graph small
+LAMBDA_MIN  = 380.0
+LAMBDA_MAX  = 830.0
+QUAD_RULE   = "gauss"
+QUAD_POINTS = 384
+
+OBJECTIVE       = "condition"      # or "reconstruction" (stress cases)
+STARTS          = 32
+STEPS           = 150
+LEARNING_RATE   = 0.05
+SEED            = 0
+
+# Greedy refinement after the optimizer: passes over the lobes, and
+# REFINE_POINTS placements per lobe spread over ±REFINE_SPAN nm
+REFINE_PASSES = 2
+REFINE_SPAN   = 10.0
+REFINE_POINTS = 8
+
+
+def template_sigma_matrix(domain, K: int):
+    """Sigma layout [K, N] of the template dual-domain basis."""
+    centers, _ = generate_topology_batch([0], [K], dtype=domain.m_dtype)
+    basis = GHGSFMultiLobeBasisDualDomain(
+        domain=domain,
+        centers=centers[0],
+        num_wide=K // 2,
+        wide_sigma_min=WIDE_SIGMA[0],
+        wide_sigma_max=WIDE_SIGMA[1],
+        wide_scale_type=SCALE_TYPE,
+        narrow_sigma_min=NARROW_SIGMA[0],
+        narrow_sigma_max=NARROW_SIGMA[1],
+        narrow_scale_type=SCALE_TYPE,
+        order=ORDER
+    )
+    return basis.m_sigmaMatrix
+
+
+def refine_topology(domain, centers, sigma_matrix, spectra=None):
+    """
+    Greedy lobe moves on one topology: for every lobe, remove it and try
+    REFINE_POINTS placements around it, keeping the best (or the
+    original). Returns (centers [K], objective).
+
+    Lobes re-enter at the end of the basis, so `position` tracks where
+    each slot's lobe currently sits; the objectives do not depend on
+    lobe order, and slot k always keeps sigma row k.
+    """
+    K = len(centers)
+    centers  = [float(c) for c in centers]
+    position = list(range(K))
+
+    basis = GHGSFMultiLobeBasisBase(domain, centers, sigma_matrix)
+    best  = basisObjective(basis, OBJECTIVE, spectra)
+
+    offsets = torch.linspace(-REFINE_SPAN, REFINE_SPAN, REFINE_POINTS).tolist()
+
+    for _ in range(REFINE_PASSES):
+        for k in range(K):
+            p = position[k]
+            basis.removeLobe(p)
+            position = [q - (q > p) for q in position]
+
+            chosen = centers[k]
+            for offset in offsets:
+                candidate = min(max(centers[k] + offset, L_MIN_DEFAULT), L_MAX_DEFAULT)
+                try:
+                    basis.addLobe(candidate, sigma_matrix[k])
+                except RuntimeError:
+                    continue   # Gram not SPD with the lobe here
+
+                value = basisObjective(basis, OBJECTIVE, spectra)
+                if value < best:
+                    best, chosen = value, candidate
+
+                basis.removeLobe(K - 1)
+
+            basis.addLobe(chosen, sigma_matrix[k])
+            centers[k]  = chosen
+            position[k] = K - 1
+
+    return centers, best
+
+
+def run_topology_search():
+
+    torch.set_grad_enabled(False)
+
+    device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+    dtype  = torch.float64
+
+    domain = makeDomain(QUAD_RULE, LAMBDA_MIN, LAMBDA_MAX, QUAD_POINTS, device=device, dtype=dtype)
+    spectra = stack_cases(domain)[1] if OBJECTIVE == "reconstruction" else None
+
+    print(f"Topology search  ({OBJECTIVE}, {STARTS} starts × {STEPS} steps, order {ORDER})")
+    print(f"  {'K':>3}  {'best built-in':>14}  {'optimized':>10}  {'refined':>10}")
+
+    found = {}
+    for K in SEARCH_LOBES:
+        families = torch.arange(spectral_topology.NUM_FAMILIES)
+        seeds, _ = generate_topology_batch(families, [K] * len(families), dtype=dtype)
+
+        sigma_matrix = template_sigma_matrix(domain, K)
+
+        result = optimizeTopology(
+            domain,
+            sigma_matrix,
+            L_MIN_DEFAULT,
+            L_MAX_DEFAULT,
+            initialCenters=seeds,
+            starts=STARTS,
+            steps=STEPS,
+            lr=LEARNING_RATE,
+            objective=OBJECTIVE,
+            spectra=spectra,
+            optimizeSigmas=False,
+            seed=SEED
+        )
+
+        centers, _ = refine_topology(domain, result["centers"], sigma_matrix, spectra)
+
+        # Scored on a fresh build, so drift in the updated factors cannot
+        # pass a worse placement off as an improvement
+        fresh = topologyObjective(
+            domain,
+            torch.tensor(centers, device=device, dtype=dtype).unsqueeze(0),
+            sigma_matrix.unsqueeze(0),
+            OBJECTIVE,
+            spectra
+        ).item()
+        if fresh > result["objective"]:
+            centers, fresh = result["centers"].cpu().tolist(), result["objective"]
+
+        builtin = result["initialObjectives"][:len(families)].min().item()
+        print(f"  {K:>3}  {builtin:>14.4f}  {result['objective']:>10.4f}  {fresh:>10.4f}")
+
+        found[K] = centers
+
+    topology_id = spectral_topology.register_topology(found)
+    spectral_topology.save_custom_topologies(OUTPUT_PATH)
+
+    print(f"  Registered     : topology_id {topology_id}")
+    print(f"  Written        : {OUTPUT_PATH}")
+
+
+if __name__ == "__main__":
+    run_topology_search()
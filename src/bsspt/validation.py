@@ -0,0 +1,208 @@
+# ============================================================
+# Precision Validation
+# Pairs every config's performance (float32, precision_id 0) and
+# reference (float64, precision_id 1) rows, measures how far the
+# float32 results drift — eigen metrics from the dataset, projections
+# and reconstructions recomputed — and writes a precision_loss column
+# with the precision each config can safely run at.
+# ============================================================
+
+import numpy as np
+import pandas as pd
+import torch
+
+import phase1
+from schema import CONFIG_COLUMNS
+from stress_cases import stack_cases
+
+
+# ============================================================
+# SETTINGS
+# ============================================================
+
+INPUT_PARQUET  = "datasets/stability_dataset.parquet"
+OUTPUT_PARQUET = "datasets/precision_validation.parquet"
+
+# Largest relative error for which float32 counts as good enough
+PRECISION_TOL = 1e-4
+
+# Basis configs rebuilt for projection / reconstruction errors, taken
+# evenly across the dataset; None rebuilds every one
+RECOMPUTE_LIMIT = 2000
+
+EIGEN_METRICS = [
+    "lambda_min",
+    "lambda_2",
+    "lambda_max",
+    "condition_number",
+    "trace_G",
+]
+
+# Everything that identifies a config except its precision
+PAIR_KEY = [c for c in CONFIG_COLUMNS if c != "precision_id"]
+
+# Projection ignores whitening, so one rebuild covers both whitened rows
+BASIS_KEY = [c for c in PAIR_KEY if c != "whitened"]
+
+
+# ============================================================
+# PAIRING
+# ============================================================
+
+def pair_precisions(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    One row per config present in both precisions; metric columns carry
+    _fp32 / _fp64 suffixes.
+    """
+    perf = df[df["precision_id"] == 0].drop(columns="precision_id")
+    ref  = df[df["precision_id"] == 1].drop(columns="precision_id")
+
+    return perf.merge(ref, on=PAIR_KEY, how="inner", suffixes=("_fp32", "_fp64"))
+
+
+def _relative_error(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    tiny = np.finfo(np.float64).tiny
+    return np.abs(a - b) / np.maximum(np.abs(b), tiny)
+
+
+def eigen_errors(paired: pd.DataFrame) -> pd.DataFrame:
+    """
+    Adds rel_err_<metric> for every EIGEN_METRICS column, vectorized over
+    the whole table. A config that fails SPD only in float32 gets inf;
+    one that fails in both precisions gets NaN.
+    """
+    fail32 = paired["spd_fail_flag_fp32"].to_numpy() != 0
+    fail64 = paired["spd_fail_flag_fp64"].to_numpy() != 0
+
+    out = {}
+    for metric in EIGEN_METRICS:
+        err = _relative_error(
+            paired[f"{metric}_fp32"].to_numpy(np.float64),
+            paired[f"{metric}_fp64"].to_numpy(np.float64)
+        )
+        err = np.where(fail32, np.inf, err)
+        err = np.where(fail64, np.nan, err)
+        out[f"rel_err_{metric}"] = err
+
+    return paired.assign(**out)
+
+
+# ============================================================
+# PROJECTION / RECONSTRUCTION
+# ============================================================
+
+def _project_all(basis, spectra: torch.Tensor):
+    """spectra [S, L] → (coeffs [S, M], reconstructions [S, L])"""
+    coeffs = basis.projectBatch(spectra)
+    return coeffs, basis.reconstruct(coeffs)
+
+
+def projection_errors(basis_configs: np.ndarray) -> np.ndarray:
+    """
+    basis_configs : [C, len(BASIS_KEY)]
+
+    Builds each config in both precisions and projects every stress case
+    (stress_cases.py) through both at once.
+
+    Returns [C, 2] — max relative projection and reconstruction error
+    over the spectra (inf where only the float32 build fails, NaN where
+    both do).
+    """
+    errors = np.full((basis_configs.shape[0], 2), np.nan)
+
+    for i, cfg in enumerate(basis_configs):
+        row = dict(zip(BASIS_KEY, cfg.tolist()))
+        row["whitened"] = 0
+
+        bases = []
+        for precision_id in (0, 1):
+            row["precision_id"] = precision_id
+            try:
+                basis, _ = phase1.build_basis([row[c] for c in CONFIG_COLUMNS])
+            except Exception:
+                basis = None
+            bases.append(basis)
+
+        basis32, basis64 = bases
+        if basis64 is None:
+            continue
+        if basis32 is None:
+            errors[i] = np.inf
+            continue
+
+        _, spectra = stack_cases(basis64.m_domain)   # [S, L]
+
+        c64, r64 = _project_all(basis64, spectra)
+        c32, r32 = _project_all(basis32, spectra)
+
+        c32 = c32.to(c64.device, torch.float64)
+        r32 = r32.to(r64.device, torch.float64)
+
+        proj  = torch.linalg.norm(c32 - c64, dim=1) / torch.linalg.norm(c64, dim=1)
+        recon = torch.linalg.norm(r32 - r64, dim=1) / torch.linalg.norm(r64, dim=1)
+
+        errors[i, 0] = proj.max().item()
+        errors[i, 1] = recon.max().item()
+
+    return errors
+
+
+# ============================================================
+# DRIVER
+# ============================================================
+
+def validate(df: pd.DataFrame, recompute_limit=RECOMPUTE_LIMIT, tol: float = PRECISION_TOL) -> pd.DataFrame:
+    """
+    Returns one row per paired config with rel_err_* columns,
+    rel_err_projection / rel_err_reconstruction (NaN where not rebuilt),
+    precision_loss (max of all measured errors) and
+    recommended_precision_id (0 when precision_loss <= tol, else 1).
+    """
+    torch.set_grad_enabled(False)
+
+    paired = eigen_errors(pair_precisions(df))
+
+    basis_configs = paired[BASIS_KEY].drop_duplicates().reset_index(drop=True)
+    if recompute_limit is not None and len(basis_configs) > recompute_limit:
+        pick = np.linspace(0, len(basis_configs) - 1, recompute_limit).round().astype(np.int64)
+        basis_configs = basis_configs.iloc[np.unique(pick)].reset_index(drop=True)
+
+    print(f"  Paired configs  : {len(paired):,}")
+    print(f"  Rebuilt configs : {len(basis_configs):,}")
+
+    errors = projection_errors(basis_configs.to_numpy(np.float64))
+    basis_configs["rel_err_projection"]     = errors[:, 0]
+    basis_configs["rel_err_reconstruction"] = errors[:, 1]
+
+    paired = paired.merge(basis_configs, on=BASIS_KEY, how="left")
+
+    err_cols = [c for c in paired.columns if c.startswith("rel_err_")]
+    errs     = paired[err_cols].to_numpy(np.float64)
+
+    # NaN (not measured / failed everywhere) is ignored; all-NaN stays NaN
+    loss = np.where(np.isnan(errs), -np.inf, errs).max(axis=1)
+    loss = np.where(np.isnan(errs).all(axis=1), np.nan, loss)
+
+    paired["precision_loss"]           = loss
+    paired["recommended_precision_id"] = np.where(loss <= tol, 0, 1).astype(np.int8)
+
+    return paired
+
+
+def run_validation():
+
+    print("Loading parquet dataset...")
+    df = pd.read_parquet(INPUT_PARQUET)
+    print(f"  Total rows      : {len(df):,}")
+
+    result = validate(df)
+
+    fp32_ok = int((result["recommended_precision_id"] == 0).sum())
+    print(f"  float32 safe    : {fp32_ok:,} / {len(result):,} (tol {PRECISION_TOL:g})")
+
+    result.to_parquet(OUTPUT_PARQUET, engine="pyarrow", compression="zstd", index=False)
+    print(f"  Written         : {OUTPUT_PARQUET}")
+
+
+if __name__ == "__main__":
+    run_validation()